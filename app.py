@@ -1,12 +1,29 @@
-from calendar import c
+import functools
+import os
 import sys
+import threading
+import time
+import uuid
+import weakref
+from concurrent import futures
 
 from PyQt5.QtCore import *
 from PyQt5.QtWidgets import *
 from PyQt5.QtGui import *
-from qt_material import apply_stylesheet
-import resources
-import requests
+from icons import iconProvider, registerResources
+from mediacache import shutdownMediaCache
+from styles import setStyleProperty, styleSheet
+from updates import UpdateChecker, saveVersion
+from downloads import DownloadManager, verifyFile
+from catalogview import CatalogModel, CatalogView, EntryRole
+from catalog import CatalogEntry
+from catalogstore import CatalogClosed, CatalogStore, LIST_COLUMNS, loadCatalogSources
+from delta import updateFile
+from paths import cacheDir
+from scheduler import JobCancelled, JobScheduler
+from search import SearchIndex
+
+registerResources()
 
 class SideBar(QWidget):
     def __init__(self, parent=None):
@@ -17,8 +34,6 @@ class SideBar(QWidget):
         self.splitter.setObjectName('splitter')
         self.splitter.setHandleWidth(1)
         self.splitter.setChildrenCollapsible(False)
-        # set handle border to theme border colour
-        self.splitter.setStyleSheet('QSplitter::handle { background-color: %s; }' % self.palette().color(QPalette.Window).name())
         # create a sidebar
         self.sidebar = QWidget()
         self.sidebar.setObjectName('sidebar')
@@ -43,6 +58,13 @@ class SideBar(QWidget):
         self.main_content_layout.setContentsMargins(0, 0, 0, 0)
         self.main_content_layout.setSpacing(0)
         self.main_content.setLayout(self.main_content_layout)
+        # pages are kept in a stack so switching between them only changes the visible one
+        self.stack = QStackedWidget()
+        self.stack.setObjectName('stack')
+        self.main_content_layout.addWidget(self.stack)
+        # navigation buttons by page id, and every navigation button in order
+        self.navigation = {}
+        self.buttons = []
         # create a layout for the whole widget
         self.layout = QVBoxLayout()
         self.layout.setContentsMargins(0, 0, 0, 0)
@@ -54,19 +76,12 @@ class SideBar(QWidget):
         return self.isDarkMode()
 
     def isDarkMode(self):
-        # QT check if bakcground is dark
-        if self.palette().color(QPalette.Background).value() < 128:
-            return True
-        else:
-            return False
+        return iconProvider().isDarkMode()
 
     def useIcon(self, name):
-        if self.systemDarkMode():
-            return QIcon(':/icons/' + name + "-dark.svg")
-        else:
-            return QIcon(':/icons/' + name + '.svg')
+        return iconProvider().icon(name)
     
-    def addNavigation(self, title, function, checked=False, icon=None, colour=None):
+    def addNavigation(self, title, function, checked=False, icon=None, colour=None, page=None):
         # create flat button that expands widthwarda
         self.expand_button = QPushButton()
         # add icon to left of button
@@ -82,25 +97,38 @@ class SideBar(QWidget):
         self.expand_button.setChecked(checked)
         self.expand_button.setFixedHeight(30)
         # if background colour of button is bright then use dark text colour
-        if self.expand_button.palette().color(QPalette.Background).value() > 128:
-            textColour = '#000000'
-        else:
-            # use theme default text colour
-            textColour = '#ffffff'
-        # remove border from flat button and if checked, set background colour to theme highlight which is overridden by colour
+        self.expand_button.setProperty('darkText', self.hasDarkText(self.expand_button))
+        # flat, borderless and highlighted when checked, an accent colour overrides the highlight
         if colour:
-            self.expand_button.setStyleSheet('QPushButton { margin: 0px; border: none; background-color: %s; color: %s; } QPushButton:checked { background-color: %s; }' % (colour, textColour, colour)) 
-        elif checked:
-            self.expand_button.setStyleSheet('QPushButton { margin: 0px; border: none; background-color: %s; color: %s; } QPushButton:checked { background-color: %s; }' % (self.palette().color(QPalette.Highlight).name(), textColour, self.palette().color(QPalette.Highlight).name()))            
+            self.expand_button.setProperty('nav', 'accent')
+            self.expand_button.setProperty('accent', styleSheet().addAccent(colour))
         else:
-            self.expand_button.setStyleSheet('QPushButton { margin: 0px; border: none; background-color: %s; color: %s; }' % (self.palette().color(QPalette.Window).name(), textColour))
+            self.expand_button.setProperty('nav', 'plain')
 
         self.expand_button.setText(title)
 
         self.expand_button.clicked.connect(function)
+        # remember which page the button leads to so only its checked state has to change on navigation
+        if page is not None:
+            self.navigation[page] = self.expand_button
         # add button to sidebar
-        self.sidebar_layout.addWidget(self.expand_button)   
-    
+        self.buttons.append(self.expand_button)
+        self.sidebar_layout.addWidget(self.expand_button)
+        return self.expand_button
+
+    def hasDarkText(self, button):
+        return button.palette().color(QPalette.Background).value() > 128
+
+    def paletteChanged(self):
+        # only buttons whose text colour flips with the new palette are polished again
+        for button in self.buttons:
+            setStyleProperty(button, 'darkText', self.hasDarkText(button))
+
+    def setCurrent(self, page):
+        # check the button of the current page and uncheck every other one
+        for id, button in self.navigation.items():
+            button.setChecked(id == page)
+
     def addNavigationSeparator(self):
         self.sidebar_layout.addWidget(QFrame())
 
@@ -110,28 +138,177 @@ class SideBar(QWidget):
 
 
     def addWidget(self, widget):
-        self.main_content_layout.addWidget(widget)
+        self.stack.addWidget(widget)
+
+
+class UpdateNotifier(QObject):
+    """Bridges UpdateChecker results from its worker threads to the GUI thread."""
+    finished = pyqtSignal(list)
+
+    def __init__(self, checker, parent=None):
+        super(UpdateNotifier, self).__init__(parent)
+        self.checker = checker
+
+    def check(self, force=False):
+        # emitting from a worker thread is queued to the receivers in the GUI thread
+        self.checker.checkAsync(self.finished.emit, force)
+
+
+class WindowSignals(object):
+    """Emits signals of a window from worker threads until it closes, workers never hold the window itself."""
+    def __init__(self, window):
+        self.window = weakref.ref(window)
+        self.lock = threading.Lock()
+        self.closed = False
+
+    def emit(self, name, *args):
+        with self.lock:
+            window = None if self.closed else self.window()
+            if window is not None:
+                getattr(window, name).emit(*args)
+            # the last reference to a window must be dropped on the GUI thread, where its widgets live
+            del window
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+
+
+def loadCatalog(store, jobs, signals, id, url=None):
+    # runs on a catalog thread, only the store, the scheduler and queued signals are used here
+    try:
+        signals.emit("catalogLoaded", id, store.load(id))
+    except CatalogClosed:
+        # the window closed while this thread was starting
+        return
+    if url is not None:
+        # the delta sync waits behind anything the user started, jobsChanged reloads the catalog after it
+        jobs.submit("refresh", {"catalog": id, "url": url}, "background", unique=True)
+
+
+def downloadJob(downloads, job):
+    # runs on a scheduler worker, the download's own connections do the transfer
+    future = downloads.download(job.args["url"], job.args["path"])
+    try:
+        while not future.done():
+            download = future.download
+            job.report(download.downloaded / download.size if download.size else 0.0)
+            futures.wait([future], timeout=0.2)
+    except JobCancelled:
+        future.download.cancel()
+        raise
+    return future.result()
+
+
+def verifyJob(job):
+    try:
+        return verifyFile(job.args["path"], job.args["sha256"], job.report)
+    except Exception:
+        # a corrupt archive is of no use to a later attempt
+        os.remove(job.args["path"])
+        raise
+
+
+def installJob(job):
+    from plasmoids import installPackage
+    path = installPackage(job.args["path"], progress=job.report)
+    os.remove(job.args["path"])
+    return path
+
+
+def updateJob(downloads, job):
+    # the new file is built next to the installed one and only moved over it once its hash matched
+    path = job.args["path"]
+    built, method, transferred = updateFile(downloads, job.args["package"], job.args["installed"], path, path + ".new", job.report)
+    os.replace(built, path)
+    # jobs restored from before versions were recorded have none
+    if job.args.get("version"):
+        saveVersion(job.args["name"], job.args["version"])
+    return {"method": method, "transferred": transferred}
+
+
+class DownloadProgress(QObject):
+    """Polls a DownloadManager at most once per frame, workers never touch the GUI."""
+    changed = pyqtSignal(int, float, object)
+
+    def __init__(self, manager, parent=None, interval=16):
+        super(DownloadProgress, self).__init__(parent)
+        self.manager = manager
+        self.percent = None
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.tick)
+
+    def start(self):
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def tick(self):
+        downloaded, total, rate, eta = self.manager.progress()
+        percent = int(downloaded * 100 / total) if total else 0
+        if percent != self.percent:
+            self.percent = percent
+            self.changed.emit(percent, rate, eta)
+        if not self.manager.busy():
+            self.timer.stop()
+            self.percent = None
+
+
+class JobProgress(QObject):
+    """Hands job state changes from the scheduler's workers to the GUI in batches, at most once per interval."""
+    changed = pyqtSignal(list)
+
+    def __init__(self, scheduler, parent=None, interval=100):
+        super(JobProgress, self).__init__(parent)
+        self.scheduler = scheduler
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.tick)
+
+    def start(self):
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def tick(self):
+        jobs = self.scheduler.drainChanges()
+        if jobs:
+            self.changed.emit(jobs)
+        if not self.scheduler.busy():
+            self.timer.stop()
 
 
 class Window(QMainWindow):
     """Main Window."""
-    def __init__(self, parent=None):
+    # emitted from the indexing thread with the catalog id and the rebuild generation once a catalog can be searched
+    catalogIndexed = pyqtSignal(str, int)
+    # emitted from a catalog thread with the catalog id and its entries, or an error message
+    catalogLoaded = pyqtSignal(str, list)
+    catalogFailed = pyqtSignal(str, str)
+
+    def __init__(self, parent=None, evictAfter=None):
         """Initializer."""
         super().__init__(parent)
         self.setWindowTitle("Python Menus & Toolbars")
-        # apply_stylesheet(self, theme='light_blue.xml')
+        # themes are applied by main.py --theme=light_blue.xml through themecache
         #self.setStyleSheet("background-color: white;")
         self.resize(680, 480)
+        # worker threads reach the window through these, closing it cuts them off
+        self.signals = WindowSignals(self)
+        # drop cached icons when the palette or theme of the window changes
+        iconProvider().watch(self)
+        styleSheet().apply()
         self._createMenuBar()
         self._createToolBars()
         self._createStatusBar()
+        self._createPages(evictAfter)
+        self._createDownloads()
+        self._createJobs()
+        self._createCatalogs()
+        self._createUpdates()
         self.Page("main")
 
     def useIcon(self, name):
-        if self.systemDarkMode():
-            return QIcon(':/icons/' + name + "-dark.svg")
-        else:
-            return QIcon(':/icons/' + name + '.svg')
+        return iconProvider().icon(name)
 
     def scrollablePage(self):
         # create scrollable re-usable widget
@@ -150,66 +327,209 @@ class Window(QMainWindow):
         else:
             return False 
 
+    def _createPages(self, evictAfter=None):
+        self.currentPage = None
+        # page builders by id, pages are only built on their first visit
+        self.pages = {
+            "main": self.progressPage,
+            "apps": self.catalogPage,
+            "plasmoid": self.catalogPage,
+            "settings": self.emptyPage,
+            "updates": self.emptyPage,
+        }
+        # built pages by id, the time they were last shown and how long their last build took
+        self.builtPages = {}
+        self.lastVisit = {}
+        self.pageBuildTimes = {}
+        self.progressBars = {}
+        # catalog models outlive their pages so evicted pages keep their data
+        self.catalogs = {"apps": CatalogModel(parent=self), "plasmoid": CatalogModel(parent=self)}
+        # full entry lists, search indexes and current queries by catalog
+        self.catalogEntries = {"apps": [], "plasmoid": []}
+        self.searchIndexes = {"apps": SearchIndex(), "plasmoid": SearchIndex()}
+        self.catalogQueries = {}
+        # incremental changes made while a catalog index is rebuilt, replayed once it is ready
+        self.catalogChanges = {}
+        self.catalogIndexed.connect(self.catalogReady)
+        # installed plasmoids by id, found by a background scan when the plasmoid page is first opened
+        self.installed = {}
+        self.plasmoidScanner = None
+        # one persistent sidebar, navigation only changes its checked state
+        self.sidebar = SideBar()
+        self.sidebar.addNavigation("Home", lambda: self.Page("main"), page="main")
+        self.sidebar.addNavigationSpacer()
+        # amber colour in hex
+        self.sidebar.addNavigation("Updates", lambda: self.Page("updates"), icon="update-none", colour="#FFA000", page="updates")
+        self.sidebar.addNavigation("Settings", lambda: self.Page("settings"), page="settings")
+        self.setCentralWidget(self.sidebar)
+        # optionally evict pages that have not been visited for evictAfter seconds
+        self.evictAfter = evictAfter
+        if evictAfter is not None:
+            self.evictTimer = QTimer(self)
+            self.evictTimer.timeout.connect(self.evictPages)
+            self.evictTimer.start(max(1000, int(evictAfter * 1000) // 2))
+
+    def registerPage(self, id, builder):
+        # builder is called with the page id and returns the page widget
+        self.pages[id] = builder
+        self.dropPage(id)
+
     def Page(self, id):
+        if id not in self.pages:
+            raise KeyError("Unknown page: %s" % id)
         self.currentPage = id
-        # destroy previous CentralWidget
-        if self.centralWidget() is not None:
-            self.centralWidget().deleteLater()
-
-        layout = SideBar()
-
-        layout.addNavigation("Home", lambda: self.Page("main"), checked=self.pageIsOn("main"))
-        layout.addNavigationSpacer()
-        layout.addNavigation("Updates", lambda: self.Page("settings"), checked=self.pageIsOn("settings"), icon="update-none", colour="#FFA000")
-        # amber colour in hex
-        layout.addNavigation("Settings", lambda: self.Page("settings"), checked=self.pageIsOn("settings"))
-        # create new CentralWidget
-        scrollablePage = self.scrollablePage()
-        if id == "main":
-            # create circle progress bar
-            self.progress = QProgressBar()
-            self.progress.setRange(0, 100)
-            self.progress.setValue(0)
-            self.progress.setTextVisible(False)
-            self.progress.setFixedWidth(200)
-            self.progress.setFixedHeight(200)
-            self.progress.setStyleSheet("background-color: " + self.palette().color(QPalette.Highlight).name() + ";")
-            self.progress.setAlignment(Qt.AlignCenter)
-            layout.addWidget(self.progress)
-        
+        page = self.builtPages.get(id)
+        if page is None:
+            start = time.perf_counter()
+            page = self.pages[id](id)
+            self.pageBuildTimes[id] = time.perf_counter() - start
+            page.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+            self.builtPages[id] = page
+            self.sidebar.addWidget(page)
+        self.lastVisit[id] = time.monotonic()
+        self.sidebar.stack.setCurrentWidget(page)
+        self.sidebar.setCurrent(id)
+
+    def dropPage(self, id):
+        # remove a built page, it is rebuilt on its next visit
+        page = self.builtPages.pop(id, None)
+        self.lastVisit.pop(id, None)
+        self.progressBars.pop(id, None)
+        if page is not None:
+            self.sidebar.stack.removeWidget(page)
+            page.deleteLater()
+
+    def evictPages(self):
+        now = time.monotonic()
+        for id, visited in list(self.lastVisit.items()):
+            if id != self.currentPage and now - visited > self.evictAfter:
+                self.dropPage(id)
+
+    def emptyPage(self, id):
+        return self.scrollablePage()
+
+    def progressBar(self, id):
+        # create circle progress bar
+        progress = QProgressBar()
+        progress.setRange(0, 100)
+        progress.setValue(0)
+        progress.setTextVisible(False)
+        progress.setFixedWidth(200)
+        progress.setFixedHeight(200)
+        progress.setObjectName('progress')
+        progress.setAlignment(Qt.AlignCenter)
+        self.progressBars[id] = progress
+        return progress
+
+    def catalogPage(self, id):
+        # the list view scrolls and paints only the visible rows itself, so it is not put in a scroll area
+        page = QWidget()
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.progressBar(id))
+        search = QLineEdit()
+        search.setObjectName('search')
+        search.setPlaceholderText("Search")
+        search.setClearButtonEnabled(True)
+        search.setText(self.catalogQueries.get(id, ""))
+        search.textChanged.connect(lambda text: self.searchCatalog(id, text))
+        layout.addWidget(search)
+        view = CatalogView(self.catalogs[id])
+        view.activated.connect(lambda index: self.openEntry(id, index))
+        layout.addWidget(view)
+        page.setLayout(layout)
         if id == "plasmoid":
-            # create circle progress bar
-            self.progress = QProgressBar()
-            self.progress.setRange(0, 100)
-            self.progress.setValue(0)
-            self.progress.setTextVisible(False)
-            self.progress.setFixedWidth(200)
-            self.progress.setFixedHeight(200)
-            self.progress.setStyleSheet("background-color: " + self.palette().color(QPalette.Highlight).name() + ";")
-            self.progress.setAlignment(Qt.AlignCenter)
-            layout.addWidget(self.progress)
-        
-        if id == "apps":
-            # create circle progress bar
-            self.progress = QProgressBar()
-            self.progress.setRange(0, 100)
-            self.progress.setValue(0)
-            self.progress.setTextVisible(False)
-            self.progress.setFixedWidth(200)
-            self.progress.setFixedHeight(200)
-            self.progress.setStyleSheet("background-color: " + self.palette().color(QPalette.Highlight).name() + ";")
-            self.progress.setAlignment(Qt.AlignCenter)
-            layout.addWidget(self.progress)
-
-
-        scrollablePage.setWidget(layout)
-        # add scrollablePage to self
-        
-        scrollablePage.setWidgetResizable(True)
-        scrollablePage.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+            self.scanPlasmoids()
+        return page
+
+    def scanPlasmoids(self):
+        # the page opens at once, installed plasmoids arrive in batches and are then kept up to date
+        if self.plasmoidScanner is not None:
+            return
+        # zipfile, configparser and the rest of the scanner are only loaded once the page is opened
+        from plasmoids import PlasmoidScanner
+        self.plasmoidScanner = PlasmoidScanner(parent=self)
+        self.plasmoidScanner.found.connect(self.plasmoidsFound)
+        self.plasmoidScanner.removed.connect(self.plasmoidsRemoved)
+        self.plasmoidScanner.scan()
+
+    def plasmoidsFound(self, entries):
+        for entry in entries:
+            self.installed[entry.id] = entry
+        self.updateCatalog("plasmoid", entries)
+
+    def plasmoidsRemoved(self, ids):
+        for id in ids:
+            self.installed.pop(id, None)
+        # a removed plasmoid the catalog still lists goes back to its catalog entry
+        listed = []
+        gone = []
+        for id in ids:
+            details = self.catalogStore.details("plasmoid", id)
+            if details is None:
+                gone.append(id)
+            else:
+                listed.append(CatalogEntry(*[details[column] for column in LIST_COLUMNS]))
+        self.updateCatalog("plasmoid", listed, gone)
+
+    def setCatalog(self, id, entries):
+        # show the entries right away, searching uses the old index until the new one is built
+        entries = list(entries)
+        if id == "plasmoid":
+            # installed plasmoids that the catalog does not list are shown as well
+            known = set(entry.id for entry in entries)
+            entries.extend(entry for entry in self.installed.values() if entry.id not in known)
+        self.catalogEntries[id] = entries
+        self.searchCatalog(id, self.catalogQueries.get(id, ""))
+        self.catalogChanges[id] = []
+        signals = self.signals
+        self.searchIndexes[id].rebuildAsync(entries, lambda index, generation: signals.emit("catalogIndexed", id, generation))
+
+    def updateCatalog(self, id, entries, removed=()):
+        # add, replace and remove single entries without rebuilding the catalog
+        index = self.searchIndexes[id]
+        for entry in entries:
+            index.add(entry)
+        for entryId in removed:
+            index.remove(entryId)
+        if id in self.catalogChanges:
+            # a rebuild is running, its index does not have these changes yet
+            self.catalogChanges[id].append((entries, removed))
+        updated = dict((entry.id, entry) for entry in entries)
+        gone = set(removed)
+        current = [updated.pop(entry.id, entry) for entry in self.catalogEntries[id] if entry.id not in gone]
+        self.catalogEntries[id] = current + list(updated.values())
+        if self.catalogQueries.get(id, "").strip():
+            self.searchCatalog(id, self.catalogQueries[id])
+        else:
+            self.catalogs[id].updateEntries(entries)
+            self.catalogs[id].removeEntries(removed)
+
+    def catalogReady(self, id, generation):
+        # replay the changes made while the index was being rebuilt, then refresh the shown results
+        index = self.searchIndexes[id]
+        if generation != index.generation:
+            # setCatalog started another rebuild since, the changes are replayed once that one is done
+            return
+        for entries, removed in self.catalogChanges.pop(id, []):
+            for entry in entries:
+                index.add(entry)
+            for entryId in removed:
+                index.remove(entryId)
+        self.searchCatalog(id, self.catalogQueries.get(id, ""))
+
+    def searchCatalog(self, id, query):
+        # runs on every keystroke, the index answers well within a frame
+        self.catalogQueries[id] = query
+        if query.strip():
+            self.catalogs[id].setEntries(self.searchIndexes[id].search(query))
+        else:
+            self.catalogs[id].setEntries(self.catalogEntries[id])
 
-        self.setCentralWidget(scrollablePage)
-            
+    def progressPage(self, id):
+        scrollablePage = self.scrollablePage()
+        scrollablePage.widget().layout().addWidget(self.progressBar(id))
+        return scrollablePage
 
     def _createMenuBar(self):
         menuBar = self.menuBar()
@@ -251,6 +571,145 @@ class Window(QMainWindow):
         #exitAct.triggered.connect(self.close)
         ToolBar.addAction(exitAct)
     
+    def _createCatalogs(self):
+        # catalogs are read from the local store off the GUI thread and brought up to date in the background
+        self.catalogStore = CatalogStore()
+        self.catalogSources = loadCatalogSources()
+        self.catalogLoaded.connect(self.setCatalog)
+        self.catalogFailed.connect(lambda id, error: self.statusBar().showMessage("Could not update the %s catalog: %s" % (id, error)))
+        # registered once the store exists, refreshes restored from the last session may start right away
+        store = self.catalogStore
+        self.jobs.register("refresh", lambda job: store.sync(job.args["catalog"], job.args["url"]), "network")
+        for id in self.catalogs:
+            self.loadCatalog(id, self.catalogSources.get(id))
+
+    def loadCatalog(self, id, url=None):
+        # the thread gets the store, the scheduler and the window's signals, never the window
+        threading.Thread(target=loadCatalog, args=(self.catalogStore, self.jobs, self.signals, id, url), name='catalog', daemon=True).start()
+
+    def openEntry(self, id, index):
+        # detail fields are only read from the store when a row is opened
+        entry = index.data(EntryRole)
+        details = self.catalogStore.details(id, entry.id) or {}
+        self.statusBar().showMessage(details.get("description") or entry.summary or entry.name)
+
+    def _createUpdates(self):
+        # update checks run on worker threads, the result arrives through a queued signal
+        self.updates = UpdateNotifier(UpdateChecker(), self)
+        self.updates.finished.connect(self.updatesChecked)
+        QTimer.singleShot(0, self.updates.check)
+
+    def _createDownloads(self):
+        self.downloads = DownloadManager()
+        self.downloadProgress = DownloadProgress(self.downloads, self)
+        self.downloadProgress.changed.connect(self.downloadChanged)
+        # page whose progress bar shows the running downloads
+        self.downloadPage = "main"
+
+    def download(self, url, path, sha256=None, page="main"):
+        # start a download and show its progress on page
+        self.downloadPage = page
+        future = self.downloads.download(url, path, sha256)
+        self.downloadProgress.start()
+        return future
+
+    def _createJobs(self):
+        # refresh, download, verify, install and update jobs share one scheduler, its queue outlives the window
+        self.jobs = JobScheduler()
+        # handlers do not hold the window, the scheduler's workers may outlive it
+        self.jobs.register("download", functools.partial(downloadJob, self.downloads), "network")
+        self.jobs.register("verify", verifyJob, "disk")
+        self.jobs.register("install", installJob, "disk")
+        self.jobs.register("update", functools.partial(updateJob, self.downloads), "network")
+        self.jobProgress = JobProgress(self.jobs, self)
+        self.jobProgress.changed.connect(self.jobsChanged)
+        # jobs restored from the last session report their state too, new ones are started from any thread
+        self.jobProgress.start()
+
+    def install(self, url, sha256=None, priority="user"):
+        # download, verify and install a package, each step waits for the one before
+        # every install gets its own archive so the same package can be queued twice
+        name = os.path.basename(url.split("?", 1)[0]) or "package.plasmoid"
+        path = os.path.join(cacheDir("packages"), "%s-%s" % (uuid.uuid4().hex[:8], name))
+        steps = [("download", {"url": url, "path": path})]
+        if sha256:
+            steps.append(("verify", {"path": path, "sha256": sha256}))
+        steps.append(("install", {"path": path}))
+        jobs = self.jobs.chain(steps, priority)
+        self.jobProgress.start()
+        return jobs
+
+    def update(self, result, priority="user"):
+        # replace the installed file of an update result, by binary delta when its feed has one for the installed version
+        # no widget calls this yet, the updates page is still empty
+        if result.package is None or result.path is None:
+            return None
+        job = self.jobs.submit("update", {"name": result.name, "installed": result.installed, "version": result.latest, "path": result.path, "package": result.package}, priority, unique=True)
+        self.jobProgress.start()
+        return job
+
+    def jobsChanged(self, jobs):
+        for job in jobs:
+            if job["kind"] == "download" and job["state"] == "running":
+                # the download bar polls on the GUI thread, the job's worker can not start it
+                self.downloadProgress.start()
+            if job["kind"] == "refresh":
+                if job["state"] == "failed":
+                    self.catalogFailed.emit(job["args"]["catalog"], job["error"])
+                elif job["state"] == "done" and any(job["result"]):
+                    self.loadCatalog(job["args"]["catalog"])
+            elif job["state"] == "failed":
+                self.statusBar().showMessage("%s failed: %s" % (job["kind"].capitalize(), job["error"]))
+            elif job["state"] == "done" and job["kind"] == "install":
+                self.statusBar().showMessage("Installed %s" % os.path.basename(job["result"]))
+                # the scanner's watcher may miss a replaced package, the first scan finds it when there is no scanner yet
+                if self.plasmoidScanner is not None:
+                    self.plasmoidScanner.rescan([job["result"]])
+            elif job["state"] == "done" and job["kind"] == "update":
+                self.statusBar().showMessage("Updated %s, %.1f MB by %s" % (job["args"]["name"], job["result"]["transferred"] / 1e6, job["result"]["method"]))
+                # the update is installed, the sidebar should not offer it again
+                if job["args"].get("version"):
+                    self.updates.checker.setVersion(job["args"]["name"], job["args"]["version"])
+                    self.updates.check(force=True)
+
+    def downloadChanged(self, percent, rate, eta):
+        progress = self.progressBars.get(self.downloadPage)
+        if progress is not None:
+            progress.setValue(percent)
+        if eta is None:
+            self.statusBar().showMessage("Downloading %d%%" % percent)
+        else:
+            self.statusBar().showMessage("Downloading %d%% at %.1f MB/s, %d s left" % (percent, rate / 1e6, eta))
+
+    def updatesChecked(self, results):
+        available = [result for result in results if result.available]
+        button = self.sidebar.navigation["updates"]
+        if available:
+            button.setIcon(self.useIcon("update-medium"))
+            self.statusBar().showMessage("%d update(s) available" % len(available))
+        else:
+            button.setIcon(self.useIcon("update-none"))
+
+    def closeEvent(self, event):
+        self.signals.close()
+        self.jobs.shutdown()
+        self.updates.checker.shutdown()
+        if self.plasmoidScanner is not None:
+            self.plasmoidScanner.shutdown()
+        self.catalogStore.close()
+        self.downloads.shutdown()
+        shutdownMediaCache()
+        super().closeEvent(event)
+
+    def changeEvent(self, event):
+        # regenerate the application stylesheet for the new palette
+        if event.type() == QEvent.PaletteChange:
+            styleSheet().apply()
+            # a palette can change before the sidebar exists
+            if hasattr(self, "sidebar"):
+                self.sidebar.paletteChanged()
+        super().changeEvent(event)
+
     def _createStatusBar(self):
         self.statusBar().showMessage("Ready")
 
@@ -258,12 +717,7 @@ class Window(QMainWindow):
         return self.isDarkMode()
 
     def isDarkMode(self):
-        # QT check if bakcground is dark
-        if self.palette().color(QPalette.Background).value() < 128:
-            print("Dark mode")
-            return True
-        else:
-            return False
+        return iconProvider().isDarkMode()
 
 
         
@@ -0,0 +1,102 @@
+# compare size and cold/warm launch-to-first-window of PyInstaller bundles
+# build both profiles first (pyinstaller main.spec && pyinstaller main-lean.spec), then run:
+#   python benchmarks/bench_bundle.py [--runs N] [dist/main dist/main-lean]
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def bundleSize(path):
+    size = 0
+    files = 0
+    for directory, _, names in os.walk(path):
+        for name in names:
+            file = os.path.join(directory, name)
+            if not os.path.islink(file):
+                size += os.path.getsize(file)
+                files += 1
+    return size, files
+
+
+def evict(path):
+    # drop the bundle from the page cache so the next launch has to read it from disk
+    for directory, _, names in os.walk(path):
+        for name in names:
+            try:
+                fd = os.open(os.path.join(directory, name), os.O_RDONLY)
+            except OSError:
+                continue
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            finally:
+                os.close(fd)
+
+
+def launch(executable):
+    # main.py --profile-startup quits after the first paint of the main window
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, 'profile.json')
+        start = time.perf_counter()
+        subprocess.run([executable, '--profile-startup=' + output], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True, timeout=120)
+        wall = time.perf_counter() - start
+        with open(output) as file:
+            profile = json.load(file)
+    return wall, profile['marks_ms'].get('first paint', 0.0) / 1000
+
+
+def median(samples):
+    samples = sorted(samples)
+    return samples[len(samples) // 2]
+
+
+def measure(path, runs):
+    executable = os.path.join(path, os.path.basename(os.path.normpath(path)))
+    size, files = bundleSize(path)
+    result = {'bundle': path, 'bytes': size, 'files': files}
+    for mode in ('cold', 'warm'):
+        walls = []
+        paints = []
+        if mode == 'warm':
+            launch(executable)
+        for i in range(runs):
+            if mode == 'cold':
+                evict(path)
+            wall, paint = launch(executable)
+            walls.append(wall)
+            paints.append(paint)
+        result[mode] = {'launch_to_exit_ms': median(walls) * 1000, 'first_paint_ms': median(paints) * 1000}
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure bundle size and launch time of PyInstaller builds.')
+    parser.add_argument('bundles', nargs='*', default=[os.path.join(ROOT, 'dist', 'main'), os.path.join(ROOT, 'dist', 'main-lean')])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    results = []
+    for path in args.bundles:
+        if not os.path.isdir(path):
+            print('skipping %s: not built' % path, file=sys.stderr)
+            continue
+        result = measure(path, args.runs)
+        results.append(result)
+        print('%-20s %8.1f MB %6d files  cold %8.1f ms (first paint %7.1f ms)  warm %8.1f ms (first paint %7.1f ms)' % (
+            os.path.basename(os.path.normpath(path)), result['bytes'] / 1e6, result['files'],
+            result['cold']['launch_to_exit_ms'], result['cold']['first_paint_ms'],
+            result['warm']['launch_to_exit_ms'], result['warm']['first_paint_ms']))
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(results, file, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,69 @@
+# construction time, scroll frame time and resident memory of the catalog list at 1k, 10k and 50k entries
+# run with: QT_QPA_PLATFORM=offscreen python benchmarks/bench_catalog.py [sizes...]
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+
+def rss():
+    with open('/proc/self/status') as file:
+        for line in file:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def run(count, frames=200):
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtGui import QImage, QColor
+    from catalog import CatalogEntry
+    from catalogview import CatalogModel, CatalogView
+
+    root = QApplication(sys.argv[:1])
+    # a few hundred distinct icon files shared between the rows
+    directory = tempfile.mkdtemp()
+    icons = []
+    for i in range(256):
+        image = QImage(128, 128, QImage.Format_ARGB32)
+        image.fill(QColor.fromHsv(i % 360, 200, 200))
+        path = os.path.join(directory, '%d.png' % i)
+        image.save(path)
+        icons.append(path)
+    entries = [CatalogEntry('app%d' % i, 'Application %d' % i, 'Summary of application number %d' % i, icons[i % len(icons)]) for i in range(count)]
+    baseline = rss()
+
+    start = time.perf_counter()
+    model = CatalogModel(entries)
+    view = CatalogView(model)
+    view.resize(480, 640)
+    view.show()
+    root.processEvents()
+    construction = time.perf_counter() - start
+
+    samples = []
+    bar = view.verticalScrollBar()
+    step = view.viewport().height() // 2
+    for frame in range(frames):
+        start = time.perf_counter()
+        bar.setValue((bar.value() + step) % (bar.maximum() + 1))
+        view.viewport().repaint()
+        # deliver icons decoded on the thread pool
+        root.processEvents()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    print('%6d entries  construct %8.2f ms  frame median %6.2f ms  p95 %6.2f ms  rss +%6.1f MB' % (
+        count, construction * 1000, samples[len(samples) // 2] * 1000, samples[int(len(samples) * 0.95)] * 1000, (rss() - baseline) / 1e6))
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 2 and sys.argv[1] == '--run':
+        run(int(sys.argv[2]))
+    else:
+        # every size runs in its own process so resident memory is not shared between them
+        for count in sys.argv[1:] or ['1000', '10000', '50000']:
+            subprocess.run([sys.executable, __file__, '--run', count], check=True)
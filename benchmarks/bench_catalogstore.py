@@ -0,0 +1,103 @@
+# cold catalog load from the local store against a full JSON re-parse, plus on-disk size and delta cost
+# run with: python benchmarks/bench_catalogstore.py [entries]
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from catalog import CatalogEntry
+from catalogstore import CatalogStore
+
+WORDS = ['plasma', 'clock', 'widget', 'dock', 'note', 'network', 'monitor', 'terminal', 'editor', 'image', 'viewer', 'music', 'player', 'weather', 'system', 'panel', 'launcher', 'calendar', 'mail', 'files']
+
+
+def item(rng, i, revision=1):
+    # one catalog entry as the server sends it, with the detail fields the list does not show
+    return {
+        'id': 'org.example.app%d' % i,
+        'name': ' '.join(rng.choice(WORDS) for j in range(rng.randint(1, 3))).title(),
+        'summary': ' '.join(rng.choice(WORDS) for j in range(rng.randint(5, 12))),
+        'icon': 'application-x-%d' % (i % 500),
+        'version': '%d.%d.%d' % (revision, rng.randint(0, 20), rng.randint(0, 99)),
+        'keywords': ' '.join(rng.choice(WORDS) for j in range(rng.randint(0, 4))),
+        'kind': 'app',
+        'description': ' '.join(rng.choice(WORDS) for j in range(rng.randint(40, 120))),
+        'homepage': 'https://example.org/app%d' % i,
+        'license': rng.choice(['GPL-2.0+', 'GPL-3.0', 'LGPL-2.1', 'MIT']),
+        'screenshots': ['https://example.org/app%d/%d.png' % (i, j) for j in range(rng.randint(1, 5))],
+        'developer': 'Developer %d' % rng.randint(0, 2000),
+    }
+
+
+def loadJson(path):
+    with open(path) as file:
+        data = json.load(file)
+    return [CatalogEntry(item['id'], item['name'], item['summary'], item['icon'], item['version'], item['keywords'], item['kind']) for item in data['entries']]
+
+
+def loadStore(path):
+    store = CatalogStore(path)
+    entries = store.load('apps')
+    store.close()
+    return entries
+
+
+def measure(kind, path):
+    # a fresh process per load, like a launch
+    start = time.perf_counter()
+    entries = loadJson(path) if kind == 'json' else loadStore(path)
+    print('%.2f %d' % ((time.perf_counter() - start) * 1000, len(entries)))
+
+
+def cold(kind, path, runs=5):
+    samples = []
+    for run in range(runs):
+        output = subprocess.run([sys.executable, __file__, '--measure', kind, path], check=True, stdout=subprocess.PIPE, universal_newlines=True).stdout.split()
+        samples.append(float(output[0]))
+    return sorted(samples)[runs // 2], int(output[1])
+
+
+def size(path):
+    # the store keeps a write-ahead log next to the database until it is checkpointed
+    return sum(os.path.getsize(path + suffix) for suffix in ('', '-wal') if os.path.exists(path + suffix))
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 3 and sys.argv[1] == '--measure':
+        measure(sys.argv[2], sys.argv[3])
+        sys.exit()
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    rng = random.Random(1)
+    directory = tempfile.mkdtemp()
+    items = [item(rng, i) for i in range(count)]
+    jsonPath = os.path.join(directory, 'catalog.json')
+    with open(jsonPath, 'w') as file:
+        json.dump({'revision': 1, 'entries': items}, file)
+    storePath = os.path.join(directory, 'catalog.sqlite')
+    store = CatalogStore(storePath)
+    start = time.perf_counter()
+    store.apply('apps', {'revision': 1, 'full': True, 'entries': items})
+    full = time.perf_counter() - start
+    store.connection.execute('pragma wal_checkpoint(truncate)')
+
+    # a typical update touches a small share of the catalog
+    changed = [item(rng, rng.randrange(count), 2) for i in range(count // 100)]
+    removed = ['org.example.app%d' % rng.randrange(count) for i in range(count // 1000)]
+    start = time.perf_counter()
+    store.apply('apps', {'revision': 2, 'entries': changed, 'removed': removed})
+    delta = time.perf_counter() - start
+    store.connection.execute('pragma wal_checkpoint(truncate)')
+    store.close()
+
+    jsonTime, jsonCount = cold('json', jsonPath)
+    storeTime, storeCount = cold('store', storePath)
+    print('%d entries' % count)
+    print('full JSON re-parse   %8.1f ms  %6.1f MB on disk' % (jsonTime, os.path.getsize(jsonPath) / 1e6))
+    print('local store load     %8.1f ms  %6.1f MB on disk  (%d rows)' % (storeTime, size(storePath) / 1e6, storeCount))
+    print('initial full import  %8.1f ms' % (full * 1000))
+    print('delta of %d changed, %d removed  %8.1f ms' % (len(changed), len(removed), delta * 1000))
@@ -0,0 +1,148 @@
+# headless update check against the GUI: no Qt imported, exit codes, startup time and peak RSS
+# run with the interpreter that has PyQt5: python benchmarks/bench_cli.py [runs]
+import http.server
+import json
+import os
+import shutil
+import socketserver
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+# modules the command must never load
+GUI_MODULES = ('PyQt5', 'sip', 'qt_material', 'resources', 'app', 'icons', 'styles')
+PROBE = '''
+import json, sys
+import quaternion
+code = quaternion.main(sys.argv[1:])
+loaded = sorted(name for name in sys.modules if name.split('.')[0] in %r)
+sys.stderr.write(json.dumps({'code': code, 'loaded': loaded}) + '\\n')
+''' % (GUI_MODULES,)
+
+# runs a module or script and writes its peak RSS to BENCH_PEAK on exit, VmHWM of the new process
+# rather than ru_maxrss which also counts the memory of the benchmark it was forked from
+WRAPPER = '''
+import atexit, os, runpy, sys
+def peak():
+    with open('/proc/self/status') as status, open(os.environ['BENCH_PEAK'], 'w') as output:
+        output.write(next(line.split()[1] for line in status if line.startswith('VmHWM')))
+atexit.register(peak)
+target = sys.argv.pop(1)
+if target.endswith('.py'):
+    sys.argv[0] = target
+    runpy.run_path(target, run_name='__main__')
+else:
+    runpy.run_module(target, run_name='__main__', alter_sys=True)
+'''
+
+
+class Server(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    """Serves /<name>.json update feeds and counts the requests."""
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests += 1
+        body = json.dumps({'version': self.server.versions.get(self.path.strip('/').split('.')[0], '1.0')}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def check(name, ok, detail=''):
+    print('%-52s %s  %s' % (name, 'ok' if ok else 'FAILED', detail))
+    return ok
+
+
+def run(command, env):
+    # (exit code, seconds, stdout, stderr) of one child process
+    start = time.perf_counter()
+    process = subprocess.run(command, cwd=ROOT, env=env, capture_output=True)
+    elapsed = time.perf_counter() - start
+    return process.returncode, elapsed, process.stdout.decode('utf-8', 'replace'), process.stderr.decode('utf-8', 'replace')
+
+
+def measured(target, arguments, env):
+    # (exit code, seconds, peak RSS in MB, stdout, stderr) of target run through the wrapper
+    code, elapsed, out, err = run([sys.executable, '-c', WRAPPER, target] + arguments, env)
+    try:
+        with open(env['BENCH_PEAK']) as file:
+            peak = int(file.read()) / 1024.0
+        os.remove(env['BENCH_PEAK'])
+    except (OSError, ValueError):
+        peak = 0.0
+    return code, elapsed, peak, out, err
+
+
+def timed(target, arguments, env, runs):
+    samples = [measured(target, arguments, env) for i in range(runs)]
+    return statistics.median(sample[1] for sample in samples), statistics.median(sample[2] for sample in samples), samples[-1]
+
+
+if __name__ == '__main__':
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    server = Server(('127.0.0.1', 0), Handler)
+    server.lock = threading.Lock()
+    server.requests = 0
+    server.versions = {'quaternion': '1.0', 'plasmoids': '2.1'}
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = 'http://127.0.0.1:%d/' % server.server_address[1]
+    directory = tempfile.mkdtemp()
+    env = dict(os.environ, XDG_CACHE_HOME=os.path.join(directory, 'cache'), XDG_CONFIG_HOME=os.path.join(directory, 'config'), QT_QPA_PLATFORM='offscreen', BENCH_PEAK=os.path.join(directory, 'peak'))
+    empty = os.path.join(directory, 'empty.py')
+    open(empty, 'w').close()
+    os.makedirs(os.path.join(directory, 'config', 'quaternion'))
+    sources = os.path.join(directory, 'config', 'quaternion', 'sources.json')
+    with open(sources, 'w') as file:
+        json.dump([{'name': 'quaternion', 'url': base + 'quaternion.json', 'version': '1.0'}, {'name': 'plasmoids', 'url': base + 'plasmoids.json', 'version': '2.0'}], file)
+    results = []
+    try:
+        probe = [sys.executable, '-c', PROBE, 'check', '--json']
+        code, elapsed, out, err = run(probe, env)
+        report = json.loads(err.strip().splitlines()[-1])
+        results.append(check('check imports no Qt or GUI module', report['loaded'] == [], ', '.join(report['loaded'])))
+        data = json.loads(out)
+        results.append(check('updates available exit with %d' % 100, report['code'] == 100 and data['available'] == 1, '%s -> %s' % (data['results'][1]['installed'], data['results'][1]['latest'])))
+
+        command = [sys.executable, '-m', 'quaternion', 'check']
+        fetched = server.requests
+        fresh, freshRss, sample = timed('quaternion', ['check'], env, runs)
+        results.append(check('a fresh cache answers without the network', server.requests == fetched and sample[0] == 100, '%d requests' % (server.requests - fetched)))
+        results.append(check('a fresh check takes tens of milliseconds', fresh < 0.1, '%.0f ms' % (fresh * 1000)))
+        refresh, refreshRss, sample = timed('quaternion', ['check', '--refresh'], env, runs)
+
+        server.versions['plasmoids'] = '2.0'
+        code = run(command + ['--refresh'], env)[0]
+        results.append(check('nothing to update exits with 0', code == 0))
+        with open(sources, 'w') as file:
+            json.dump([{'name': 'gone', 'url': 'http://127.0.0.1:1/gone.json', 'version': '1.0'}], file)
+        code, elapsed, out, err = run(command + ['--refresh'], env)
+        results.append(check('an unreachable source exits with 1', code == 1 and err.startswith('gone:')))
+        code = run(command + ['--bogus'], env)[0]
+        results.append(check('a usage error exits with 2', code == 2))
+
+        # the GUI up to its first paint, through the startup profiler so it quits by itself
+        bare, bareRss, sample = timed(empty, [], env, runs)
+        gui, guiRss, sample = timed('main.py', ['--profile-startup=%s' % os.path.join(directory, 'profile.json')], env, runs)
+        guiOk = sample[0] == 0
+        print()
+        print('%-28s %10s %10s' % ('median of %d runs' % runs, 'time', 'peak RSS'))
+        print('%-28s %7.0f ms %7.1f MB' % ('interpreter alone', bare * 1000, bareRss))
+        print('%-28s %7.0f ms %7.1f MB' % ('check, fresh cache', fresh * 1000, freshRss))
+        print('%-28s %7.0f ms %7.1f MB' % ('check --refresh', refresh * 1000, refreshRss))
+        print('%-28s %7.0f ms %7.1f MB' % ('GUI to first paint', gui * 1000, guiRss) if guiOk else 'GUI did not start: %s' % sample[4].strip()[-200:])
+    finally:
+        server.shutdown()
+        shutil.rmtree(directory, ignore_errors=True)
+    sys.exit(0 if all(results) else 1)
@@ -0,0 +1,184 @@
+# binary delta updates against full downloads, for pairs of local artifacts built from the files in dist/main
+# run with: python benchmarks/bench_delta.py [megabytes]
+import functools
+import hashlib
+import http.server
+import os
+import random
+import shutil
+import socketserver
+import sys
+import tarfile
+import tempfile
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import requests
+from delta import applyDelta, makeDelta, updateFile
+from downloads import DownloadManager
+
+BUNDLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dist', 'main')
+
+
+class Server(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+
+
+class Handler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def check(name, ok, detail=''):
+    print('%-52s %s  %s' % (name, 'ok' if ok else 'FAILED', detail))
+    return ok
+
+
+def sha256(path):
+    with open(path, 'rb') as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def bundleFiles(limit):
+    # the largest files of the bundle up to limit bytes, in a stable order
+    files = sorted((os.path.getsize(os.path.join(folder, name)), os.path.join(folder, name)) for folder, dirs, names in os.walk(BUNDLE) for name in names)
+    chosen = []
+    total = 0
+    for size, path in reversed(files):
+        if total + size > limit:
+            continue
+        chosen.append(path)
+        total += size
+    return sorted(chosen)
+
+
+def mutate(data, rng, edits=4):
+    # a rebuilt library: a few functions changed in place, a little code inserted and some removed
+    data = bytearray(data)
+    for i in range(edits):
+        position = rng.randrange(len(data) - 512)
+        data[position:position + 256] = bytes(rng.randrange(256) for i in range(256))
+    position = rng.randrange(len(data))
+    data[position:position] = bytes(rng.randrange(256) for i in range(rng.randrange(64, 512)))
+    position = rng.randrange(len(data) - 512)
+    del data[position:position + rng.randrange(64, 512)]
+    return bytes(data)
+
+
+def makeBundles(directory, limit):
+    # version 1 is a tar of bundle files, version 2 rebuilds a few of them and adds one
+    rng = random.Random(7)
+    files = bundleFiles(limit)
+    libraries = [path for path in files if os.path.getsize(path) > 64 * 1024]
+    changed = set(rng.sample(libraries, min(3, len(libraries))))
+    old = os.path.join(directory, 'bundle-1.tar')
+    new = os.path.join(directory, 'bundle-2.tar')
+    with tarfile.open(old, 'w') as first, tarfile.open(new, 'w') as second:
+        for path in files:
+            name = os.path.relpath(path, BUNDLE)
+            first.add(path, name)
+            if path in changed:
+                rebuilt = os.path.join(directory, 'rebuilt')
+                with open(path, 'rb') as source, open(rebuilt, 'wb') as target:
+                    target.write(mutate(source.read(), rng))
+                second.add(rebuilt, name)
+            else:
+                second.add(path, name)
+        extra = os.path.join(directory, 'extra')
+        with open(extra, 'wb') as file:
+            file.write(os.urandom(200 * 1024))
+        second.add(extra, 'new-module.so')
+    return old, new, [os.path.relpath(path, BUNDLE) for path in sorted(changed)]
+
+
+def makeLibrary(directory):
+    # one library with a few bytes inserted near its start, every later byte moves
+    library = max(bundleFiles(8 * 1024 * 1024), key=os.path.getsize)
+    old = os.path.join(directory, 'library-1')
+    new = os.path.join(directory, 'library-2')
+    shutil.copyfile(library, old)
+    with open(library, 'rb') as file:
+        data = file.read()
+    with open(new, 'wb') as file:
+        file.write(data[:4096] + b'inserted' * 37 + data[4096:])
+    return old, new
+
+
+def pair(name, old, new, served, base, manager, results):
+    patch = os.path.join(served, name + '.qdelta')
+    start = time.perf_counter()
+    patchSize, copied, literal = makeDelta(old, new, patch)
+    made = time.perf_counter() - start
+    shutil.copyfile(new, os.path.join(served, name))
+    digest = sha256(new)
+    package = {'url': base + name, 'sha256': digest, 'size': os.path.getsize(new), 'deltas': {'1': {'url': base + name + '.qdelta', 'size': patchSize}}}
+    output = os.path.join(os.path.dirname(old), name + '-out')
+    start = time.perf_counter()
+    path, method, deltaBytes = updateFile(manager, package, '1', old, output)
+    deltaTime = time.perf_counter() - start
+    deltaOk = method == 'delta' and sha256(path) == digest
+    os.remove(path)
+    start = time.perf_counter()
+    path, fullMethod, fullBytes = updateFile(manager, package, '0', old, output)
+    fullTime = time.perf_counter() - start
+    os.remove(path)
+    print('%s: %.1f MB, patch made in %.0f ms, %.1f%% of the bytes copied from the installed file' % (name, os.path.getsize(new) / 1e6, made * 1000, copied * 100.0 / (copied + literal)))
+    # loopback hides the transfer, the last column adds it for a 50 Mbit/s line
+    print('  %-10s %12d bytes  %8.0f ms locally  %8.0f ms at 50 Mbit/s' % ('delta', deltaBytes, deltaTime * 1000, (deltaTime + deltaBytes * 8 / 50e6) * 1000))
+    print('  %-10s %12d bytes  %8.0f ms locally  %8.0f ms at 50 Mbit/s' % ('full', fullBytes, fullTime * 1000, (fullTime + fullBytes * 8 / 50e6) * 1000))
+    results.append(check('%s: delta rebuilds the target' % name, deltaOk, '%.1f%% of the full download' % (deltaBytes * 100.0 / fullBytes)))
+    return package
+
+
+if __name__ == '__main__':
+    limit = int(float(sys.argv[1]) * 1024 * 1024) if len(sys.argv) > 1 else 32 * 1024 * 1024
+    if not os.path.isdir(BUNDLE):
+        sys.exit('needs the PyInstaller bundle in dist/main')
+    directory = tempfile.mkdtemp()
+    served = os.path.join(directory, 'served')
+    os.makedirs(served)
+    server = Server(('127.0.0.1', 0), functools.partial(Handler, directory=served))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = 'http://127.0.0.1:%d/' % server.server_address[1]
+    manager = DownloadManager(requests.Session())
+    results = []
+    try:
+        old, new, changed = makeBundles(directory, limit)
+        print('bundle-2.tar rebuilds %s and adds a module' % ', '.join(changed))
+        package = pair('bundle-2.tar', old, new, served, base, manager, results)
+        library = pair('library-2', *makeLibrary(directory), served=served, base=base, manager=manager, results=results)
+        print()
+
+        # the patch is read in buffers, memory does not grow with the file
+        tracemalloc.start()
+        with open(os.path.join(served, 'bundle-2.tar.qdelta'), 'rb') as stream:
+            applyDelta(old, stream, os.path.join(directory, 'streamed'))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        results.append(check('patching keeps memory bounded', peak < 2 * 1024 * 1024, 'peak %.0f KB for a %.0f MB target' % (peak / 1024, os.path.getsize(new) / 1e6)))
+
+        # a missing patch, a corrupt one and one for another version all end in the full download
+        output = os.path.join(directory, 'fallback')
+        missing = dict(library, deltas={'1': {'url': base + 'missing.qdelta'}})
+        path, method, transferred = updateFile(manager, missing, '1', os.path.join(directory, 'library-1'), output)
+        results.append(check('a missing patch falls back to the full file', method == 'full' and sha256(path) == library['sha256']))
+        os.remove(path)
+        with open(os.path.join(served, 'library-2.qdelta'), 'rb') as file:
+            data = bytearray(file.read())
+        data[len(data) // 2] ^= 0xff
+        with open(os.path.join(served, 'corrupt.qdelta'), 'wb') as file:
+            file.write(data)
+        corrupt = dict(library, deltas={'1': {'url': base + 'corrupt.qdelta'}})
+        path, method, transferred = updateFile(manager, corrupt, '1', os.path.join(directory, 'library-1'), output)
+        results.append(check('a corrupt patch falls back to the full file', method == 'full' and sha256(path) == library['sha256'] and not os.path.exists(output + '.part')))
+        os.remove(path)
+        path, method, transferred = updateFile(manager, package, '1', os.path.join(directory, 'library-1'), output)
+        results.append(check('a patch for another version falls back', method == 'full' and sha256(path) == package['sha256']))
+    finally:
+        server.shutdown()
+        manager.shutdown()
+        shutil.rmtree(directory, ignore_errors=True)
+    sys.exit(0 if all(results) else 1)
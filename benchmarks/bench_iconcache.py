@@ -0,0 +1,77 @@
+# icons at the standard sizes on a 2x screen: rendering the svg every launch against the on-disk pixmap cache
+# run with: QT_QPA_PLATFORM=offscreen python benchmarks/bench_iconcache.py [icons]
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+os.environ.setdefault('QT_SCALE_FACTOR', '2')
+
+from PyQt5.QtCore import *
+from PyQt5.QtWidgets import *
+from PyQt5.QtGui import *
+from PyQt5.QtSvg import QSvgRenderer
+import icons
+import iconindex
+
+
+def svgEveryLaunch(names, ratio):
+    # what the svg icon engine did: parse the recoloured svg, then render each requested size
+    provider = icons.IconProvider()
+    for name in names:
+        data = icons.recolorSvg(provider.source(name)[0].decode('utf-8'), colorScheme).encode('utf-8')
+        renderer = QSvgRenderer(QByteArray(data))
+        for size in icons.ICON_SIZES:
+            pixmap = QPixmap(int(size * ratio), int(size * ratio))
+            pixmap.fill(Qt.transparent)
+            painter = QPainter(pixmap)
+            renderer.render(painter, QRectF(pixmap.rect()))
+            painter.end()
+
+
+def builder(names, directory, limit=icons.PIXMAP_CACHE_LIMIT):
+    # a fresh provider is a later launch, only the pixmaps on disk carry over
+    provider = icons.IconProvider()
+    provider.builder = icons.IconBuilder(provider, icons.PixmapCache(directory, limit))
+    for name in names:
+        provider.icon(name)
+    return provider.builder.cache
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return (time.perf_counter() - start) * 1000, result
+
+
+if __name__ == '__main__':
+    root = QApplication(sys.argv[:1])
+    icons.registerResources()
+    colorScheme = icons.colorScheme(QApplication.palette())
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    iconindex.iconIndex()
+    random.seed(1)
+    names = random.sample(sorted(iconindex.scanTheme(iconindex.ICONS)), count)
+    ratio = root.devicePixelRatio()
+    directory = tempfile.mkdtemp()
+    try:
+        svg = timed(svgEveryLaunch, names, ratio)[0]
+        cold = timed(builder, names, directory)[0]
+        warm = min(timed(builder, names, directory)[0] for run in range(3))
+        total = sum(entry.stat().st_size for entry in os.scandir(directory))
+        print('%d icons x %d sizes at %gx' % (count, len(icons.ICON_SIZES), ratio))
+        print('svg parse and render every launch  %8.1f ms' % svg)
+        print('pixmap cache, first launch         %8.1f ms  %d pixmaps, %d bytes on disk' % (cold, len(os.listdir(directory)), total))
+        print('pixmap cache, later launches       %8.1f ms' % warm)
+        # a limit of a third of the set keeps the directory under it
+        limit = total // 3
+        shutil.rmtree(directory)
+        os.makedirs(directory)
+        builder(names, directory, limit)
+        print('limit %d bytes: %d bytes on disk in %d pixmaps' % (limit, sum(entry.stat().st_size for entry in os.scandir(directory)), len(os.listdir(directory))))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
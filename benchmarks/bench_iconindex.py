@@ -0,0 +1,75 @@
+# icon name resolution over assets/icons: probing the theme directories against the memory-mapped index
+# run with: python benchmarks/bench_iconindex.py [lookups]
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import build_resources
+import iconindex
+
+
+class Counter(object):
+    """Counts the filesystem calls made through os while installed."""
+    def __init__(self):
+        self.calls = 0
+        self.originals = {}
+
+    def install(self):
+        for name in ('stat', 'listdir', 'scandir'):
+            original = getattr(os, name)
+            self.originals[name] = original
+            setattr(os, name, self.wrap(original))
+
+    def wrap(self, original):
+        def counted(*args, **kwargs):
+            self.calls += 1
+            return original(*args, **kwargs)
+        return counted
+
+    def uninstall(self):
+        for name, original in self.originals.items():
+            setattr(os, name, original)
+
+
+def timed(function, names):
+    # per lookup latencies in microseconds
+    latencies = []
+    for name in names:
+        start = time.perf_counter()
+        function(name)
+        latencies.append((time.perf_counter() - start) * 1e6)
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(len(latencies) * 0.99)]
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    root = iconindex.ICONS
+    path = os.path.join(tempfile.mkdtemp(), 'icons.idx')
+    start = time.perf_counter()
+    index = iconindex.openIndex(root, path)
+    build = time.perf_counter() - start
+    index.close()
+    start = time.perf_counter()
+    index = iconindex.openIndex(root, path)
+    opened = time.perf_counter() - start
+    names = sorted(iconindex.scanTheme(root))
+    random.seed(1)
+    # one in ten names is missing from the theme, those cost the probe the most
+    lookups = [random.choice(names) if i % 10 else 'missing-icon-%d' % i for i in range(count)]
+    counter = Counter()
+    counter.install()
+    probe = timed(lambda name: build_resources.resolveIcon(name, theme=os.path.relpath(root, build_resources.ROOT)), lookups[:count // 10])
+    probeCalls = counter.calls / (count // 10)
+    counter.calls = 0
+    lookup = timed(lambda name: index.resolve(name, 22, 2.0), lookups)
+    lookupCalls = counter.calls / count
+    counter.uninstall()
+    print('%d names, index %d bytes, built in %.1f ms, opened and checked in %.2f ms' % (len(names), os.path.getsize(path), build * 1000, opened * 1000))
+    print('directory probing   median %9.1f us  p99 %9.1f us  %6.1f filesystem calls per lookup' % (probe + (probeCalls,)))
+    print('mapped index        median %9.1f us  p99 %9.1f us  %6.1f filesystem calls per lookup' % (lookup + (lookupCalls,)))
@@ -0,0 +1,126 @@
+# media cache against a local HTTP server: one download for concurrent requests, hits, revalidation and the size cap
+# run with: python benchmarks/bench_mediacache.py [images]
+import hashlib
+import http.server
+import os
+import shutil
+import socketserver
+import struct
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor, wait
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import requests
+from mediacache import MediaCache
+
+
+def png(seed, size=64):
+    # a small valid png whose pixels depend on seed
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+    rows = b''.join(b'\0' + b''.join(bytes(((x * seed + y) & 255, (y * seed) & 255, seed & 255)) for x in range(size)) for y in range(size))
+    return b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', struct.pack('>IIBBBBB', size, size, 8, 2, 0, 0, 0)) + chunk(b'IDAT', zlib.compress(rows)) + chunk(b'IEND', b'')
+
+
+class Server(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    """Serves /image/<n>.png with an ETag, /shared/<n>.png with the content of image 0, each answer delayed a little."""
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests[self.path] = server.requests.get(self.path, 0) + 1
+        time.sleep(server.delay)
+        number = int(self.path.rsplit('/', 1)[1].split('.')[0])
+        body = server.images[0 if self.path.startswith('/shared/') else number]
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        if self.headers.get('If-None-Match') == etag:
+            with server.lock:
+                server.notModified += 1
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'max-age=%d' % server.maxAge)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/png')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'max-age=%d' % server.maxAge)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def check(name, ok, detail=''):
+    print('%-52s %s  %s' % (name, 'ok' if ok else 'FAILED', detail))
+    return ok
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    server = Server(('127.0.0.1', 0), Handler)
+    server.lock = threading.Lock()
+    server.requests = {}
+    server.notModified = 0
+    server.delay = 0.05
+    server.maxAge = 3600
+    server.images = [png(i + 1) for i in range(count)]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = 'http://127.0.0.1:%d' % server.server_address[1]
+    urls = ['%s/image/%d.png' % (base, i) for i in range(count)]
+    directory = tempfile.mkdtemp()
+    session = requests.Session()
+    results = []
+    try:
+        cache = MediaCache(directory, session=session)
+        # every row of a list asks at once, two rows per image
+        start = time.perf_counter()
+        with ThreadPoolExecutor(16) as pool:
+            futures = [pool.submit(lambda url: cache.get(url).result(), url) for url in urls * 2 + urls]
+            wait(futures)
+        first = time.perf_counter() - start
+        results.append(check('concurrent requests share one download', all(server.requests.get(url[len(base):]) == 1 for url in urls), '%d requests for %d urls in %.0f ms' % (sum(server.requests.values()), count, first * 1000)))
+        results.append(check('files hold the served bytes', all(open(future.result(), 'rb').read() in server.images for future in futures)))
+        start = time.perf_counter()
+        for url in urls:
+            cache.get(url).result()
+        hits = time.perf_counter() - start
+        results.append(check('fresh entries are served from disk', sum(server.requests.values()) == count, '%d lookups in %.2f ms' % (count, hits * 1000)))
+        # a new launch with expired entries revalidates instead of downloading
+        cache.shutdown()
+        for entry in cache.entries.values():
+            entry['expires'] = 0
+        cache.saveIndex()
+        cache = MediaCache(directory, session=session)
+        for url in urls:
+            cache.get(url).result()
+        results.append(check('expired entries are revalidated with 304', server.notModified == count, '%d not modified' % server.notModified))
+        stats = cache.stats()
+        # urls with the same content share a file
+        shared = ['%s/shared/%d.png' % (base, i) for i in range(5)]
+        paths = set(cache.get(url).result() for url in shared)
+        results.append(check('identical content is stored once', len(paths) == 1 and paths == set([cache.get(urls[0]).result()])))
+        cache.shutdown()
+        # a cap of a quarter of the images keeps the directory under it
+        capped = MediaCache(tempfile.mkdtemp(dir=directory), limit=sum(len(image) for image in server.images) // 4, session=session)
+        for url in urls:
+            capped.get(url).result()
+        onDisk = sum(os.path.getsize(os.path.join(folder, name)) for folder, dirs, names in os.walk(capped.directory) for name in names if name != 'index.json')
+        results.append(check('size cap evicts least recently used', onDisk <= capped.limit and capped.total == onDisk, '%d of %d bytes kept, %d urls' % (onDisk, capped.limit, len(capped.entries))))
+        capped.shutdown()
+        print()
+        print('second launch: hit rate %.0f%%, %d bytes saved, %d bytes downloaded' % (stats['hitRate'] * 100, stats['bytesSaved'], stats['bytesDownloaded']))
+    finally:
+        server.shutdown()
+        shutil.rmtree(directory, ignore_errors=True)
+    sys.exit(0 if all(results) else 1)
@@ -0,0 +1,74 @@
+# measure page switch latency of the retained page stack against the old rebuild-everything navigation
+# run with: QT_QPA_PLATFORM=offscreen python benchmarks/bench_pages.py
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtCore import *
+from PyQt5.QtWidgets import *
+from PyQt5.QtGui import *
+import app
+
+PAGES = ["main", "apps", "plasmoid", "settings", "updates"]
+
+
+class LegacyWindow(app.Window):
+    # navigation as it was before the page stack: the whole central widget is rebuilt on every switch
+    # Window.__init__ sets up everything else as usual, the catalogs, jobs and update checks use the current sidebar
+    def Page(self, id):
+        self.currentPage = id
+        if self.centralWidget() is not None:
+            self.centralWidget().deleteLater()
+        layout = app.SideBar()
+        layout.addNavigation("Home", lambda: self.Page("main"), checked=self.pageIsOn("main"), page="main")
+        layout.addNavigationSpacer()
+        layout.addNavigation("Updates", lambda: self.Page("updates"), checked=self.pageIsOn("updates"), icon="update-none", colour="#FFA000", page="updates")
+        layout.addNavigation("Settings", lambda: self.Page("settings"), checked=self.pageIsOn("settings"), page="settings")
+        self.sidebar = layout
+        scrollablePage = self.scrollablePage()
+        if id in ("main", "apps", "plasmoid"):
+            self.progress = QProgressBar()
+            self.progress.setRange(0, 100)
+            self.progress.setFixedWidth(200)
+            self.progress.setFixedHeight(200)
+            self.progress.setStyleSheet("background-color: " + self.palette().color(QPalette.Highlight).name() + ";")
+            layout.addWidget(self.progress)
+        scrollablePage.setWidget(layout)
+        scrollablePage.setWidgetResizable(True)
+        self.setCentralWidget(scrollablePage)
+
+
+def switchLatency(root, win, rounds):
+    samples = []
+    for i in range(rounds):
+        id = PAGES[i % len(PAGES)]
+        start = time.perf_counter()
+        win.Page(id)
+        # include the relayout and the deferred deletes triggered by the switch
+        root.processEvents()
+        root.sendPostedEvents(None, QEvent.DeferredDelete)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples
+
+
+def report(name, samples):
+    mean = sum(samples) / len(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print("%-10s mean %8.3f ms  median %8.3f ms  p95 %8.3f ms" % (name, mean * 1000, samples[len(samples) // 2] * 1000, p95 * 1000))
+
+
+if __name__ == "__main__":
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    root = QApplication(sys.argv[:1])
+    for name, cls in (("before", LegacyWindow), ("after", app.Window)):
+        win = cls()
+        win.show()
+        root.processEvents()
+        report(name, switchLatency(root, win, rounds))
+        win.close()
+        win.deleteLater()
+        root.processEvents()
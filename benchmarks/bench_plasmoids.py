@@ -0,0 +1,54 @@
+# installed plasmoid scan over generated packages, without and with the metadata cache
+# run with: QT_QPA_PLATFORM=offscreen python benchmarks/bench_plasmoids.py [packages]
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtCore import QCoreApplication
+from plasmoids import PlasmoidScanner
+
+
+def generate(root, count):
+    for i in range(count):
+        package = os.path.join(root, 'org.example.plasmoid%d' % i)
+        os.makedirs(package)
+        if i % 3:
+            with open(os.path.join(package, 'metadata.json'), 'w') as file:
+                json.dump({'KPlugin': {'Id': 'org.example.plasmoid%d' % i, 'Name': 'Plasmoid %d' % i, 'Description': 'Generated widget number %d' % i, 'Icon': 'clock', 'Version': '1.%d' % i, 'Category': 'Utilities'}}, file)
+        else:
+            with open(os.path.join(package, 'metadata.desktop'), 'w') as file:
+                file.write('[Desktop Entry]\nName=Plasmoid %d\nComment=Generated widget number %d\nIcon=clock\nX-KDE-PluginInfo-Name=org.example.plasmoid%d\nX-KDE-PluginInfo-Version=1.%d\nX-KDE-PluginInfo-Category=Utilities\n' % (i, i, i, i))
+
+
+def scan(root, cachePath):
+    # time until the last batch arrived, and the time to the first one
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
+    scanner = PlasmoidScanner([root], cachePath)
+    found = []
+    first = []
+    done = []
+    start = time.perf_counter()
+    scanner.found.connect(lambda batch: (first or first.append(time.perf_counter() - start), found.extend(batch)))
+    scanner.scanned.connect(lambda packages: done.append(time.perf_counter() - start))
+    scanner.scan()
+    while not done:
+        app.processEvents()
+        time.sleep(0.001)
+    scanner.shutdown()
+    return len(found), first[0] if first else 0.0, done[0]
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    directory = tempfile.mkdtemp()
+    root = os.path.join(directory, 'plasmoids')
+    generate(root, count)
+    cachePath = os.path.join(directory, 'plasmoids.json')
+    for label in ('cold scan', 'cached scan'):
+        found, first, total = scan(root, cachePath)
+        print('%-12s %5d packages  first batch %7.1f ms  done %7.1f ms' % (label, found, first * 1000, total * 1000))
@@ -0,0 +1,109 @@
+# icon recoloring over the assets/icons tree: the qt_material algorithm against the single pass engine
+# run with: python benchmarks/bench_recolor.py [--verify] [--processes N] [source]
+# --verify compares the engine output byte for byte with the qt_material algorithm for several color sets
+import argparse
+import filecmp
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import recolor
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+# (primary, disabled, secondary), the later ones make replacements that later steps match again
+COLORS = [
+    ('#448aff', '#4f5b62', '#ffffff'),
+    ('#000000', '#ff0000', '#0000ff'),
+    ('#ff0000', '#000000', '#000000'),
+    ('#0000', '#00', '#ff00'),
+]
+
+
+def legacy(source, targets, secondary):
+    # ResourseGenerator.generate, walking the tree instead of one directory
+    for name in recolor.iconNames(source, recursive=True):
+        with open(os.path.join(source, name), 'r') as file:
+            content = file.read()
+        for folder, color in targets:
+            path = os.path.join(folder, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as file:
+                file.write(recolor.replaceSequential(content, recolor.iconSteps(color, secondary)))
+
+
+def targets(base, primary, disabled):
+    return [(os.path.join(base, 'disabled'), disabled), (os.path.join(base, 'primary'), primary)]
+
+
+def same(first, second):
+    # names of files that differ or are missing between two output trees
+    different = []
+    for name in recolor.iconNames(first, recursive=True):
+        if not os.path.exists(os.path.join(second, name)) or not filecmp.cmp(os.path.join(first, name), os.path.join(second, name), shallow=False):
+            different.append(name)
+    return different
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('source', nargs='?', default=os.path.join(ROOT, 'assets', 'icons'))
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--verify', action='store_true')
+    args = parser.parse_args()
+    work = tempfile.mkdtemp()
+    try:
+        if args.verify:
+            failed = False
+            for primary, disabled, secondary in COLORS:
+                expected = os.path.join(work, 'expected')
+                actual = os.path.join(work, 'actual')
+                legacy(args.source, targets(expected, primary, disabled), secondary)
+                recolor.recolorTree(args.source, targets(actual, primary, disabled), secondary, recursive=True, processes=args.processes)
+                different = same(expected, actual)
+                singlePass = all(recolor.Recolorer(recolor.iconSteps(color, secondary)).singlePass for color in (primary, disabled))
+                print('%-9s %-9s %-9s  %s  %s' % (primary, disabled, secondary, 'single pass' if singlePass else 'sequential ', 'identical' if not different else '%d files differ, e.g. %s' % (len(different), different[0])))
+                failed = failed or bool(different)
+                shutil.rmtree(expected)
+                shutil.rmtree(actual)
+            sys.exit(1 if failed else 0)
+
+        primary, disabled, secondary = COLORS[0]
+        names = recolor.iconNames(args.source, recursive=True)
+        count = len(names)
+        # the text work alone, file creation dominates the full runs on most filesystems
+        contents = []
+        for name in names:
+            with open(os.path.join(args.source, name), 'r') as file:
+                contents.append(file.read())
+        steps = [recolor.iconSteps(color, secondary) for color in (primary, disabled)]
+        start = time.perf_counter()
+        for content in contents:
+            for colorSteps in steps:
+                recolor.replaceSequential(content, colorSteps)
+        sequential = time.perf_counter() - start
+        recolorers = [recolor.Recolorer(colorSteps) for colorSteps in steps]
+        start = time.perf_counter()
+        for content in contents:
+            for recolorer in recolorers:
+                recolorer.apply(content)
+        singlePass = time.perf_counter() - start
+        start = time.perf_counter()
+        legacy(args.source, targets(os.path.join(work, 'legacy'), primary, disabled), secondary)
+        before = time.perf_counter() - start
+        start = time.perf_counter()
+        written, unchanged = recolor.recolorTree(args.source, targets(os.path.join(work, 'engine'), primary, disabled), secondary, recursive=True, processes=args.processes)
+        after = time.perf_counter() - start
+        start = time.perf_counter()
+        again = recolor.recolorTree(args.source, targets(os.path.join(work, 'engine'), primary, disabled), secondary, recursive=True, processes=args.processes)
+        rerun = time.perf_counter() - start
+        print('%d icons, 2 colors each, %d cpus' % (count, os.cpu_count()))
+        print('in memory: str.replace chain %8.1f ms, single pass %8.1f ms' % (sequential * 1000, singlePass * 1000))
+        print('qt_material algorithm      %8.1f ms' % (before * 1000))
+        print('single pass engine         %8.1f ms  %d written' % (after * 1000, written))
+        print('engine, output up to date  %8.1f ms  %d written, %d unchanged' % (rerun * 1000, again[0], again[1]))
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
@@ -0,0 +1,41 @@
+# compare importing the resources.py bytes literal with memory-mapping resources.rcc
+# run with: python benchmarks/bench_resources.py [rounds]
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# each snippet runs in a fresh interpreter after PyQt5 itself is imported so only the resource cost is timed
+PYTHON = '''
+import time
+from PyQt5 import QtCore
+start = time.perf_counter()
+import resources
+print(time.perf_counter() - start)
+'''
+
+RCC = '''
+import time
+from PyQt5 import QtCore
+start = time.perf_counter()
+QtCore.QResource.registerResource('resources.rcc')
+print(time.perf_counter() - start)
+'''
+
+
+def measure(snippet, rounds):
+    samples = []
+    for i in range(rounds):
+        # -B keeps a cached resources.pyc from hiding the unmarshal cost of the first import
+        output = subprocess.run([sys.executable, '-B', '-c', snippet], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+        samples.append(float(output))
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+if __name__ == '__main__':
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    for name, path, snippet in (('resources.py', 'resources.py', PYTHON), ('resources.rcc', 'resources.rcc', RCC)):
+        size = os.path.getsize(os.path.join(ROOT, path))
+        print('%-14s %8d bytes  median load %8.3f ms' % (name, size, measure(snippet, rounds) * 1000))
@@ -0,0 +1,162 @@
+# job scheduler: priority classes, per resource limits, dependencies, cancellation, a queue that survives a restart and batched changes
+# run with: python benchmarks/bench_scheduler.py [jobs]
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from scheduler import JobScheduler, JobCancelled
+
+
+def check(name, ok, detail=''):
+    print('%-52s %s  %s' % (name, 'ok' if ok else 'FAILED', detail))
+    return ok
+
+
+def settle(scheduler, timeout=10.0):
+    # wait until every job finished, draining changes like the UI timer would
+    batches = []
+    deadline = time.monotonic() + timeout
+    while scheduler.busy() and time.monotonic() < deadline:
+        jobs = scheduler.drainChanges()
+        if jobs:
+            batches.append(jobs)
+        time.sleep(0.02)
+    return batches
+
+
+class Recorder(object):
+    """Handlers that sleep, log their start order and track how many run at once per resource."""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = []
+        self.running = {}
+        self.peak = {}
+
+    def handler(self, resource, duration):
+        def run(job):
+            with self.lock:
+                self.started.append(job.args.get('name'))
+                self.running[resource] = self.running.get(resource, 0) + 1
+                self.peak[resource] = max(self.peak.get(resource, 0), self.running[resource])
+            try:
+                for step in range(5):
+                    time.sleep(duration / 5)
+                    job.report((step + 1) / 5)
+                if job.args.get('fail'):
+                    raise OSError('broken %s' % job.args.get('name'))
+                return job.args.get('name')
+            finally:
+                with self.lock:
+                    self.running[resource] -= 1
+        return run
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 24
+    directory = tempfile.mkdtemp()
+    results = []
+    try:
+        # a user install queued behind background refreshes starts as soon as a slot frees
+        recorder = Recorder()
+        scheduler = JobScheduler({'network': 1}, path=os.path.join(directory, 'priority.json'))
+        scheduler.register('fetch', recorder.handler('network', 0.02), 'network')
+        scheduler.submit('fetch', {'name': 'first'}, 'background')
+        for i in range(count // 2):
+            scheduler.submit('fetch', {'name': 'refresh-%d' % i}, 'background')
+        for i in range(count // 2):
+            scheduler.submit('fetch', {'name': 'install-%d' % i}, 'user')
+        settle(scheduler)
+        order = recorder.started[1:]
+        results.append(check('user jobs start ahead of background ones', order[:count // 2] == ['install-%d' % i for i in range(count // 2)], 'first after the running one: %s' % order[0]))
+        scheduler.shutdown()
+
+        # network and disk jobs each stay within their own limit and overlap each other
+        recorder = Recorder()
+        limits = {'network': 3, 'disk': 2}
+        scheduler = JobScheduler(limits, path=os.path.join(directory, 'limits.json'))
+        scheduler.register('download', recorder.handler('network', 0.05), 'network')
+        scheduler.register('verify', recorder.handler('disk', 0.05), 'disk')
+        start = time.perf_counter()
+        for i in range(count):
+            scheduler.submit('download' if i % 2 else 'verify', {'name': str(i)})
+        settle(scheduler)
+        elapsed = time.perf_counter() - start
+        results.append(check('per resource limits are never exceeded', recorder.peak == limits, 'peak %s' % recorder.peak))
+        print('%-52s %.0f ms scheduled, %.0f ms serial' % ('  %d jobs of 50 ms' % count, elapsed * 1000, count * 50))
+        scheduler.shutdown()
+
+        # download -> verify -> install run in order, a failed step cancels the rest of its chain
+        recorder = Recorder()
+        scheduler = JobScheduler(path=os.path.join(directory, 'chain.json'))
+        for kind, resource in (('download', 'network'), ('verify', 'disk'), ('install', 'disk')):
+            scheduler.register(kind, recorder.handler(resource, 0.01), resource)
+        good = scheduler.chain([('download', {'name': 'd1'}), ('verify', {'name': 'v1'}), ('install', {'name': 'i1'})], 'user')
+        bad = scheduler.chain([('download', {'name': 'd2'}), ('verify', {'name': 'v2', 'fail': True}), ('install', {'name': 'i2'})], 'user')
+        settle(scheduler)
+        chained = [name for name in recorder.started if name.endswith('1')]
+        results.append(check('a chain runs each step after the one before', chained == ['d1', 'v1', 'i1'] and all(job.state == 'done' for job in good), ' -> '.join(chained)))
+        results.append(check('a failed step cancels the steps after it', [job.state for job in bad] == ['done', 'failed', 'cancelled'] and 'i2' not in recorder.started, ', '.join(job.state for job in bad)))
+        scheduler.shutdown()
+
+        # cancelling stops a running job at its next report and drops pending ones with their dependents
+        scheduler = JobScheduler({'cpu': 1}, path=os.path.join(directory, 'cancel.json'))
+        stopped = threading.Event()
+
+        def spin(job):
+            try:
+                while True:
+                    time.sleep(0.01)
+                    job.report(0.5)
+            except JobCancelled:
+                stopped.set()
+                raise
+        scheduler.register('spin', spin)
+        running = scheduler.submit('spin')
+        waiting = scheduler.chain([('spin', {}), ('spin', {})])
+        time.sleep(0.05)
+        scheduler.cancel(waiting[0].id)
+        scheduler.cancel(running.id)
+        settle(scheduler)
+        results.append(check('cancel stops running and pending jobs', stopped.is_set() and [job.state for job in [running] + waiting] == ['cancelled'] * 3))
+        scheduler.shutdown()
+
+        # pending work is written to disk and picked up by the next scheduler
+        path = os.path.join(directory, 'jobs.json')
+        scheduler = JobScheduler(path=path)
+        queued = scheduler.chain([('download', {'name': 'later'}), ('install', {'name': 'later'})], 'user')
+        scheduler.submit('refresh', {'catalog': 'apps'}, 'background')
+        scheduler.shutdown()
+        recorder = Recorder()
+        scheduler = JobScheduler(path=path)
+        restored = [job.kind for job in scheduler.restored]
+        for kind in ('download', 'install', 'refresh'):
+            scheduler.register(kind, recorder.handler('cpu', 0.01))
+        settle(scheduler)
+        results.append(check('the queue survives a restart', restored == ['download', 'install', 'refresh'] and scheduler.restored[1].after == [queued[0].id], ', '.join(restored)))
+        results.append(check('restored jobs keep their order and priority', recorder.started == ['later', 'later', None], str(recorder.started)))
+        scheduler.shutdown()
+
+        # a hundred reports per job reach the UI as a handful of batches
+        scheduler = JobScheduler(path=os.path.join(directory, 'batches.json'))
+        reports = [0]
+
+        def chatty(job):
+            for step in range(100):
+                reports[0] += 1
+                job.report(step / 100)
+                time.sleep(0.001)
+        scheduler.register('chatty', chatty)
+        for i in range(count):
+            scheduler.submit('chatty')
+        batches = settle(scheduler)
+        delivered = sum(len(batch) for batch in batches)
+        results.append(check('progress reaches the UI in batches', len(batches) < reports[0] / 10 and not scheduler.jobs, '%d reports as %d batches of %d jobs' % (reports[0], len(batches), delivered)))
+        scheduler.shutdown()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    sys.exit(0 if all(results) else 1)
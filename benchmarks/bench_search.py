@@ -0,0 +1,69 @@
+# per-keystroke latency of the catalog search index at 50k entries
+# run with: python benchmarks/bench_search.py [entries]
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from catalog import CatalogEntry
+from search import SearchIndex
+
+SYLLABLES = ['ka', 'lo', 'mi', 'ne', 'ro', 'sa', 'ti', 'vu', 'qu', 'ter', 'ion', 'plas', 'ma', 'wid', 'get', 'clock', 'note', 'dock', 'kde', 'net']
+QUERIES = ['plasma clock', 'terminal', 'netwrk monitor', 'kalo', 'widget dock', 'qu', 'sativu', 'notes tool']
+# a keystroke has to be answered within a frame at 60 Hz
+BUDGET = 0.016
+
+
+def word(rng):
+    return ''.join(rng.choice(SYLLABLES) for i in range(rng.randint(2, 4)))
+
+
+def catalog(count, seed=1):
+    rng = random.Random(seed)
+    entries = []
+    for i in range(count):
+        name = ' '.join(word(rng) for j in range(rng.randint(1, 3)))
+        summary = ' '.join(word(rng) for j in range(rng.randint(4, 10)))
+        keywords = ' '.join(word(rng) for j in range(rng.randint(0, 4)))
+        entries.append(CatalogEntry('id%d' % i, name.title(), summary, keywords=keywords))
+    return entries
+
+
+def check(name, ok, detail=''):
+    print('%-52s %s  %s' % (name, 'ok' if ok else 'FAILED', detail))
+    return ok
+
+
+def percentile(samples, fraction):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    entries = catalog(count)
+    start = time.perf_counter()
+    index = SearchIndex(entries)
+    print('build %d entries: %.0f ms' % (count, (time.perf_counter() - start) * 1000))
+
+    samples = []
+    for query in QUERIES:
+        # type the query one character at a time like a user would
+        for i in range(1, len(query) + 1):
+            start = time.perf_counter()
+            index.search(query[:i])
+            samples.append(time.perf_counter() - start)
+    print('keystrokes %d  median %.2f ms  p95 %.2f ms  max %.2f ms' % (len(samples), percentile(samples, 0.5) * 1000, percentile(samples, 0.95) * 1000, max(samples) * 1000))
+    results = [
+        check('p95 keystroke within %d ms' % (BUDGET * 1000), percentile(samples, 0.95) < BUDGET, '%.2f ms' % (percentile(samples, 0.95) * 1000)),
+        check('slowest keystroke within %d ms' % (BUDGET * 1000), max(samples) < BUDGET, '%.2f ms' % (max(samples) * 1000)),
+    ]
+
+    start = time.perf_counter()
+    for entry in entries[:1000]:
+        entry.summary += ' updated'
+        index.update(entry)
+    print('incremental update: %.3f ms per entry' % ((time.perf_counter() - start)))
+    sys.exit(0 if all(results) else 1)
@@ -0,0 +1,83 @@
+# build a sidebar with a few hundred navigation entries using per-button stylesheets and the shared application stylesheet
+# run with: QT_QPA_PLATFORM=offscreen python benchmarks/bench_sidebar.py [entries]
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtCore import *
+from PyQt5.QtWidgets import *
+from PyQt5.QtGui import *
+import app
+from styles import styleSheet, setStyleProperty
+
+
+class LegacySideBar(app.SideBar):
+    # navigation buttons as they were styled before the application stylesheet
+    def addNavigation(self, title, function, checked=False, icon=None, colour=None, page=None):
+        button = QPushButton()
+        button.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        button.setObjectName('expand_button')
+        button.setFlat(True)
+        button.setCheckable(True)
+        button.setChecked(checked)
+        button.setFixedHeight(30)
+        textColour = '#000000' if button.palette().color(QPalette.Background).value() > 128 else '#ffffff'
+        if colour:
+            button.setStyleSheet('QPushButton { margin: 0px; border: none; background-color: %s; color: %s; } QPushButton:checked { background-color: %s; }' % (colour, textColour, colour))
+        else:
+            button.setStyleSheet('QPushButton { margin: 0px; border: none; background-color: %s; color: %s; } QPushButton:checked { background-color: %s; }' % (self.palette().color(QPalette.Window).name(), textColour, self.palette().color(QPalette.Highlight).name()))
+        button.setText(title)
+        button.clicked.connect(function)
+        if page is not None:
+            self.navigation[page] = button
+        self.sidebar_layout.addWidget(button)
+        return button
+
+
+def build(root, cls, entries):
+    start = time.perf_counter()
+    sidebar = cls()
+    for i in range(entries):
+        # every tenth entry uses one of a few accent colours
+        colour = ('#FFA000', '#3DAEE9', '#27AE60')[i % 3] if i % 10 == 0 else None
+        sidebar.addNavigation("Entry %d" % i, lambda: None, colour=colour, page=i)
+    sidebar.resize(680, 480)
+    sidebar.show()
+    root.processEvents()
+    built = time.perf_counter() - start
+    # switching the current entry only re-polishes the buttons whose state changed
+    start = time.perf_counter()
+    for i in range(0, entries, max(1, entries // 50)):
+        sidebar.setCurrent(i)
+        root.processEvents()
+    switched = time.perf_counter() - start
+    start = time.perf_counter()
+    for button in sidebar.navigation.values():
+        setStyleProperty(button, 'nav', 'accent' if button.property('nav') == 'plain' else 'plain')
+    root.processEvents()
+    restyled = time.perf_counter() - start
+    sidebar.close()
+    sidebar.deleteLater()
+    root.processEvents()
+    return built, switched, restyled
+
+
+def main(name, entries):
+    root = QApplication(sys.argv[:1])
+    styleSheet().apply()
+    built, switched, restyled = build(root, {"before": LegacySideBar, "after": app.SideBar}[name], entries)
+    print("%-7s %d entries  build %8.2f ms  50 switches %8.2f ms  restyle all %8.2f ms" % (name, entries, built * 1000, switched * 1000, restyled * 1000))
+
+
+if __name__ == "__main__":
+    entries = sys.argv[1] if len(sys.argv) > 1 else '300'
+    if len(sys.argv) > 2:
+        main(sys.argv[2], int(entries))
+    else:
+        # each variant runs in its own process so the style caches of one do not affect the other
+        for name in ("before", "after"):
+            subprocess.run([sys.executable, __file__, entries, name], check=True)
@@ -0,0 +1,79 @@
+# qt_material theme startup cost with and without the generated icon cache, and the files each launch writes
+# run with: QT_QPA_PLATFORM=offscreen python benchmarks/bench_theme.py [theme]
+# also checks that the window's own rules are added to the theme instead of replacing it
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+
+def written(directory, since):
+    count = 0
+    for base, directories, files in os.walk(directory):
+        count += sum(1 for name in files if os.stat(os.path.join(base, name)).st_mtime_ns >= since)
+    return count
+
+
+def run(mode, theme):
+    # one launch: QApplication plus the stylesheet, like main.py --theme
+    from PyQt5.QtWidgets import QApplication
+    root = QApplication(sys.argv[:1])
+    since = time.time_ns()
+    start = time.perf_counter()
+    if mode == 'uncached':
+        import qt_material
+        qt_material.apply_stylesheet(root, theme=theme)
+    else:
+        import themecache
+        themecache.applyStylesheet(root, theme)
+    elapsed = time.perf_counter() - start
+    print('%.2f %d' % (elapsed * 1000, written(os.path.expanduser('~'), since)))
+
+
+def window(theme):
+    # main.py --theme order: the theme first, then the window and its generated rules
+    from PyQt5.QtWidgets import QApplication
+    root = QApplication(sys.argv[:1])
+    import themecache
+    themecache.applyStylesheet(root, theme)
+    themed = root.styleSheet()
+    import app
+    win = app.Window()
+    combined = root.styleSheet()
+    ok = bool(themed) and combined.startswith(themed) and 'expand_button' in combined
+    print('%d %d %d' % (ok, len(themed), len(combined)))
+    win.close()
+
+
+def launch(mode, theme, home):
+    # qt_material writes below the home directory, a scratch one keeps the real cache untouched
+    env = dict(os.environ, HOME=home)
+    output = subprocess.run([sys.executable, __file__, '--run', mode, theme], env=env, check=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, universal_newlines=True).stdout.split()
+    return float(output[0]), int(output[1])
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 3 and sys.argv[1] == '--run':
+        if sys.argv[2] == 'window':
+            window(sys.argv[3])
+        else:
+            run(sys.argv[2], sys.argv[3])
+        sys.exit()
+    theme = sys.argv[1] if len(sys.argv) > 1 else 'light_blue.xml'
+    home = tempfile.mkdtemp()
+    results = [('uncached, every launch', launch('uncached', theme, home))]
+    results.append(('cached, first launch', launch('cached', theme, home)))
+    warm = [launch('cached', theme, home) for run in range(5)]
+    results.append(('cached, later launches', sorted(warm)[len(warm) // 2]))
+    uncached = [launch('uncached', theme, home) for run in range(5)]
+    results[0] = ('uncached, every launch', sorted(uncached)[len(uncached) // 2])
+    for label, (elapsed, files) in results:
+        print('%-24s %8.1f ms  %4d files written' % (label, elapsed, files))
+    env = dict(os.environ, HOME=home, XDG_CACHE_HOME=os.path.join(home, '.cache'), XDG_CONFIG_HOME=os.path.join(home, '.config'))
+    ok, themed, combined = subprocess.run([sys.executable, __file__, '--run', 'window', theme], env=env, check=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, universal_newlines=True).stdout.split()[-3:]
+    print('%-24s %s  theme %s chars, with the window rules %s chars' % ('theme, then window', 'ok' if ok == '1' else 'FAILED', themed, combined))
+    sys.exit(0 if ok == '1' else 1)
@@ -0,0 +1,77 @@
+# stall watchdog: blocking slots are caught with the right stack and duration, and what the heartbeat costs the event loop
+# run with: QT_QPA_PLATFORM=offscreen python benchmarks/bench_watchdog.py
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtCore import *
+from PyQt5.QtWidgets import *
+from stallwatch import Watchdog
+
+
+def sleepingSlot():
+    # blocked on io, like a synchronous request on the GUI thread
+    time.sleep(0.4)
+
+
+def busySlot():
+    # blocked in python code
+    end = time.monotonic() + 0.3
+    while time.monotonic() < end:
+        sum(range(1000))
+
+
+def shortSlot():
+    time.sleep(0.02)
+
+
+def run(root, seconds):
+    QTimer.singleShot(int(seconds * 1000), root.quit)
+    root.exec_()
+
+
+def throughput(root, seconds=1.0):
+    # zero timeouts the event loop gets through, the heartbeat and the monitor thread take some of them
+    ticks = [0]
+    timer = QTimer()
+    timer.setInterval(0)
+    timer.timeout.connect(lambda: ticks.__setitem__(0, ticks[0] + 1))
+    timer.start()
+    run(root, seconds)
+    timer.stop()
+    return ticks[0] / seconds
+
+
+if __name__ == '__main__':
+    root = QApplication(sys.argv[:1])
+    directory = tempfile.mkdtemp()
+    try:
+        watchdog = Watchdog(threshold=0.1, path=os.path.join(directory, 'watchdog.log'))
+        watchdog.start()
+        for delay, slot in ((200, sleepingSlot), (900, busySlot), (1500, shortSlot), (1800, sleepingSlot)):
+            QTimer.singleShot(delay, slot)
+        run(root, 2.8)
+        watchdog.stop()
+        found = dict((stall.frames[-1].name if stall.frames[-1].name != 'sleep' else stall.frames[-2].name, stall) for stall in watchdog.stalls.values())
+        for name in sorted(found):
+            print('%-14s %d stalls  %6.0f ms in total  %6.0f ms at most' % (name, found[name].count, found[name].total * 1000, found[name].longest * 1000))
+        expected = {'sleepingSlot': 2, 'busySlot': 1}
+        caught = all(name in found and found[name].count == count for name, count in expected.items()) and 'shortSlot' not in found
+        print('blocking slots caught: %s, log %d bytes' % ('yes' if caught else 'NO', os.path.getsize(os.path.join(directory, 'watchdog.log'))))
+        print()
+        print(watchdog.summary(limit=1))
+        print()
+        before = throughput(root)
+        watchdog = Watchdog(path=os.path.join(directory, 'overhead.log'))
+        watchdog.start()
+        after = throughput(root)
+        watchdog.stop()
+        print('event loop: %d iterations/s without the watchdog, %d with it (%.1f%%)' % (before, after, (after - before) * 100.0 / before))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    sys.exit(0 if caught else 1)
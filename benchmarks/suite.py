@@ -0,0 +1,178 @@
+# headless suite over the window operations: Window() construction, every Page(id) build and switch,
+# SideBar.addNavigation at scale and icon lookups. Results are saved per commit and compared with the previous run.
+# run with: QT_QPA_PLATFORM=offscreen python benchmarks/suite.py [--rounds N] [--results DIR] [--threshold PERCENT]
+import argparse
+import glob
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+# the window reads and writes its caches and catalogs, a scratch home keeps the real ones untouched
+SCRATCH = tempfile.mkdtemp()
+os.environ['XDG_CACHE_HOME'] = os.path.join(SCRATCH, 'cache')
+os.environ['XDG_CONFIG_HOME'] = os.path.join(SCRATCH, 'config')
+
+from PyQt5.QtCore import *
+from PyQt5.QtWidgets import *
+from PyQt5.QtGui import *
+import app
+import iconindex
+from icons import iconProvider
+
+NAVIGATION_ENTRIES = 300
+ICON_NAMES = ['folder-add', 'update-none', 'update-medium', 'dialog-cancel', 'edit-copy', 'go-home', 'document-save', 'view-refresh']
+
+
+def settle(root):
+    root.processEvents()
+    root.sendPostedEvents(None, QEvent.DeferredDelete)
+
+
+def timed(function):
+    start = time.perf_counter()
+    function()
+    return (time.perf_counter() - start) * 1000
+
+
+def summary(samples):
+    samples = sorted(samples)
+    return {'median': round(statistics.median(samples), 3), 'min': round(samples[0], 3), 'max': round(samples[-1], 3)}
+
+
+def closeWindow(root, win):
+    win.close()
+    settle(root)
+
+
+def windowConstruction(root, rounds):
+    samples = []
+    for i in range(rounds):
+        holder = []
+        samples.append(timed(lambda: holder.append(app.Window())))
+        closeWindow(root, holder[0])
+    return summary(samples)
+
+
+def pages(root, rounds):
+    # first visit builds the page, later visits only switch the stack
+    results = {}
+    builds = dict((id, []) for id in ('main', 'apps', 'plasmoid', 'settings', 'updates'))
+    switches = dict((id, []) for id in builds)
+    for i in range(rounds):
+        win = app.Window()
+        win.show()
+        settle(root)
+        for id in builds:
+            win.dropPage(id)
+        settle(root)
+        for id in builds:
+            builds[id].append(timed(lambda: (win.Page(id), settle(root))))
+        for repeat in range(5):
+            for id in switches:
+                switches[id].append(timed(lambda: (win.Page(id), settle(root))))
+        closeWindow(root, win)
+    for id in builds:
+        results[id] = {'build': summary(builds[id]), 'switch': summary(switches[id])}
+    return results
+
+
+def navigation(root, rounds):
+    samples = []
+    for i in range(rounds):
+        sidebar = app.SideBar()
+        def add():
+            for entry in range(NAVIGATION_ENTRIES):
+                sidebar.addNavigation('Entry %d' % entry, lambda: None, colour='#FFA000' if entry % 10 == 0 else None, page=entry)
+            sidebar.show()
+            settle(root)
+        samples.append(timed(add))
+        sidebar.close()
+        sidebar.deleteLater()
+        settle(root)
+    return {'entries': NAVIGATION_ENTRIES, 'ms': summary(samples)}
+
+
+def iconLookups(root, rounds):
+    provider = iconProvider()
+    index = iconindex.iconIndex()
+    cold = []
+    warm = []
+    resolve = []
+    for i in range(rounds):
+        provider.invalidate()
+        cold.append(timed(lambda: [provider.icon(name) for name in ICON_NAMES]))
+        warm.append(timed(lambda: [provider.pixmap(name, 22, 2.0) for name in ICON_NAMES for repeat in range(10)]))
+        resolve.append(timed(lambda: [index.resolve(name, 22, 2.0) for name in ICON_NAMES for repeat in range(100)]))
+    return {'icons': len(ICON_NAMES), 'build': summary(cold), 'pixmap x10': summary(warm), 'resolve x100': summary(resolve)}
+
+
+def flatten(results, prefix=''):
+    # {'pages.apps.build.median': 3.1, ...}, the medians are what runs are compared by
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, prefix + key + '.'))
+        elif key == 'median':
+            flat[prefix.rstrip('.')] = value
+    return flat
+
+
+def commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, universal_newlines=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def compare(previous, current, threshold):
+    # one line per measurement, slower than threshold percent is marked
+    before = flatten(previous['results'])
+    after = flatten(current['results'])
+    slower = 0
+    print('%-40s %10s %10s %8s' % ('vs %s' % previous['commit'], 'before', 'after', 'change'))
+    for key in sorted(after):
+        if key not in before or not before[key]:
+            continue
+        change = (after[key] - before[key]) * 100.0 / before[key]
+        mark = '  slower' if change > threshold else ''
+        slower += bool(mark)
+        print('%-40s %8.2fms %8.2fms %+7.1f%%%s' % (key, before[key], after[key], change, mark))
+    return slower
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--results', default=os.path.join(ROOT, 'benchmarks', 'results'))
+    parser.add_argument('--threshold', type=float, default=15.0, help='percent slower that is reported')
+    args = parser.parse_args()
+    root = QApplication(sys.argv[:1])
+    # the first window pays for imports, styles and the icon index, the suite measures later ones
+    closeWindow(root, app.Window())
+    results = {
+        'window': windowConstruction(root, args.rounds),
+        'pages': pages(root, args.rounds),
+        'navigation': navigation(root, args.rounds),
+        'icons': iconLookups(root, args.rounds),
+    }
+    current = {'commit': commit(), 'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'rounds': args.rounds, 'platform': QGuiApplication.platformName(), 'results': results}
+    os.makedirs(args.results, exist_ok=True)
+    runs = sorted(glob.glob(os.path.join(args.results, '*.json')), key=os.path.getmtime)
+    path = os.path.join(args.results, '%s-%s.json' % (time.strftime('%Y%m%d-%H%M%S'), current['commit']))
+    with open(path, 'w') as file:
+        json.dump(current, file, indent=2, sort_keys=True)
+    for key, value in sorted(flatten(results).items()):
+        print('%-40s %8.2f ms' % (key, value))
+    print('saved %s' % os.path.relpath(path))
+    if runs:
+        with open(runs[-1]) as file:
+            previous = json.load(file)
+        print()
+        compare(previous, current, args.threshold)
@@ -0,0 +1,98 @@
+# build the icon resources the app actually uses into a compressed binary resources.rcc
+# usage: python build_resources.py [--python] [--rcc PATH]
+import argparse
+import glob
+import os
+import re
+import shutil
+import subprocess
+import sys
+
+from iconindex import followLink
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+ICONS = os.path.join('assets', 'icons')
+# preferred icon size and the order other sizes are tried in
+SIZES = ['22', '16', '24', '32', '48', '64', '96', 'symbolic']
+
+PATTERNS = [
+    re.compile(r'useIcon\(\s*[\'"]([\w.+-]+)[\'"]'),
+    re.compile(r'\bicon\s*=\s*[\'"]([\w.+-]+)[\'"]'),
+    re.compile(r'iconProvider\(\)\.(?:icon|pixmap)\(\s*[\'"]([\w.+-]+)[\'"]'),
+]
+
+
+def findIconNames(root=ROOT):
+    # every icon name referenced from the app sources
+    names = set()
+    for path in glob.glob(os.path.join(root, '*.py')):
+        with open(path, encoding='utf-8') as file:
+            source = file.read()
+        for pattern in PATTERNS:
+            names.update(pattern.findall(source))
+    return sorted(names)
+
+
+def resolveIcon(name, theme=ICONS, root=ROOT):
+    # relative path of the best size of name inside theme, or None
+    for size in SIZES:
+        for category in sorted(os.listdir(os.path.join(root, theme))):
+            path = os.path.join(theme, category, size, name + '.svg')
+            if os.path.isfile(os.path.join(root, path)):
+                return followLink(path, root)
+    return None
+
+
+def generateQrc(names, root=ROOT):
+    # dark variants are recoloured at runtime, so only the light icon is bundled
+    entries = []
+    missing = []
+    for name in names:
+        path = resolveIcon(name, root=root)
+        if path is None:
+            missing.append(name)
+            continue
+        entries.append((name + '.svg', path))
+    lines = ['<!DOCTYPE RCC>', '<RCC version="1.0">', '    <qresource prefix="icons">']
+    for alias, path in entries:
+        lines.append('        <file alias="%s" compress="9" threshold="0">%s</file>' % (alias, path.replace(os.sep, '/')))
+    lines += ['    </qresource>', '</RCC>', '']
+    return '\n'.join(lines), missing
+
+
+def findRcc():
+    # Qt's rcc can write binary resources, pyrcc5 can not
+    for name in ('rcc', 'rcc-qt5', 'pyside6-rcc', 'pyside2-rcc'):
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build resources.qrc and resources.rcc from the icons referenced in the app.')
+    parser.add_argument('--rcc', default=findRcc(), help='path to the Qt rcc tool')
+    parser.add_argument('--python', action='store_true', help='also regenerate the resources.py fallback with pyrcc5')
+    args = parser.parse_args()
+
+    names = findIconNames()
+    qrc, missing = generateQrc(names)
+    for name in missing:
+        print('warning: icon %s not found in %s' % (name, ICONS), file=sys.stderr)
+    with open(os.path.join(ROOT, 'resources.qrc'), 'w') as file:
+        file.write(qrc)
+    print('resources.qrc: %d icons' % (len(names) - len(missing)))
+
+    if args.rcc is None:
+        print('error: rcc not found, pass --rcc', file=sys.stderr)
+        return 1
+    subprocess.run([args.rcc, '--binary', '--compress-algo', 'zlib', '--compress', '9', '--threshold', '0', 'resources.qrc', '-o', 'resources.rcc'], cwd=ROOT, check=True)
+    print('resources.rcc: %d bytes' % os.path.getsize(os.path.join(ROOT, 'resources.rcc')))
+    if args.python:
+        subprocess.run(['pyrcc5', '-compress', '9', '-threshold', '0', 'resources.qrc', '-o', 'resources.py'], cwd=ROOT, check=True)
+        print('resources.py: %d bytes' % os.path.getsize(os.path.join(ROOT, 'resources.py')))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
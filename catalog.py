@@ -0,0 +1,16 @@
+class CatalogEntry(object):
+    """One app or plasmoid in the catalog, only the fields the list shows are always loaded."""
+    __slots__ = ('id', 'name', 'summary', 'icon', 'version', 'keywords', 'kind')
+
+    def __init__(self, id, name, summary='', icon=None, version='', keywords='', kind='app'):
+        self.id = id
+        self.name = name
+        self.summary = summary
+        # theme icon name, local image path or remote url
+        self.icon = icon
+        self.version = version
+        self.keywords = keywords
+        self.kind = kind
+
+    def toDict(self):
+        return dict((name, getattr(self, name)) for name in self.__slots__)
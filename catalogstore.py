@@ -0,0 +1,129 @@
+import json
+import os
+import sqlite3
+import threading
+import zlib
+
+import network
+from catalog import CatalogEntry
+from paths import cacheDir, configDir
+
+# columns the list view needs, the other fields of an entry live in a separate table read when a row is opened
+LIST_COLUMNS = ('id', 'name', 'summary', 'icon', 'version', 'keywords', 'kind')
+
+SCHEMA = '''
+create table if not exists entries (
+    catalog text not null,
+    id text not null,
+    name text not null,
+    summary text not null default '',
+    icon text,
+    version text not null default '',
+    keywords text not null default '',
+    kind text not null default 'app',
+    primary key (catalog, id)
+) without rowid;
+create table if not exists details (
+    catalog text not null,
+    id text not null,
+    data blob not null,
+    primary key (catalog, id)
+) without rowid;
+create table if not exists revisions (
+    catalog text primary key,
+    revision integer not null
+);
+'''
+
+
+class CatalogClosed(Exception):
+    """The store was closed, threads still reading it as the window closes stop on this."""
+
+
+class CatalogStore(object):
+    """Local SQLite copy of the catalogs, kept current with delta updates from the server."""
+    def __init__(self, path=None):
+        self.path = path or os.path.join(cacheDir(), 'catalog.sqlite')
+        self.lock = threading.Lock()
+        # one connection shared by the GUI thread and the sync thread, guarded by lock
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute('pragma journal_mode=wal')
+        self.connection.execute('pragma synchronous=normal')
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+    def connected(self):
+        # the open connection, called with lock held
+        if self.connection is None:
+            raise CatalogClosed('The catalog store is closed')
+        return self.connection
+
+    def revision(self, catalog):
+        # revision of the last applied update, 0 when the catalog was never synced
+        with self.lock:
+            row = self.connected().execute('select revision from revisions where catalog = ?', (catalog,)).fetchone()
+        return row[0] if row else 0
+
+    def load(self, catalog):
+        # list columns of every entry, detail fields are left on disk
+        with self.lock:
+            rows = self.connected().execute('select %s from entries where catalog = ? order by name' % ', '.join(LIST_COLUMNS), (catalog,)).fetchall()
+        return [CatalogEntry(*row) for row in rows]
+
+    def details(self, catalog, id):
+        # every field of one entry, read when its row is opened
+        with self.lock:
+            row = self.connected().execute('select %s from entries where catalog = ? and id = ?' % ', '.join(LIST_COLUMNS), (catalog, id)).fetchone()
+            data = self.connection.execute('select data from details where catalog = ? and id = ?', (catalog, id)).fetchone()
+        if row is None:
+            return None
+        details = json.loads(zlib.decompress(data[0]).decode('utf-8')) if data else {}
+        details.update(zip(LIST_COLUMNS, row))
+        return details
+
+    def apply(self, catalog, delta):
+        # apply {"revision": n, "full": bool, "entries": [...], "removed": [ids]} in one transaction
+        # returns the number of entries written and removed
+        rows = []
+        details = []
+        for item in delta.get('entries', ()):
+            item = dict(item)
+            values = [item.pop(column, None) for column in LIST_COLUMNS]
+            rows.append((catalog, values[0], values[1], values[2] or '', values[3], values[4] or '', values[5] or '', values[6] or 'app'))
+            details.append((catalog, values[0], zlib.compress(json.dumps(item).encode('utf-8'))))
+        removed = [(catalog, id) for id in delta.get('removed', ())]
+        with self.lock, self.connected():
+            if delta.get('full'):
+                self.connection.execute('delete from entries where catalog = ?', (catalog,))
+                self.connection.execute('delete from details where catalog = ?', (catalog,))
+            self.connection.executemany('insert or replace into entries (catalog, %s) values (?, ?, ?, ?, ?, ?, ?, ?)' % ', '.join(LIST_COLUMNS), rows)
+            self.connection.executemany('insert or replace into details (catalog, id, data) values (?, ?, ?)', details)
+            self.connection.executemany('delete from entries where catalog = ? and id = ?', removed)
+            self.connection.executemany('delete from details where catalog = ? and id = ?', removed)
+            self.connection.execute('insert or replace into revisions (catalog, revision) values (?, ?)', (catalog, int(delta.get('revision', 0))))
+        return len(rows), len(removed)
+
+    def sync(self, catalog, url, session=None, timeout=30):
+        # ask the server for the changes since the stored revision, it answers with everything when it has to
+        since = self.revision(catalog)
+        response = (session or network.session()).get(url, params={'since': since}, timeout=timeout)
+        response.raise_for_status()
+        delta = response.json()
+        if not delta.get('full') and int(delta.get('revision', since)) == since:
+            return 0, 0
+        return self.apply(catalog, delta)
+
+
+def loadCatalogSources(path=None):
+    # catalogs.json maps a catalog id such as "apps" to the url of its delta feed
+    path = path or os.path.join(configDir(), 'catalogs.json')
+    try:
+        with open(path) as file:
+            return dict(json.load(file))
+    except (OSError, ValueError):
+        return {}
@@ -0,0 +1,241 @@
+import time
+
+from PyQt5.QtCore import *
+from PyQt5.QtWidgets import *
+from PyQt5.QtGui import *
+
+from icons import iconProvider
+
+ICON_SIZE = 32
+ROW_HEIGHT = 48
+# seconds before an image that failed to load is requested again
+FAILED_RETRY = 60
+
+EntryRole = Qt.UserRole + 1
+SummaryRole = Qt.UserRole + 2
+
+
+class ImageLoader(QObject):
+    """Decodes and scales images on the global thread pool, remote ones are fetched through the media cache first."""
+    loaded = pyqtSignal(str, QImage)
+
+    def load(self, key, path, size):
+        if path.startswith(('http://', 'https://')):
+            # the download finishes on a media worker, decoding still happens on the thread pool
+            from mediacache import mediaCache
+            mediaCache().get(path).add_done_callback(lambda done: self.fetched(key, done, size))
+            return
+        QThreadPool.globalInstance().start(_LoadImage(self, key, path, size))
+
+    def fetched(self, key, done, size):
+        # a fetch is cancelled when the media cache shuts down
+        if done.cancelled() or done.exception() is not None:
+            self.loaded.emit(key, QImage())
+            return
+        QThreadPool.globalInstance().start(_LoadImage(self, key, done.result(), size))
+
+
+class _LoadImage(QRunnable):
+    def __init__(self, loader, key, path, size):
+        super(_LoadImage, self).__init__()
+        self.loader = loader
+        self.key = key
+        self.path = path
+        self.size = size
+
+    def run(self):
+        # QImage can be used off the GUI thread, QPixmap can not
+        image = QImage(self.path)
+        if not image.isNull():
+            image = image.scaled(self.size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        self.loader.loaded.emit(self.key, image)
+
+
+class CatalogModel(QAbstractListModel):
+    """List model over catalog entries, icons are loaded when a row is first painted."""
+    # rows whose icon finished loading or whose entry changed, dataChanged would make QListView lay out every row again
+    iconsLoaded = pyqtSignal(list)
+    rowsChanged = pyqtSignal(list)
+
+    def __init__(self, entries=None, parent=None):
+        super(CatalogModel, self).__init__(parent)
+        self.entries = list(entries or [])
+        self.loader = ImageLoader(self)
+        self.loader.loaded.connect(self.imageLoaded)
+        iconProvider().changed.connect(self.themeIconsChanged)
+        # rows waiting for an icon by pixmap cache key
+        self.waiting = {}
+        # time after which a failed icon is requested again by pixmap cache key
+        self.failed = {}
+        self.devicePixelRatio = qApp.devicePixelRatio() if qApp else 1.0
+        self.placeholder = None
+
+    def setEntries(self, entries):
+        self.beginResetModel()
+        self.entries = list(entries)
+        self.waiting.clear()
+        self.endResetModel()
+
+    def updateEntries(self, entries):
+        # replace entries with the same id in place and append the new ones as a single insertion
+        rows = dict((entry.id, row) for row, entry in enumerate(self.entries))
+        changed = []
+        added = []
+        for entry in entries:
+            row = rows.get(entry.id)
+            if row is None:
+                rows[entry.id] = len(self.entries) + len(added)
+                added.append(entry)
+            elif row < len(self.entries):
+                self.entries[row] = entry
+                changed.append(row)
+            else:
+                added[row - len(self.entries)] = entry
+        if added:
+            self.beginInsertRows(QModelIndex(), len(self.entries), len(self.entries) + len(added) - 1)
+            self.entries.extend(added)
+            self.endInsertRows()
+        if changed:
+            self.rowsChanged.emit(changed)
+
+    def removeEntries(self, ids):
+        ids = set(ids)
+        rows = [row for row, entry in enumerate(self.entries) if entry.id in ids]
+        if not rows:
+            return
+        # one reset is cheaper than many single row removals
+        self.beginResetModel()
+        self.entries = [entry for entry in self.entries if entry.id not in ids]
+        self.waiting.clear()
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.entries)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        entry = self.entries[index.row()]
+        if role == Qt.DisplayRole:
+            return entry.name
+        if role == SummaryRole:
+            return entry.summary
+        if role == EntryRole:
+            return entry
+        if role == Qt.DecorationRole:
+            return self.icon(index.row(), entry)
+        if role == Qt.ToolTipRole:
+            return entry.summary or entry.name
+        return None
+
+    def icon(self, row, entry):
+        if not entry.icon:
+            return self.placeholderPixmap()
+        if '/' not in entry.icon:
+            # theme icon names come from the shared icon provider
+            return iconProvider().pixmap(entry.icon, ICON_SIZE, self.devicePixelRatio)
+        key = 'catalog:%s' % entry.icon
+        pixmap = QPixmapCache.find(key)
+        if pixmap is not None and not pixmap.isNull():
+            return pixmap
+        if key in self.failed:
+            # every repaint would request a missing or broken image again
+            if self.failed[key] > time.monotonic():
+                return self.placeholderPixmap()
+            del self.failed[key]
+        rows = self.waiting.get(key)
+        if rows is None:
+            self.waiting[key] = rows = set()
+            size = int(ICON_SIZE * self.devicePixelRatio)
+            self.loader.load(key, entry.icon, QSize(size, size))
+        rows.add(row)
+        return self.placeholderPixmap()
+
+    def placeholderPixmap(self):
+        if self.placeholder is None:
+            self.placeholder = QPixmap(ICON_SIZE, ICON_SIZE)
+            self.placeholder.fill(Qt.transparent)
+        return self.placeholder
+
+    def imageLoaded(self, key, image):
+        rows = self.waiting.pop(key, None)
+        if image.isNull():
+            self.failed[key] = time.monotonic() + FAILED_RETRY
+            return
+        if rows is None:
+            return
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(self.devicePixelRatio)
+        # the pixmap cache evicts icons of rows that have not been painted for a while
+        QPixmapCache.insert(key, pixmap)
+        self.iconsLoaded.emit([row for row in rows if row < len(self.entries)])
+
+
+    def themeIconsChanged(self):
+        self.iconsLoaded.emit([row for row, entry in enumerate(self.entries) if entry.icon and '/' not in entry.icon])
+
+
+class CatalogDelegate(QStyledItemDelegate):
+    """Paints icon, name and summary of a row without any per-row widgets."""
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), ROW_HEIGHT)
+
+    def paint(self, painter, option, index):
+        painter.save()
+        style = option.widget.style() if option.widget else QApplication.style()
+        # selection and hover background
+        background = QStyleOptionViewItem(option)
+        self.initStyleOption(background, index)
+        background.text = ''
+        background.icon = QIcon()
+        style.drawControl(QStyle.CE_ItemViewItem, background, painter, option.widget)
+        rect = option.rect
+        margin = (ROW_HEIGHT - ICON_SIZE) // 2
+        pixmap = index.data(Qt.DecorationRole)
+        if pixmap is not None:
+            painter.drawPixmap(QRect(rect.left() + margin, rect.top() + margin, ICON_SIZE, ICON_SIZE), pixmap)
+        text = rect.adjusted(ICON_SIZE + 2 * margin, margin // 2, -margin, -margin // 2)
+        selected = option.state & QStyle.State_Selected
+        painter.setPen(option.palette.color(QPalette.HighlightedText if selected else QPalette.Text))
+        font = QFont(option.font)
+        font.setBold(True)
+        painter.setFont(font)
+        painter.drawText(QRect(text.left(), text.top(), text.width(), text.height() // 2), Qt.AlignLeft | Qt.AlignVCenter, option.fontMetrics.elidedText(index.data(Qt.DisplayRole), Qt.ElideRight, text.width()))
+        painter.setFont(option.font)
+        painter.drawText(QRect(text.left(), text.top() + text.height() // 2, text.width(), text.height() // 2), Qt.AlignLeft | Qt.AlignVCenter, option.fontMetrics.elidedText(index.data(SummaryRole) or '', Qt.ElideRight, text.width()))
+        painter.restore()
+
+
+class CatalogView(QListView):
+    """Virtualized list, only rows inside the viewport are laid out and painted."""
+    def __init__(self, model=None, parent=None):
+        super(CatalogView, self).__init__(parent)
+        self.setObjectName('catalog')
+        self.setUniformItemSizes(True)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setFrameShape(QFrame.NoFrame)
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.setItemDelegate(CatalogDelegate(self))
+        self.verticalScrollBar().setSingleStep(ROW_HEIGHT)
+        if model is not None:
+            self.setModel(model)
+
+    def setModel(self, model):
+        if isinstance(self.model(), CatalogModel):
+            self.model().iconsLoaded.disconnect(self.iconsLoaded)
+            self.model().rowsChanged.disconnect(self.iconsLoaded)
+        super(CatalogView, self).setModel(model)
+        if isinstance(model, CatalogModel):
+            model.iconsLoaded.connect(self.iconsLoaded)
+            model.rowsChanged.connect(self.iconsLoaded)
+
+    def iconsLoaded(self, rows):
+        # repaint only the given rows that are still inside the viewport
+        viewport = self.viewport().rect()
+        for row in rows:
+            rect = self.visualRect(self.model().index(row, 0))
+            if rect.intersects(viewport):
+                self.viewport().update(rect)
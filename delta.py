@@ -0,0 +1,260 @@
+import hashlib
+import mmap
+import os
+import re
+import struct
+import zlib
+from concurrent import futures
+
+from downloads import BUFFER_SIZE
+from scheduler import JobCancelled
+
+# magic, version, source size, source sha256, target size, target sha256
+HEADER = struct.Struct('<4sHQ32sQ32s')
+MAGIC = b'QDLT'
+VERSION = 1
+# op kind and two lengths: copy has source offset and length, data has its length and compressed length
+OP = struct.Struct('<BQQ')
+END, COPY, DATA = 0, 1, 2
+# chunks end after a byte pair like this one, every 1.6 KB on average in the bundle's libraries,
+# so bytes inserted or removed only change the chunks around them instead of shifting every block after them
+BOUNDARY = re.compile(rb'[\x40-\x4f][\x00-\x03]')
+MIN_CHUNK = 1024
+MAX_CHUNK = 16 * 1024
+# literal bytes collected before they are compressed as one data op
+LITERAL_LIMIT = 1024 * 1024
+
+
+class DeltaError(Exception):
+    pass
+
+
+def chunks(data):
+    # (offset, length) of the content defined chunks of a buffer
+    start = 0
+    size = len(data)
+    for match in BOUNDARY.finditer(data):
+        end = match.end()
+        if end - start < MIN_CHUNK:
+            continue
+        while end - start > MAX_CHUNK:
+            yield start, MAX_CHUNK
+            start += MAX_CHUNK
+        yield start, end - start
+        start = end
+    while start < size:
+        yield start, min(MAX_CHUNK, size - start)
+        start += MAX_CHUNK
+
+
+def digest(data):
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def mapFile(file):
+    # empty files can not be mapped
+    if os.fstat(file.fileno()).st_size == 0:
+        return b''
+    return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def makeDelta(source, target, output, level=6):
+    # writes the patch turning source into target to output, returns (patch size, copied bytes, literal bytes)
+    with open(source, 'rb') as sourceFile, open(target, 'rb') as targetFile:
+        old = mapFile(sourceFile)
+        new = mapFile(targetFile)
+        try:
+            known = {}
+            for offset, length in chunks(old):
+                known.setdefault(digest(old[offset:offset + length]), offset)
+            copied = literal = 0
+            with open(output + '.part', 'wb') as patch:
+                patch.write(HEADER.pack(MAGIC, VERSION, len(old), hashlib.sha256(old).digest(), len(new), hashlib.sha256(new).digest()))
+                # the copy or literal run being extended, flushed when the next chunk does not continue it
+                run = None
+                for offset, length in chunks(new):
+                    data = new[offset:offset + length]
+                    found = known.get(digest(data))
+                    if found is not None and old[found:found + length] != data:
+                        found = None
+                    if found is not None:
+                        copied += length
+                        if run is not None and run[0] == COPY and run[1] + run[2] == found:
+                            run[2] += length
+                            continue
+                        writeRun(patch, run, new, level)
+                        run = [COPY, found, length]
+                    else:
+                        literal += length
+                        if run is not None and run[0] == DATA and run[2] + length <= LITERAL_LIMIT:
+                            run[2] += length
+                            continue
+                        writeRun(patch, run, new, level)
+                        run = [DATA, offset, length]
+                writeRun(patch, run, new, level)
+                patch.write(OP.pack(END, 0, 0))
+            os.replace(output + '.part', output)
+        finally:
+            for buffer in (old, new):
+                if isinstance(buffer, mmap.mmap):
+                    buffer.close()
+    return os.path.getsize(output), copied, literal
+
+
+def writeRun(patch, run, new, level):
+    if run is None:
+        return
+    kind, offset, length = run
+    if kind == COPY:
+        patch.write(OP.pack(COPY, offset, length))
+        return
+    packed = zlib.compress(new[offset:offset + length], level)
+    patch.write(OP.pack(DATA, length, len(packed)))
+    patch.write(packed)
+
+
+def readExactly(stream, size):
+    data = b''
+    while len(data) < size:
+        more = stream.read(size - len(data))
+        if not more:
+            raise DeltaError('Patch ends early')
+        data += more
+    return data
+
+
+def fileHash(path):
+    # sha256 digest of a file read in buffers
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for data in iter(lambda: file.read(BUFFER_SIZE), b''):
+            hasher.update(data)
+    return hasher.digest()
+
+
+def applyDelta(source, stream, path, sha256=None, progress=None):
+    # rebuilds the target at path from source and a patch read from stream in pieces, memory stays at a few buffers
+    # the result is checked against the target hash of the patch and sha256 when given, path is only replaced when it matches
+    magic, version, sourceSize, sourceHash, targetSize, targetHash = HEADER.unpack(readExactly(stream, HEADER.size))
+    if magic != MAGIC or version != VERSION:
+        raise DeltaError('Not a delta patch')
+    if sha256 and bytes.fromhex(sha256) != targetHash:
+        raise DeltaError('Patch builds a different file than expected')
+    if os.path.getsize(source) != sourceSize or fileHash(source) != sourceHash:
+        # a file of the same size can still be another build, it is hashed once before anything is written
+        raise DeltaError('Patch was made for another version of %s' % source)
+    part = path + '.part'
+    hasher = hashlib.sha256()
+    written = 0
+    try:
+        with open(source, 'rb') as old, open(part, 'wb') as new:
+            while True:
+                kind, first, second = OP.unpack(readExactly(stream, OP.size))
+                if kind == END:
+                    break
+                if kind == COPY:
+                    if first + second > sourceSize:
+                        raise DeltaError('Patch copies past the end of %s' % source)
+                    old.seek(first)
+                    remaining = second
+                    while remaining:
+                        data = old.read(min(BUFFER_SIZE, remaining))
+                        if not data:
+                            raise DeltaError('%s changed while patching' % source)
+                        new.write(data)
+                        hasher.update(data)
+                        remaining -= len(data)
+                elif kind == DATA:
+                    inflater = zlib.decompressobj()
+                    remaining = second
+                    produced = 0
+                    while remaining or inflater.unconsumed_tail:
+                        if inflater.unconsumed_tail:
+                            pending = inflater.unconsumed_tail
+                        else:
+                            pending = readExactly(stream, min(BUFFER_SIZE, remaining))
+                            remaining -= len(pending)
+                        data = inflater.decompress(pending, BUFFER_SIZE)
+                        new.write(data)
+                        hasher.update(data)
+                        produced += len(data)
+                    data = inflater.flush()
+                    new.write(data)
+                    hasher.update(data)
+                    produced += len(data)
+                    if produced != first or not inflater.eof:
+                        raise DeltaError('Corrupt data in patch')
+                else:
+                    raise DeltaError('Unknown patch operation %d' % kind)
+                written = new.tell()
+                if written > targetSize:
+                    raise DeltaError('Patch builds a file larger than its target')
+                if progress is not None:
+                    progress(written / targetSize if targetSize else 1.0)
+        if written != targetSize or hasher.digest() != targetHash:
+            raise DeltaError('Patched file does not match the target hash')
+    except BaseException:
+        if os.path.exists(part):
+            os.remove(part)
+        raise
+    os.replace(part, path)
+    return path
+
+
+class CountingReader(object):
+    """File-like reader that counts the bytes taken from a stream."""
+    def __init__(self, stream):
+        self.stream = stream
+        self.count = 0
+
+    def read(self, size=-1):
+        data = self.stream.read(size)
+        self.count += len(data)
+        return data
+
+
+def deltaFor(package, installed):
+    # the delta entry of an update feed's package for the installed version, or None
+    # {"url": ..., "sha256": ..., "size": ..., "deltas": {"<installed version>": {"url": ..., "size": ...}}}
+    return (package.get('deltas') or {}).get(installed)
+
+
+def updateFile(manager, package, installed, source, path, progress=None, timeout=30):
+    # brings source at version installed up to package as path, by delta when the feed has one and it verifies
+    # returns (path, 'delta' or 'full', bytes transferred), a full download through manager is the fallback
+    # progress is called with 0..1 for either way, an exception it raises such as JobCancelled stops the update
+    delta = deltaFor(package, installed)
+    if delta is not None and os.path.exists(source):
+        response = None
+        reader = None
+        try:
+            response = manager.http().get(delta['url'], stream=True, timeout=timeout)
+            response.raise_for_status()
+            response.raw.decode_content = True
+            reader = CountingReader(response.raw)
+            applyDelta(source, reader, path, package.get('sha256'), progress)
+            return path, 'delta', reader.count
+        except JobCancelled:
+            raise
+        except Exception:
+            # a missing, broken or mismatched patch is replaced by the full file
+            pass
+        finally:
+            if response is not None:
+                response.close()
+        wasted = reader.count if reader is not None else 0
+    else:
+        wasted = 0
+    future = manager.download(package['url'], path, package.get('sha256'))
+    try:
+        while not future.done():
+            if progress is not None:
+                download = future.download
+                progress(download.downloaded / download.size if download.size else 0.0)
+            futures.wait([future], timeout=0.2)
+    except BaseException:
+        # the partial file stays for a later attempt to resume
+        future.download.cancel()
+        raise
+    future.result()
+    return path, 'full', wasted + future.download.downloaded
@@ -0,0 +1,277 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import network
+from paths import writeAtomic
+
+# bytes read from the network and hashed at a time, memory per connection stays at this size
+BUFFER_SIZE = 64 * 1024
+# smallest range worth its own connection
+MIN_CHUNK = 1024 * 1024
+
+
+class DownloadError(Exception):
+    pass
+
+
+class Download(object):
+    """One file fetched in parallel HTTP Range chunks into path + '.part'."""
+    def __init__(self, url, path, sha256=None, connections=4):
+        self.url = url
+        self.path = path
+        self.sha256 = sha256
+        self.connections = connections
+        self.part = path + '.part'
+        self.statePath = path + '.part.json'
+        self.size = None
+        self.etag = None
+        # [start, end, done] with end exclusive and done counted from start
+        self.chunks = []
+        self.lock = threading.Lock()
+        self.cancelled = threading.Event()
+        self.hasher = hashlib.sha256()
+        self.hashed = 0
+        self.fd = None
+        self.saved = 0
+        # chunk workers save on their own schedule, one state file write at a time
+        self.saveLock = threading.Lock()
+
+    @property
+    def downloaded(self):
+        return sum(chunk[2] for chunk in self.chunks)
+
+    def cancel(self):
+        # workers stop after their current buffer, the partial file is kept for resuming
+        self.cancelled.set()
+
+    def loadState(self):
+        try:
+            with open(self.statePath) as file:
+                state = json.load(file)
+        except (OSError, ValueError):
+            return False
+        if state.get('url') != self.url or state.get('size') != self.size or state.get('etag') != self.etag:
+            return False
+        if not os.path.exists(self.part) or os.path.getsize(self.part) != self.size:
+            return False
+        self.chunks = state['chunks']
+        return True
+
+    def saveState(self, interval=None):
+        # with interval, only saves when the last save is older than interval seconds
+        with self.saveLock:
+            if interval is not None and time.monotonic() - self.saved < interval:
+                return
+            self.saved = time.monotonic()
+            with self.lock:
+                state = {'url': self.url, 'size': self.size, 'etag': self.etag, 'chunks': [list(chunk) for chunk in self.chunks]}
+            writeAtomic(self.statePath, json.dumps(state).encode('utf-8'))
+
+    def dropState(self):
+        if os.path.exists(self.statePath):
+            os.remove(self.statePath)
+
+    def plan(self, ranges):
+        # split the file into one chunk per connection when the server accepts ranges
+        if not ranges or not self.size:
+            self.chunks = [[0, self.size, 0]]
+            return
+        count = max(1, min(self.connections, self.size // MIN_CHUNK))
+        step = -(-self.size // count)
+        self.chunks = [[start, min(start + step, self.size), 0] for start in range(0, self.size, step)]
+
+    def written(self, index, position, data):
+        # record a buffer written at position and feed the in-order hash
+        with self.lock:
+            self.chunks[index][2] += len(data)
+            if position == self.hashed:
+                self.hasher.update(data)
+                self.hashed += len(data)
+            self.catchUp()
+
+    def catchUp(self):
+        # hash bytes other connections already wrote past the hash position, they are still in the page cache
+        for start, end, done in self.chunks:
+            if self.hashed < start:
+                return
+            frontier = start + done
+            while self.hashed < frontier:
+                data = os.pread(self.fd, min(BUFFER_SIZE, frontier - self.hashed), self.hashed)
+                if not data:
+                    return
+                self.hasher.update(data)
+                self.hashed += len(data)
+            if end is None or frontier < end:
+                return
+
+
+def verifyFile(path, sha256, progress=None):
+    # raises DownloadError unless path hashes to sha256, progress is called with the fraction read
+    size = os.path.getsize(path)
+    hasher = hashlib.sha256()
+    done = 0
+    with open(path, 'rb') as file:
+        for data in iter(lambda: file.read(BUFFER_SIZE), b''):
+            hasher.update(data)
+            done += len(data)
+            if progress is not None:
+                progress(done / size if size else 1.0)
+    if hasher.hexdigest() != sha256.lower():
+        raise DownloadError('SHA-256 mismatch for %s' % path)
+    return path
+
+
+class DownloadManager(object):
+    """Runs downloads on a shared pool of connections and aggregates their progress."""
+    def __init__(self, session=None, maxConnections=8, saveInterval=1.0):
+        self.session = session
+        self.executor = ThreadPoolExecutor(max_workers=maxConnections, thread_name_prefix='downloads')
+        self.coordinator = ThreadPoolExecutor(max_workers=maxConnections, thread_name_prefix='downloads-job')
+        self.saveInterval = saveInterval
+        self.active = []
+        self.lock = threading.Lock()
+        # (time, bytes) samples for the throughput estimate
+        self.samples = deque()
+        self.finishedBytes = 0
+        self.finishedTotal = 0
+        self.running = 0
+
+    def http(self):
+        return self.session or network.session()
+
+    def download(self, url, path, sha256=None, connections=4, callback=None):
+        # returns a Future resolving to path once the file is complete and verified
+        download = Download(url, path, sha256, connections)
+        with self.lock:
+            if self.running == 0:
+                # a new batch after an idle manager, earlier downloads no longer count towards its progress
+                self.finishedBytes = 0
+                self.finishedTotal = 0
+                self.samples.clear()
+            self.running += 1
+        future = self.coordinator.submit(self.run, download)
+        future.download = download
+        future.add_done_callback(self.finished)
+        if callback is not None:
+            future.add_done_callback(callback)
+        return future
+
+    def finished(self, future):
+        with self.lock:
+            self.running -= 1
+
+    def busy(self):
+        # True while any download is queued or running
+        return self.running > 0
+
+    def probe(self, download):
+        response = self.http().head(download.url, allow_redirects=True, timeout=30)
+        response.raise_for_status()
+        length = response.headers.get('Content-Length')
+        download.size = int(length) if length is not None else None
+        download.etag = response.headers.get('ETag') or response.headers.get('Last-Modified')
+        return response.headers.get('Accept-Ranges', '').lower() == 'bytes'
+
+    def run(self, download):
+        ranges = self.probe(download)
+        if not ranges:
+            # a server without ranges can only send the whole file, a partial one from an earlier run is of no use
+            download.dropState()
+        if not ranges or not download.loadState():
+            download.plan(ranges)
+            with open(download.part, 'wb') as file:
+                if download.size:
+                    file.truncate(download.size)
+        with self.lock:
+            self.active.append(download)
+        download.fd = os.open(download.part, os.O_RDWR)
+        complete = False
+        try:
+            # bytes already on disk from an earlier run are hashed once before the connections start
+            with download.lock:
+                download.catchUp()
+            jobs = [self.executor.submit(self.fetchChunk, download, index) for index, chunk in enumerate(download.chunks) if download.size is None or chunk[2] < chunk[1] - chunk[0]]
+            try:
+                for job in jobs:
+                    job.result()
+            except BaseException:
+                # the other connections still write to fd, they have to stop before it can be closed
+                download.cancel()
+                wait(jobs)
+                download.saveState()
+                raise
+            download.saveState()
+            if download.cancelled.is_set():
+                raise DownloadError('Download of %s was cancelled' % download.url)
+            with download.lock:
+                download.catchUp()
+            if download.size is None:
+                download.size = download.hashed
+            if download.hashed != download.size:
+                raise DownloadError('Download of %s is incomplete' % download.url)
+            if download.sha256 and download.hasher.hexdigest() != download.sha256.lower():
+                # a corrupt file can not be resumed, start again next time
+                os.remove(download.statePath)
+                os.remove(download.part)
+                raise DownloadError('SHA-256 mismatch for %s' % download.url)
+            complete = True
+        finally:
+            os.close(download.fd)
+            with self.lock:
+                self.active.remove(download)
+                self.finishedBytes += download.downloaded
+                # a download that stopped early only counts with what it fetched, so the batch can still reach 100%
+                self.finishedTotal += (download.size or download.downloaded) if complete else download.downloaded
+        os.replace(download.part, download.path)
+        if os.path.exists(download.statePath):
+            os.remove(download.statePath)
+        return download.path
+
+    def fetchChunk(self, download, index):
+        start, end, done = download.chunks[index]
+        headers = {}
+        if download.size is not None and (start + done > 0 or end < download.size):
+            headers['Range'] = 'bytes=%d-%d' % (start + done, end - 1)
+        response = self.http().get(download.url, headers=headers, stream=True, timeout=30)
+        try:
+            response.raise_for_status()
+            if 'Range' in headers and response.status_code != 206:
+                raise DownloadError('Server ignored the range request for %s' % download.url)
+            position = start + done
+            for data in response.iter_content(BUFFER_SIZE):
+                if download.cancelled.is_set():
+                    return
+                if end is not None:
+                    data = data[:end - position]
+                os.pwrite(download.fd, data, position)
+                download.written(index, position, data)
+                position += len(data)
+                download.saveState(self.saveInterval)
+        finally:
+            response.close()
+
+    def progress(self):
+        # aggregate (downloaded, total, bytes per second, eta seconds) over every download of this manager
+        with self.lock:
+            downloaded = self.finishedBytes + sum(download.downloaded for download in self.active)
+            total = self.finishedTotal + sum(download.size or 0 for download in self.active)
+        now = time.monotonic()
+        self.samples.append((now, downloaded))
+        while len(self.samples) > 2 and now - self.samples[0][0] > 3.0:
+            self.samples.popleft()
+        elapsed = now - self.samples[0][0]
+        rate = (downloaded - self.samples[0][1]) / elapsed if elapsed > 0 else 0.0
+        eta = (total - downloaded) / rate if rate > 0 else None
+        return downloaded, total, rate, eta
+
+    def shutdown(self):
+        with self.lock:
+            for download in self.active:
+                download.cancel()
+        self.coordinator.shutdown(wait=False)
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,242 @@
+import hashlib
+import mmap
+import os
+import re
+import struct
+import threading
+import zlib
+
+from paths import cacheDir, writeAtomic
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+ICONS = os.path.join(ROOT, 'assets', 'icons')
+
+MAGIC = b'QICI'
+VERSION = 1
+# magic, version, bucket count, name count, directory count, newest directory mtime
+HEADER = struct.Struct('<4sIIIIq')
+# name hash, offset of the name record, 0 for an empty bucket
+BUCKET = struct.Struct('<II')
+# name length, variant count, then the name bytes and the variants
+NAME = struct.Struct('<HH')
+# size, scale, flags, path offset, path length
+VARIANT = struct.Struct('<HBBIH')
+
+# variant comes from a scalable directory and fits any size
+SCALABLE = 1
+# breeze draws its symbolic icons on a 16px grid
+SYMBOLIC_SIZE = 16
+SIZE_DIRECTORY = re.compile(r'(\d+)(?:@(\d+)x)?\Z')
+
+
+def followLink(path, root=ROOT):
+    # some icons are stored as a file holding the relative path of the icon they alias
+    for i in range(8):
+        with open(os.path.join(root, path), 'rb') as file:
+            data = file.read(512)
+        if data.lstrip().startswith(b'<'):
+            return path
+        path = os.path.normpath(os.path.join(os.path.dirname(path), data.decode('utf-8').strip()))
+        if not os.path.isfile(os.path.join(root, path)):
+            return None
+    return None
+
+
+def nameHash(name):
+    return zlib.crc32(name)
+
+
+def sizeDirectory(name):
+    # (size, scale, flags) of a theme directory name, or None for anything else
+    if name == 'symbolic':
+        return SYMBOLIC_SIZE, 1, SCALABLE
+    match = SIZE_DIRECTORY.match(name)
+    if match is None:
+        return None
+    return int(match.group(1)), int(match.group(2) or 1), 0
+
+
+def themeDirectories(root):
+    # every category and size directory of the theme, directory aliases are stored as files and skipped
+    directories = [root]
+    for category in sorted(os.scandir(root), key=lambda entry: entry.name):
+        if category.is_dir():
+            directories.append(category.path)
+            directories.extend(entry.path for entry in os.scandir(category.path) if entry.is_dir())
+    return directories
+
+
+def themeStamp(root):
+    # (directory count, newest mtime) changes whenever an icon or size directory is added or removed
+    stamp = 0
+    directories = themeDirectories(root)
+    for directory in directories:
+        stamp = max(stamp, os.stat(directory).st_mtime_ns)
+    return len(directories), stamp
+
+
+def scanTheme(root):
+    # name -> [(size, scale, flags, relative path)] for category/size[@scale]/name.svg
+    names = {}
+    for category in sorted(os.listdir(root)):
+        base = os.path.join(root, category)
+        if not os.path.isdir(base):
+            continue
+        for directory in sorted(os.listdir(base)):
+            size = sizeDirectory(directory)
+            if size is None:
+                continue
+            target = directory
+            if os.path.isfile(os.path.join(base, directory)):
+                # 16@2x holding "16" aliases the 16 directory
+                with open(os.path.join(base, directory)) as file:
+                    target = file.read().strip()
+                if not os.path.isdir(os.path.join(base, target)):
+                    continue
+            for file in sorted(os.listdir(os.path.join(base, target))):
+                if not file.endswith('.svg'):
+                    continue
+                path = followLink(os.path.join(category, target, file), root)
+                if path is None:
+                    continue
+                variant = size + (path.replace(os.sep, '/'),)
+                variants = names.setdefault(file[:-4], [])
+                if variant not in variants:
+                    variants.append(variant)
+    return names
+
+
+def buildIndex(root, stamp=None):
+    # the bytes of an index over root, names are found with one hash and usually one bucket probe
+    names = scanTheme(root)
+    directories, newest = themeStamp(root) if stamp is None else stamp
+    buckets = 8
+    while buckets < len(names) * 2:
+        buckets *= 2
+    table = [(0, 0)] * buckets
+    records = bytearray()
+    strings = bytearray()
+    offset = HEADER.size + buckets * BUCKET.size
+    stringOffsets = {}
+    pending = []
+    for name in sorted(names):
+        encoded = name.encode('utf-8')
+        digest = nameHash(encoded)
+        bucket = digest & (buckets - 1)
+        while table[bucket][1]:
+            bucket = (bucket + 1) & (buckets - 1)
+        table[bucket] = (digest, offset + len(records))
+        records += NAME.pack(len(encoded), len(names[name])) + encoded
+        for size, scale, flags, path in names[name]:
+            if path not in stringOffsets:
+                stringOffsets[path] = len(strings)
+                strings += path.encode('utf-8')
+            # path offsets are fixed up once the records are laid out
+            pending.append((len(records), stringOffsets[path]))
+            records += VARIANT.pack(size, scale, flags, 0, len(path.encode('utf-8')))
+    base = offset + len(records)
+    for position, stringOffset in pending:
+        struct.pack_into('<I', records, position + 4, base + stringOffset)
+    data = bytearray(HEADER.pack(MAGIC, VERSION, buckets, len(names), directories, newest))
+    for digest, record in table:
+        data += BUCKET.pack(digest, record)
+    return bytes(data + records + strings)
+
+
+class IconIndex(object):
+    """Memory-mapped name -> size variant table of an icon theme."""
+    def __init__(self, path, root):
+        self.root = root
+        with open(path, 'rb') as file:
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.buckets, self.count, directories, newest = HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != VERSION:
+            self.map.close()
+            raise ValueError('not an icon index: %s' % path)
+        self.stamp = (directories, newest)
+        self.mask = self.buckets - 1
+
+    def close(self):
+        self.map.close()
+
+    def variants(self, name):
+        # [(size, scale, flags, relative path)] of name, empty when the theme has no such icon
+        encoded = name.encode('utf-8')
+        digest = nameHash(encoded)
+        bucket = digest & self.mask
+        data = self.map
+        while True:
+            stored, offset = BUCKET.unpack_from(data, HEADER.size + bucket * BUCKET.size)
+            if not offset:
+                return []
+            if stored == digest:
+                length, count = NAME.unpack_from(data, offset)
+                start = offset + NAME.size
+                if data[start:start + length] == encoded:
+                    variants = []
+                    position = start + length
+                    for i in range(count):
+                        size, scale, flags, path, pathLength = VARIANT.unpack_from(data, position)
+                        variants.append((size, scale, flags, data[path:path + pathLength].decode('utf-8')))
+                        position += VARIANT.size
+                    return variants
+            bucket = (bucket + 1) & self.mask
+
+    def best(self, name, size, devicePixelRatio=1.0):
+        # (size, scale, flags, relative path) closest to size logical pixels at devicePixelRatio, or None
+        pixels = size * devicePixelRatio
+        wanted = max(1, int(round(devicePixelRatio)))
+        best = None
+        bestScore = None
+        for variant in self.variants(name):
+            variantSize, scale, flags = variant[:3]
+            # directories made for this scale first like the freedesktop lookup, then how far the device pixels
+            # are off with scalable icons fitting any size, then fixed sizes, then downscaling over upscaling
+            distance = 0 if flags & SCALABLE else abs(variantSize * scale - pixels)
+            score = (scale != wanted, distance, bool(flags & SCALABLE), variantSize * scale < pixels)
+            if bestScore is None or score < bestScore:
+                best = variant
+                bestScore = score
+        return best
+
+    def resolve(self, name, size, devicePixelRatio=1.0):
+        # absolute path of the best variant of name, or None
+        variant = self.best(name, size, devicePixelRatio)
+        return os.path.join(self.root, variant[3]) if variant is not None else None
+
+
+def indexPath(root):
+    return os.path.join(cacheDir('iconindex'), hashlib.sha1(os.path.abspath(root).encode('utf-8')).hexdigest()[:16] + '.idx')
+
+
+def openIndex(root=ICONS, path=None):
+    # the index of root, rebuilt when a directory of the theme changed since it was written
+    path = path or indexPath(root)
+    stamp = themeStamp(root)
+    try:
+        index = IconIndex(path, root)
+        if index.stamp == stamp:
+            return index
+        index.close()
+    except (OSError, ValueError, struct.error):
+        pass
+    writeAtomic(path, buildIndex(root, stamp))
+    return IconIndex(path, root)
+
+
+_indexes = {}
+_indexesLock = threading.Lock()
+
+
+def iconIndex(root=ICONS):
+    # one index per theme root shared by the process, None when the theme is not installed
+    with _indexesLock:
+        if root not in _indexes:
+            _indexes[root] = openIndex(root) if os.path.isdir(root) else None
+        return _indexes[root]
+
+
+def openedIndex(root=ICONS):
+    # (opened, index) without touching the disk, index is None when the theme is not installed
+    with _indexesLock:
+        return root in _indexes, _indexes.get(root)
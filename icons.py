@@ -0,0 +1,383 @@
+import hashlib
+import os
+import re
+import struct
+import threading
+import time
+from collections import OrderedDict
+
+from PyQt5.QtCore import *
+from PyQt5.QtWidgets import *
+from PyQt5.QtGui import *
+from PyQt5.QtSvg import QSvgRenderer
+
+from paths import cacheDir, writeAtomic
+
+# QEvent::ThemeChange is not exposed by every PyQt5 release
+ThemeChange = getattr(QEvent, 'ThemeChange', 210)
+
+# breeze color scheme classes and the palette roles they follow
+COLOR_SCHEME = {
+    'Text': QPalette.WindowText,
+    'Background': QPalette.Window,
+    'ViewText': QPalette.Text,
+    'ViewBackground': QPalette.Base,
+    'ViewHover': QPalette.Highlight,
+    'ViewFocus': QPalette.Highlight,
+    'ButtonText': QPalette.ButtonText,
+    'ButtonBackground': QPalette.Button,
+    'ButtonHover': QPalette.Highlight,
+    'ButtonFocus': QPalette.Highlight,
+    'Highlight': QPalette.Highlight,
+}
+
+# logical sizes rasterized ahead of time for every icon: menus, buttons and the catalog lists
+ICON_SIZES = (16, 22, 32)
+# total size of the pixmaps kept on disk, the least recently used ones are removed past it
+PIXMAP_CACHE_LIMIT = 16 * 1024 * 1024
+# cached pixmaps are the width and height followed by the rows of premultiplied ARGB32 pixels
+PIXMAP_HEADER = struct.Struct('<HH')
+PIXMAP_SUFFIX = '.argb'
+
+COLOR_CLASS = re.compile(r'(\.ColorScheme-(\w+)\s*\{\s*color\s*:\s*)#[0-9a-fA-F]{3,8}')
+
+
+def colorScheme(palette):
+    # colour of every color scheme class for palette
+    return {name: palette.color(role).name() for name, role in COLOR_SCHEME.items()}
+
+
+def recolorSvg(data, scheme):
+    # rewrite the color scheme classes of the svg stylesheet, Negative/Neutral/PositiveText keep their colour
+    def replace(match):
+        colour = scheme.get(match.group(2))
+        if colour is None:
+            return match.group(0)
+        return match.group(1) + colour
+    return COLOR_CLASS.sub(replace, data)
+
+
+class PixmapCache(object):
+    """Rasterized icons on disk by (icon, size, devicePixelRatio, palette) with a total size limit."""
+    def __init__(self, directory=None, limit=PIXMAP_CACHE_LIMIT):
+        self.directory = directory or cacheDir('pixmaps')
+        self.limit = limit
+        # key -> [bytes, last use], read from the directory on the first write
+        self.entries = None
+        self.total = 0
+
+    def key(self, digest, size, devicePixelRatio, variant):
+        data = '%s-%dx%d-%g-%s' % (digest, size.width(), size.height(), devicePixelRatio, variant)
+        return hashlib.sha1(data.encode()).hexdigest()[:24]
+
+    def path(self, key):
+        return os.path.join(self.directory, key + PIXMAP_SUFFIX)
+
+    def load(self, key):
+        # raw premultiplied pixels, a PNG decode costs more than rendering most of these svgs
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as file:
+                data = file.read()
+            width, height = PIXMAP_HEADER.unpack_from(data)
+        except (OSError, struct.error):
+            return None
+        if len(data) != PIXMAP_HEADER.size + width * height * 4:
+            return None
+        # the modification time is the last use, so later launches evict in the same order
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        if self.entries is not None and key in self.entries:
+            self.entries[key][1] = time.time()
+        image = QImage(data[PIXMAP_HEADER.size:], width, height, width * 4, QImage.Format_ARGB32_Premultiplied)
+        return QPixmap.fromImage(image)
+
+    def store(self, key, pixmap):
+        image = pixmap.toImage().convertToFormat(QImage.Format_ARGB32_Premultiplied)
+        # 32 bit pixels leave no padding at the end of the rows
+        pixels = image.constBits()
+        pixels.setsize(image.height() * image.bytesPerLine())
+        data = PIXMAP_HEADER.pack(image.width(), image.height()) + bytes(pixels)
+        try:
+            writeAtomic(self.path(key), data)
+        except OSError:
+            return
+        self.scan()
+        if key in self.entries:
+            self.total -= self.entries[key][0]
+        self.entries[key] = [len(data), time.time()]
+        self.total += len(data)
+        if self.total > self.limit:
+            self.evict()
+
+    def scan(self):
+        if self.entries is not None:
+            return
+        self.entries = {}
+        self.total = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(PIXMAP_SUFFIX):
+                stat = entry.stat()
+                self.entries[entry.name[:-len(PIXMAP_SUFFIX)]] = [stat.st_size, stat.st_mtime]
+                self.total += stat.st_size
+
+    def evict(self):
+        # down to nine tenths of the limit, so the next few writes do not evict again
+        for key in sorted(self.entries, key=lambda key: self.entries[key][1]):
+            if self.total <= self.limit * 0.9:
+                break
+            try:
+                os.remove(self.path(key))
+            except OSError:
+                pass
+            self.total -= self.entries.pop(key)[0]
+
+
+class PixmapIconEngine(QIconEngine):
+    """Serves pre-rasterized pixmaps of an icon, sizes it does not have yet come from the builder."""
+    def __init__(self, builder, name, pixmaps=None):
+        super(PixmapIconEngine, self).__init__()
+        self.builder = builder
+        self.name = name
+        # pixmaps by device pixel (width, height)
+        self.pixmaps = pixmaps if pixmaps is not None else {}
+
+    def paint(self, painter, rect, mode, state):
+        device = painter.device()
+        ratio = device.devicePixelRatioF() if device is not None else 1.0
+        painter.drawPixmap(rect, self.pixmap(rect.size() * ratio, mode, state))
+
+    def pixmap(self, size, mode, state):
+        key = (size.width(), size.height())
+        pixmap = self.pixmaps.get(key)
+        if pixmap is None:
+            pixmap = self.builder.pixmap(self.name, size)
+            self.pixmaps[key] = pixmap
+        if mode == QIcon.Disabled:
+            option = QStyleOption()
+            option.palette = QApplication.palette()
+            return QApplication.style().generatedIconPixmap(mode, pixmap, option)
+        return pixmap
+
+    def clone(self):
+        return PixmapIconEngine(self.builder, self.name, dict(self.pixmaps))
+
+
+class IconBuilder(object):
+    """Assembles icons from the best size variant of the theme for each size, rasterized once and kept on disk."""
+    def __init__(self, provider, cache=None, sizes=ICON_SIZES):
+        self.provider = provider
+        self.cache = cache or PixmapCache()
+        self.sizes = sizes
+        # svg source and its hash by theme path
+        self.files = {}
+
+    def devicePixelRatio(self):
+        return qApp.devicePixelRatio() if qApp else 1.0
+
+    def source(self, name, size, devicePixelRatio):
+        # the bundled svg, else the variant of the theme made for size at devicePixelRatio
+        if self.provider.isBundled(name):
+            return self.provider.source(name)
+        index = self.provider.themeIndex()
+        variant = index.best(name, size, devicePixelRatio) if index is not None else None
+        if variant is None:
+            return self.provider.source(name)
+        path = os.path.join(index.root, variant[3])
+        if path not in self.files:
+            try:
+                with open(path, 'rb') as file:
+                    data = file.read()
+            except OSError:
+                data = b''
+            self.files[path] = (data, hashlib.sha1(data).hexdigest()[:16])
+        return self.files[path]
+
+    def rasterize(self, data, size):
+        image = QImage(size, QImage.Format_ARGB32_Premultiplied)
+        image.fill(Qt.transparent)
+        if data:
+            painter = QPainter(image)
+            QSvgRenderer(QByteArray(data)).render(painter, QRectF(0, 0, size.width(), size.height()))
+            painter.end()
+        return QPixmap.fromImage(image)
+
+    def pixmap(self, name, size):
+        # name at size device pixels for the screen's ratio and the current palette, from disk when rasterized before
+        ratio = self.devicePixelRatio()
+        variant = self.provider.variant()
+        data, digest = self.source(name, max(size.width(), size.height()) / ratio, ratio)
+        key = self.cache.key(digest, size, ratio, variant)
+        pixmap = self.cache.load(key)
+        if pixmap is None:
+            pixmap = self.rasterize(recolorSvg(data.decode('utf-8'), self.provider.scheme).encode('utf-8'), size)
+            self.cache.store(key, pixmap)
+        return pixmap
+
+    def icon(self, name):
+        ratio = self.devicePixelRatio()
+        engine = PixmapIconEngine(self, name)
+        for size in self.sizes:
+            engine.pixmap(QSize(int(size * ratio), int(size * ratio)), QIcon.Normal, QIcon.Off)
+        return QIcon(engine)
+
+
+class IconProvider(QObject):
+    """Shared, theme-aware icon cache."""
+    # icons built before the theme index was open are built again, views repaint the ones they show
+    changed = pyqtSignal()
+    indexOpened = pyqtSignal(object)
+
+    def __init__(self, capacity=256, parent=None):
+        super(IconProvider, self).__init__(parent)
+        # QIcon/QPixmap entries keyed by (name, variant, size, devicePixelRatio)
+        self.capacity = capacity
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.dark = None
+        self.scheme = None
+        self.schemeKey = None
+        # light svg source and its hash by icon name
+        self.sources = {}
+        self.builder = IconBuilder(self)
+        # theme index, opened on a background thread the first time an icon is not bundled
+        self.index = None
+        self.indexLoading = None
+        self.indexOpened.connect(self.setIndex)
+
+    def watch(self, widget):
+        # recompute the dark/light decision when the palette or theme of widget changes
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() in (QEvent.PaletteChange, ThemeChange):
+            self.invalidate()
+        return False
+
+    def invalidate(self):
+        self.dark = None
+        self.scheme = None
+        self.schemeKey = None
+        self.cache.clear()
+
+    def isDarkMode(self):
+        # QT check if background is dark, only done once per palette
+        if self.dark is None:
+            self.dark = QApplication.palette().color(QPalette.Background).value() < 128
+        return self.dark
+
+    def variant(self):
+        # icons are recoloured for the palette, so the palette colours are the variant
+        if self.scheme is None:
+            self.scheme = colorScheme(QApplication.palette())
+            key = ','.join('%s=%s' % item for item in sorted(self.scheme.items()))
+            self.schemeKey = hashlib.sha1(key.encode()).hexdigest()[:16]
+        return self.schemeKey
+
+    def isBundled(self, name):
+        return QFile.exists(':/icons/' + name + '.svg')
+
+    def source(self, name):
+        if name not in self.sources:
+            file = QFile(':/icons/' + name + '.svg')
+            data = b''
+            if file.open(QFile.ReadOnly):
+                data = bytes(file.readAll())
+                file.close()
+            else:
+                # icons that are not bundled come from the theme index, the catalogs name arbitrary ones
+                data = self.themeSource(name)
+            self.sources[name] = (data, hashlib.sha1(data).hexdigest()[:16])
+        return self.sources[name]
+
+    def themeSource(self, name, size=22):
+        index = self.themeIndex()
+        path = index.resolve(name, size) if index is not None else None
+        if path is None:
+            return b''
+        try:
+            with open(path, 'rb') as file:
+                return file.read()
+        except OSError:
+            return b''
+
+    def themeIndex(self):
+        # the index when it is open, None while it is being opened or when the theme is not installed
+        if self.indexLoading is None:
+            from iconindex import openedIndex
+            opened, self.index = openedIndex()
+            self.indexLoading = not opened
+            if self.indexLoading:
+                # building the index of a changed theme takes hundreds of milliseconds
+                threading.Thread(target=self.openIndex, daemon=True).start()
+        return self.index
+
+    def openIndex(self):
+        from iconindex import iconIndex
+        try:
+            index = iconIndex()
+        except OSError:
+            index = None
+        self.indexOpened.emit(index)
+
+    def setIndex(self, index):
+        self.index = index
+        self.indexLoading = False
+        if index is None:
+            return
+        # theme icons looked up while the index was opened were blank
+        self.sources.clear()
+        self.invalidate()
+        self.changed.emit()
+
+    def lookup(self, key, create):
+        entry = self.cache.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return entry
+        self.misses += 1
+        entry = create()
+        self.cache[key] = entry
+        if len(self.cache) > self.capacity:
+            self.cache.popitem(last=False)
+        return entry
+
+    def icon(self, name):
+        variant = self.variant()
+        return self.lookup((name, variant, 0, 0), lambda: self.builder.icon(name))
+
+    def pixmap(self, name, size, devicePixelRatio=1.0):
+        # rasterized icon at size logical pixels for the given device pixel ratio
+        variant = self.variant()
+        def create():
+            pixmap = self.icon(name).pixmap(QSize(int(size * devicePixelRatio), int(size * devicePixelRatio)))
+            pixmap.setDevicePixelRatio(devicePixelRatio)
+            return pixmap
+        return self.lookup((name, variant, size, devicePixelRatio), create)
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.cache), 'capacity': self.capacity}
+
+
+_provider = None
+
+
+def iconProvider():
+    # one provider shared by every window and widget
+    global _provider
+    if _provider is None:
+        _provider = IconProvider()
+    return _provider
+
+
+def registerResources():
+    # memory-map the binary resources.rcc, fall back to the compiled resources.py
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resources.rcc')
+    if os.path.isfile(path) and QResource.registerResource(path):
+        return True
+    import resources
+    return False
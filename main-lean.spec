@@ -0,0 +1,85 @@
+# -*- mode: python ; coding: utf-8 -*-
+# lean, cold-start oriented build: pyinstaller main-lean.spec -> dist/main-lean
+# only PyQt5 with the Qt modules and plugins the app uses, no KF5 integration, no UPX
+
+import fnmatch
+
+
+block_cipher = None
+
+# python packages the app never imports
+excludes = [
+    'PySide2', 'PySide6', 'shiboken2', 'shiboken6', 'PyQt6',
+    # without qt_material main.py --theme= only reports that the theme was not applied
+    'qt_material', 'jinja2', 'markupsafe',
+    'tkinter', 'unittest', 'pydoc', 'doctest', 'pdb', 'lib2to3',
+    'PyQt5.QtNetwork', 'PyQt5.QtQml', 'PyQt5.QtQuick', 'PyQt5.QtQuickWidgets',
+    'PyQt5.QtWebEngine', 'PyQt5.QtWebEngineCore', 'PyQt5.QtWebEngineWidgets',
+    'PyQt5.QtMultimedia', 'PyQt5.QtMultimediaWidgets', 'PyQt5.QtBluetooth',
+    'PyQt5.QtDBus', 'PyQt5.QtPrintSupport', 'PyQt5.QtSql', 'PyQt5.QtTest',
+    'PyQt5.QtXml', 'PyQt5.QtXmlPatterns', 'PyQt5.QtTextToSpeech',
+    'PyQt5.QtPositioning', 'PyQt5.QtLocation', 'PyQt5.QtSensors',
+    'PyQt5.QtSerialPort', 'PyQt5.QtOpenGL', 'PyQt5.QtDesigner', 'PyQt5.uic',
+]
+
+# shared objects and plugins matched against their path inside the bundle
+binary_excludes = [
+    '*libKF5*', '*libbreezecommon*', '*KIconEnginePlugin*', '*KDEPlasmaPlatformTheme*',
+    '*plasmaim*', '*styles/breeze*', '*libLayerShellQt*',
+    '*wayland*', '*Wayland*', '*eglfs*', '*EglFS*', '*EglFs*', '*egldeviceintegrations*',
+    '*VirtualKeyboard*', '*virtualkeyboard*', '*TextToSpeech*', '*Qt5Pdf*', '*libqpdf*',
+    '*Qt5Qml*', '*Qt5Quick*', '*Qt5Network*', '*Qt5PrintSupport*', '*Qt5Xml*',
+    '*platforms/libqlinuxfb*', '*platforms/libqminimal*', '*platforms/libqvnc*',
+    '*platforms/libqwebgl*', '*Qt5WebSockets*', '*plugins/generic/*',
+    '*imageformats/libqicns*', '*imageformats/libqtga*', '*imageformats/libqtiff*', '*imageformats/libqwbmp*',
+    '*platformthemes/libqgtk3*', '*xcbglintegrations*',
+    '*PySide2*', '*shiboken2*', '*qt_material*',
+    '*/translations/*',
+]
+
+
+def lean(toc):
+    # drop every entry whose bundle path matches one of binary_excludes
+    return [entry for entry in toc if not any(fnmatch.fnmatch(entry[0], pattern) for pattern in binary_excludes)]
+
+
+a = Analysis(['main.py'],
+             pathex=[],
+             binaries=[],
+             datas=[('resources.rcc', '.')],
+             hiddenimports=[],
+             hookspath=[],
+             hooksconfig={},
+             runtime_hooks=[],
+             excludes=excludes,
+             win_no_prefer_redirects=False,
+             win_private_assemblies=True,
+             cipher=block_cipher,
+             noarchive=False)
+a.binaries = lean(a.binaries)
+a.datas = lean(a.datas)
+# pure python modules stay in the zipped PYZ archive
+pyz = PYZ(a.pure, a.zipped_data,
+             cipher=block_cipher)
+
+exe = EXE(pyz,
+          a.scripts,
+          [],
+          exclude_binaries=True,
+          name='main-lean',
+          debug=False,
+          bootloader_ignore_signals=False,
+          strip=True,
+          upx=False,
+          console=True,
+          disable_windowed_traceback=False,
+          target_arch=None,
+          codesign_identity=None,
+          entitlements_file=None )
+coll = COLLECT(exe,
+               a.binaries,
+               a.zipfiles,
+               a.datas,
+               strip=True,
+               upx=False,
+               name='main-lean')
@@ -1,42 +1,128 @@
-# load and run app.py and on error, display error message using pyqt5
-import app
-import sys
-from PyQt5.QtCore import *
-from PyQt5.QtWidgets import *
-from PyQt5.QtGui import *
-from qt_material import apply_stylesheet
-import resources
-import traceback
-import webbrowser
-
-def sendIssue(title, body):
-    # copy body to clipboard globally
-    clipboard = QApplication.clipboard()
-    clipboard.setText(body)
-    # open github issue page
-    # open browser to https://github.com/StringentDev/Quarternion/issues/new
-    url = 'https://github.com/StringentDev/Quaternion/issues/new'
-    # open default browser at url
-    webbrowser.open(url)
-    
-
-if __name__ == "__main__":
-    try:
-        root = QApplication(sys.argv)
-        win = app.Window()
-        win.show()
-        sys.exit(root.exec_())
-    except Exception as e:
-        # display verbose error message
-        msg = QMessageBox()
-        msg.setIcon(QMessageBox.Critical)
-        msg.setText("Error: " + str(e))
-        msg.setInformativeText("Do you want to report this issue to the developer?.")
-        msg.setWindowTitle("Error")
-        # set detailed message to error message stack trace
-        msg.setDetailedText(traceback.format_exc())
-        # send github issue button
-        msg.setStandardButtons(QMessageBox.Ok | QMessageBox.Cancel)
-        msg.buttonClicked.connect(lambda x: sendIssue(str(e), traceback.format_exc()))
-        # show message box
-        msg.exec_()
+# load and run app.py and on error, display error message using pyqt5
+import sys
+
+# --profile-startup[=path] reports import, QApplication, Window and first paint timings as JSON
+profiler = None
+# --theme=name applies a qt_material theme, its generated icons are cached between launches
+theme = None
+# --watchdog[=ms] or QUATERNION_WATCHDOG=ms records the stacks of GUI stalls longer than ms
+stallThreshold = None
+watchdog = None
+# --perf-hud[=path.json] or QUATERNION_PERF_HUD=1|path.json shows per page timings over the window, written to path on quit
+perfHud = None
+if __name__ == "__main__":
+    for arg in list(sys.argv[1:]):
+        if arg == "--profile-startup" or arg.startswith("--profile-startup="):
+            sys.argv.remove(arg)
+            from startup import StartupProfiler
+            profiler = StartupProfiler(*arg.split("=", 1)[1:])
+        elif arg.startswith("--theme="):
+            sys.argv.remove(arg)
+            theme = arg.split("=", 1)[1]
+        elif arg == "--watchdog" or arg.startswith("--watchdog="):
+            sys.argv.remove(arg)
+            stallThreshold = arg.split("=", 1)[1] if "=" in arg else ""
+        elif arg == "--perf-hud" or arg.startswith("--perf-hud="):
+            sys.argv.remove(arg)
+            perfHud = arg.split("=", 1)[1] if "=" in arg else ""
+
+from PyQt5.QtCore import *
+from PyQt5.QtWidgets import *
+from PyQt5.QtGui import *
+import app
+
+def sendIssue(title, body):
+    import webbrowser
+    # copy body to clipboard globally
+    clipboard = QApplication.clipboard()
+    clipboard.setText(body)
+    # open github issue page
+    # open browser to https://github.com/StringentDev/Quarternion/issues/new
+    url = 'https://github.com/StringentDev/Quaternion/issues/new'
+    # open default browser at url
+    webbrowser.open(url)
+    
+
+def applyTheme(root):
+    if theme:
+        import themecache
+        if not themecache.applyStylesheet(root, theme):
+            sys.stderr.write("Theme %s was not applied: qt_material is not installed or has no such theme\n" % theme)
+
+
+def startWatchdog(root):
+    global watchdog
+    import os
+    value = stallThreshold if stallThreshold is not None else os.environ.get("QUATERNION_WATCHDOG")
+    if value is None:
+        return
+    from stallwatch import Watchdog, parseThreshold
+    watchdog = Watchdog(parseThreshold(value))
+    watchdog.start()
+    root.aboutToQuit.connect(watchdog.stop)
+
+
+def startPerfHud(win):
+    import os
+    value = perfHud if perfHud is not None else os.environ.get("QUATERNION_PERF_HUD")
+    if value is None:
+        return
+    from perfhud import PerfHud
+    win.perfHud = PerfHud(win, value if value not in ("", "1") else None)
+    win.perfHud.start()
+
+
+def crashReport():
+    import traceback
+    # stack trace, and where the GUI stalled before it when the watchdog was on
+    report = traceback.format_exc()
+    if watchdog is not None:
+        report += "\n" + watchdog.summary()
+    return report
+
+
+def firstPaint():
+    # write the profile and leave once the main window has painted
+    profiler.stopImports()
+    profiler.report()
+    QTimer.singleShot(0, QApplication.quit)
+
+
+if __name__ == "__main__":
+    try:
+        if profiler is not None:
+            profiler.mark("imports done")
+            with profiler.phase("QApplication"):
+                root = QApplication(sys.argv)
+            startWatchdog(root)
+            with profiler.phase("theme"):
+                applyTheme(root)
+            with profiler.phase("Window"):
+                win = app.Window()
+            startPerfHud(win)
+            with profiler.phase("show"):
+                win.show()
+            profiler.watch(win, firstPaint)
+        else:
+            root = QApplication(sys.argv)
+            startWatchdog(root)
+            applyTheme(root)
+            win = app.Window()
+            startPerfHud(win)
+            win.show()
+        sys.exit(root.exec_())
+    except Exception as e:
+        # display verbose error message
+        msg = QMessageBox()
+        msg.setIcon(QMessageBox.Critical)
+        msg.setText("Error: " + str(e))
+        msg.setInformativeText("Do you want to report this issue to the developer?.")
+        msg.setWindowTitle("Error")
+        # set detailed message to error message stack trace
+        report = crashReport()
+        msg.setDetailedText(report)
+        # send github issue button
+        msg.setStandardButtons(QMessageBox.Ok | QMessageBox.Cancel)
+        msg.buttonClicked.connect(lambda x: sendIssue(str(e), report))
+        # show message box
+        msg.exec_()
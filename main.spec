@@ -7,7 +7,7 @@ block_cipher = None
 a = Analysis(['main.py'],
              pathex=[],
              binaries=[],
-             datas=[],
+             datas=[('resources.rcc', '.')],
              hiddenimports=[],
              hookspath=[],
              hooksconfig={},
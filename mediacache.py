@@ -0,0 +1,234 @@
+import email.utils
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import network
+from paths import cacheDir, writeAtomic
+
+# total size of the cached files, the least recently used URLs are dropped past it
+MEDIA_CACHE_LIMIT = 64 * 1024 * 1024
+# longest a response without an explicit lifetime is used without asking the server again
+HEURISTIC_LIMIT = 24 * 3600
+MAX_AGE = re.compile(r'(?:^|,)\s*max-age\s*=\s*"?(\d+)"?', re.IGNORECASE)
+
+
+def freshFor(headers, now):
+    # seconds a response may be used without revalidation, from Cache-Control, Expires or Last-Modified
+    control = headers.get('Cache-Control', '')
+    if re.search(r'no-cache|no-store|must-revalidate', control, re.IGNORECASE):
+        return 0
+    match = MAX_AGE.search(control)
+    if match:
+        return int(match.group(1))
+    date = parseDate(headers.get('Date')) or now
+    expires = parseDate(headers.get('Expires'))
+    if expires is not None:
+        return max(0, expires - date)
+    modified = parseDate(headers.get('Last-Modified'))
+    if modified is not None:
+        # the usual heuristic, a tenth of the time since the last change
+        return min(HEURISTIC_LIMIT, max(0, (date - modified) / 10))
+    return 0
+
+
+def parseDate(value):
+    if not value:
+        return None
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+class MediaCache(object):
+    """Remote icons and screenshots on disk by content hash, one download per URL however many ask for it."""
+    def __init__(self, directory=None, limit=MEDIA_CACHE_LIMIT, session=None, maxWorkers=4, timeout=15):
+        self.directory = directory or cacheDir('media')
+        os.makedirs(self.directory, exist_ok=True)
+        self.limit = limit
+        self.session = session
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=maxWorkers, thread_name_prefix='media')
+        self.lock = threading.Lock()
+        # downloads and revalidations running by URL
+        self.pending = {}
+        self.indexPath = os.path.join(self.directory, 'index.json')
+        # url -> {hash, size, etag, modified, expires, used}
+        self.entries = self.loadIndex()
+        # hits only change the time an entry was used, they are written with the next download or at shutdown
+        self.unsaved = False
+        self.total = sum(size for size in self.blobSizes().values())
+        self.hits = 0
+        self.revalidated = 0
+        self.downloaded = 0
+        self.bytesSaved = 0
+        self.bytesDownloaded = 0
+
+    def loadIndex(self):
+        try:
+            with open(self.indexPath) as file:
+                entries = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        # entries whose file is gone are fetched again
+        return dict((url, entry) for url, entry in entries.items() if os.path.exists(self.path(entry['hash'])))
+
+    def saveIndex(self):
+        # called with lock held
+        self.unsaved = False
+        try:
+            writeAtomic(self.indexPath, json.dumps(self.entries).encode('utf-8'))
+        except OSError:
+            pass
+
+    def path(self, digest):
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def blobSizes(self):
+        # every stored file counts once, however many URLs share it
+        return dict((entry['hash'], entry['size']) for entry in self.entries.values())
+
+    def get(self, url):
+        # Future with the local path of url's content, shared with any request for url still running
+        with self.lock:
+            future = self.pending.get(url)
+            if future is not None:
+                return future
+            entry = self.entries.get(url)
+            if entry is not None and time.time() < entry['expires'] and os.path.exists(self.path(entry['hash'])):
+                entry['used'] = time.time()
+                self.unsaved = True
+                self.hits += 1
+                self.bytesSaved += entry['size']
+                future = Future()
+                future.set_result(self.path(entry['hash']))
+                return future
+            future = self.pending[url] = self.executor.submit(self.fetch, url, entry)
+        return future
+
+    def fetch(self, url, entry):
+        # runs on a worker, asks the server with the validators of entry when there is one
+        try:
+            headers = {}
+            if entry is not None:
+                if entry.get('etag'):
+                    headers['If-None-Match'] = entry['etag']
+                if entry.get('modified'):
+                    headers['If-Modified-Since'] = entry['modified']
+            response = (self.session or network.session()).get(url, headers=headers, timeout=self.timeout)
+            now = time.time()
+            if response.status_code == 304 and entry is not None:
+                with self.lock:
+                    entry['expires'] = now + freshFor(response.headers, now)
+                    entry['used'] = now
+                    self.revalidated += 1
+                    self.bytesSaved += entry['size']
+                    self.saveIndex()
+                return self.path(entry['hash'])
+            response.raise_for_status()
+            data = response.content
+            digest = hashlib.sha256(data).hexdigest()
+            path = self.path(digest)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                try:
+                    writeAtomic(path, data)
+                except OSError:
+                    # another URL with the same content was written at the same moment
+                    if not os.path.exists(path):
+                        raise
+            with self.lock:
+                stored = digest in self.blobSizes()
+                previous = self.entries.get(url)
+                self.entries[url] = {
+                    'hash': digest,
+                    'size': len(data),
+                    'etag': response.headers.get('ETag'),
+                    'modified': response.headers.get('Last-Modified'),
+                    'expires': now + freshFor(response.headers, now),
+                    'used': now,
+                }
+                if not stored:
+                    self.total += len(data)
+                if previous is not None and previous['hash'] != digest:
+                    # the content changed, its old file goes unless another URL has the same
+                    self.release(previous['hash'])
+                self.downloaded += 1
+                self.bytesDownloaded += len(data)
+                self.evict(keep=url)
+                self.saveIndex()
+            return path
+        finally:
+            with self.lock:
+                self.pending.pop(url, None)
+
+    def evict(self, keep=None):
+        # called with lock held, drops least recently used URLs and the files no URL refers to any more
+        if self.total <= self.limit:
+            return
+        for url in sorted(self.entries, key=lambda url: self.entries[url]['used']):
+            if self.total <= self.limit:
+                break
+            if url == keep:
+                continue
+            self.release(self.entries.pop(url)['hash'])
+
+    def release(self, digest):
+        # called with lock held, removes the file of digest once no URL refers to it
+        if any(entry['hash'] == digest for entry in self.entries.values()):
+            return
+        path = self.path(digest)
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return
+        self.total -= size
+
+    def stats(self):
+        with self.lock:
+            requests = self.hits + self.revalidated + self.downloaded
+            return {
+                'hits': self.hits,
+                'revalidated': self.revalidated,
+                'downloaded': self.downloaded,
+                'hitRate': (self.hits + self.revalidated) / requests if requests else 0.0,
+                'bytesSaved': self.bytesSaved,
+                'bytesDownloaded': self.bytesDownloaded,
+                'size': self.total,
+                'limit': self.limit,
+            }
+
+    def shutdown(self):
+        # queued fetches are dropped, one that is running finishes within the timeout
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        with self.lock:
+            if self.unsaved:
+                self.saveIndex()
+
+
+_cache = None
+_cacheLock = threading.Lock()
+
+
+def mediaCache():
+    # one cache shared by every view
+    global _cache
+    with _cacheLock:
+        if _cache is None:
+            _cache = MediaCache()
+        return _cache
+
+
+def shutdownMediaCache():
+    # the next mediaCache() starts a new cache from the saved index
+    global _cache
+    with _cacheLock:
+        cache, _cache = _cache, None
+    if cache is not None:
+        cache.shutdown()
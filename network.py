@@ -0,0 +1,21 @@
+import threading
+
+USER_AGENT = 'Quaternion (+https://github.com/StringentDev/Quaternion)'
+
+_session = None
+_lock = threading.Lock()
+
+
+def session(poolSize=16):
+    # one pooled requests session shared by every network user, requests is only imported on first use
+    global _session
+    with _lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=poolSize, pool_maxsize=poolSize)
+            _session.mount('http://', adapter)
+            _session.mount('https://', adapter)
+            _session.headers['User-Agent'] = USER_AGENT
+        return _session
@@ -0,0 +1,32 @@
+import os
+import tempfile
+
+
+def cacheDir(*parts):
+    # per-user cache directory for quaternion, created on first use
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    path = os.path.join(base, 'quaternion', *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def writeAtomic(path, data):
+    # write to a temporary file of its own next to path and rename it over path, concurrent writers never share one
+    directory, name = os.path.split(path)
+    fd, temp = tempfile.mkstemp(prefix=name + '.', suffix='.tmp', dir=directory or '.')
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            file.write(data)
+        os.replace(temp, path)
+    except BaseException:
+        if os.path.exists(temp):
+            os.remove(temp)
+        raise
+
+
+def configDir(*parts):
+    # per-user configuration directory for quaternion, created on first use
+    base = os.environ.get('XDG_CONFIG_HOME') or os.path.join(os.path.expanduser('~'), '.config')
+    path = os.path.join(base, 'quaternion', *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
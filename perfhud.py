@@ -0,0 +1,118 @@
+import json
+import time
+from collections import deque
+
+from PyQt5.QtCore import *
+from PyQt5.QtWidgets import *
+from PyQt5.QtGui import *
+
+# the probe timer's interval, its lateness is the event loop latency
+PROBE_INTERVAL = 16
+# latency samples kept per page
+SAMPLES = 1000
+REFRESH_INTERVAL = 500
+
+
+def percentile(samples, fraction):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class PerfHud(QObject):
+    """Overlay on the main window with build time, widgets, repaints and event loop latency of each page."""
+    def __init__(self, window, output=None):
+        super(PerfHud, self).__init__(window)
+        self.window = window
+        self.output = output
+        # repaints and latency samples by page id
+        self.repaints = {}
+        self.latency = {}
+        self.label = QLabel(window)
+        self.label.setObjectName('perfHud')
+        self.label.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.label.setStyleSheet('QLabel#perfHud { background-color: rgba(0, 0, 0, 160); color: white; padding: 4px; font-family: monospace; }')
+        self.label.setTextFormat(Qt.PlainText)
+        self.expected = time.perf_counter()
+        self.probe = QTimer(self)
+        self.probe.setTimerType(Qt.PreciseTimer)
+        self.probe.timeout.connect(self.tick)
+        self.refresh = QTimer(self)
+        self.refresh.timeout.connect(self.update)
+        self.shortcut = QShortcut(QKeySequence('Ctrl+Shift+P'), window)
+        self.shortcut.activated.connect(self.toggle)
+
+    def start(self):
+        QApplication.instance().installEventFilter(self)
+        self.expected = time.perf_counter() + PROBE_INTERVAL / 1000.0
+        self.probe.start(PROBE_INTERVAL)
+        self.refresh.start(REFRESH_INTERVAL)
+        QApplication.instance().aboutToQuit.connect(self.stop)
+        self.label.show()
+        self.update()
+
+    def stop(self):
+        QApplication.instance().removeEventFilter(self)
+        self.probe.stop()
+        self.refresh.stop()
+        if self.output:
+            self.export(self.output)
+
+    def toggle(self):
+        self.label.setVisible(not self.label.isVisible())
+
+    def page(self):
+        return self.window.currentPage or 'none'
+
+    def tick(self):
+        # how much later than planned the probe ran
+        now = time.perf_counter()
+        samples = self.latency.get(self.page())
+        if samples is None:
+            samples = self.latency[self.page()] = deque(maxlen=SAMPLES)
+        samples.append(max(0.0, now - self.expected) * 1000)
+        self.expected = now + PROBE_INTERVAL / 1000.0
+
+    def eventFilter(self, obj, event):
+        # paints of the current page, other widgets like the sidebar and the overlay itself are not counted
+        if event.type() == QEvent.Paint and obj is not self.label:
+            page = self.window.builtPages.get(self.window.currentPage)
+            if page is not None and (obj is page or (isinstance(obj, QWidget) and page.isAncestorOf(obj))):
+                self.repaints[self.page()] = self.repaints.get(self.page(), 0) + 1
+        return False
+
+    def snapshot(self):
+        # per page numbers, the same ones the overlay shows
+        pages = {}
+        for id in self.window.pages:
+            page = self.window.builtPages.get(id)
+            samples = list(self.latency.get(id, ()))
+            pages[id] = {
+                'built': page is not None,
+                'buildMs': round(self.window.pageBuildTimes.get(id, 0.0) * 1000, 3),
+                'widgets': len(page.findChildren(QWidget)) + 1 if page is not None else 0,
+                'repaints': self.repaints.get(id, 0),
+                'latencyMs': {'p50': round(percentile(samples, 0.5), 3), 'p95': round(percentile(samples, 0.95), 3), 'p99': round(percentile(samples, 0.99), 3), 'samples': len(samples)},
+            }
+        return {'current': self.window.currentPage, 'widgets': len(QApplication.allWidgets()), 'pages': pages}
+
+    def export(self, path):
+        with open(path, 'w') as file:
+            json.dump(self.snapshot(), file, indent=2, sort_keys=True)
+
+    def update(self):
+        if not self.label.isVisible():
+            return
+        snapshot = self.snapshot()
+        lines = ['%d widgets' % snapshot['widgets'], '%-9s %7s %6s %7s %6s %6s %6s' % ('page', 'build', 'widgets', 'paints', 'p50', 'p95', 'p99')]
+        for id, page in snapshot['pages'].items():
+            if not page['built'] and not page['latencyMs']['samples']:
+                continue
+            latency = page['latencyMs']
+            lines.append('%-9s %5.1fms %6d %7d %4.1fms %4.1fms %4.1fms' % (id[:9], page['buildMs'], page['widgets'], page['repaints'], latency['p50'], latency['p95'], latency['p99']))
+        self.label.setText('\n'.join(lines))
+        self.label.adjustSize()
+        # top right corner of the window, above the pages
+        self.label.move(self.window.width() - self.label.width() - 8, self.window.centralWidget().geometry().top() + 8)
+        self.label.raise_()
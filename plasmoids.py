@@ -0,0 +1,281 @@
+import configparser
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from PyQt5.QtCore import *
+
+from catalog import CatalogEntry
+from paths import cacheDir, writeAtomic
+
+METADATA_FILES = ('metadata.json', 'metadata.desktop')
+
+
+def plasmoidDirs():
+    # user packages first so they win over system packages with the same id
+    data = os.environ.get('XDG_DATA_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'share')
+    system = (os.environ.get('XDG_DATA_DIRS') or '/usr/local/share:/usr/share').split(':')
+    return [os.path.join(base, 'plasma', 'plasmoids') for base in [data] + [base for base in system if base]]
+
+
+def metadataPath(package):
+    for name in METADATA_FILES:
+        path = os.path.join(package, name)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def parseMetadata(path):
+    # fields of a CatalogEntry from a metadata.json or metadata.desktop file
+    package = os.path.basename(os.path.dirname(path))
+    if path.endswith('.json'):
+        with open(path, encoding='utf-8') as file:
+            data = json.load(file)
+        plugin = data.get('KPlugin', {})
+        keywords = plugin.get('Category', '')
+        return {
+            'id': plugin.get('Id') or package,
+            'name': plugin.get('Name') or package,
+            'summary': plugin.get('Description', ''),
+            'icon': plugin.get('Icon'),
+            'version': str(plugin.get('Version', '')),
+            'keywords': keywords if isinstance(keywords, str) else ' '.join(keywords),
+            'kind': 'plasmoid',
+        }
+    parser = configparser.ConfigParser(interpolation=None, strict=False)
+    # keys such as Name[de] are case sensitive
+    parser.optionxform = str
+    parser.read(path, encoding='utf-8')
+    entry = parser['Desktop Entry'] if parser.has_section('Desktop Entry') else {}
+    return {
+        'id': entry.get('X-KDE-PluginInfo-Name') or package,
+        'name': entry.get('Name') or package,
+        'summary': entry.get('Comment', ''),
+        'icon': entry.get('Icon'),
+        'version': entry.get('X-KDE-PluginInfo-Version', ''),
+        'keywords': ' '.join(part for part in (entry.get('Keywords', '').replace(';', ' '), entry.get('X-KDE-PluginInfo-Category', '')) if part),
+        'kind': 'plasmoid',
+    }
+
+
+def installPackage(archive, directory=None, progress=None):
+    # unpack a .plasmoid zip into the user's plasmoid directory under its id, returns the package directory
+    directory = directory or plasmoidDirs()[0]
+    os.makedirs(directory, exist_ok=True)
+    temp = tempfile.mkdtemp(prefix='.installing-', dir=directory)
+    try:
+        with zipfile.ZipFile(archive) as package:
+            members = package.infolist()
+            for index, member in enumerate(members):
+                target = os.path.realpath(os.path.join(temp, member.filename))
+                if not target.startswith(os.path.realpath(temp) + os.sep):
+                    raise ValueError('%s has a file outside the package: %s' % (archive, member.filename))
+                package.extract(member, temp)
+                if progress is not None:
+                    progress((index + 1) / len(members))
+        # packages are zipped either with their files at the top or inside one folder
+        root = temp
+        entries = os.listdir(temp)
+        if metadataPath(temp) is None and len(entries) == 1 and os.path.isdir(os.path.join(temp, entries[0])):
+            root = os.path.join(temp, entries[0])
+        metadata = metadataPath(root)
+        if metadata is None:
+            raise ValueError('%s has no metadata.json or metadata.desktop' % archive)
+        id = parseMetadata(metadata)['id']
+        # the id names the install directory, it must not point anywhere else
+        if not isinstance(id, str) or id in ('', '.', '..') or os.sep in id or (os.altsep and os.altsep in id) or os.path.isabs(id):
+            raise ValueError('%s has an invalid package id: %r' % (archive, id))
+        path = os.path.join(directory, id)
+        if os.path.dirname(os.path.realpath(path)) != os.path.realpath(directory):
+            raise ValueError('%s would install outside %s' % (archive, directory))
+        # an installed version is replaced as a whole, the scanner's watcher picks the change up even in a new root
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        os.rename(root, path)
+        return path
+    finally:
+        shutil.rmtree(temp, ignore_errors=True)
+
+
+class PlasmoidScanner(QObject):
+    """Finds installed plasmoids in the background and keeps watching them for changes."""
+    # new or changed entries and the ids of removed packages, in batches
+    found = pyqtSignal(list)
+    removed = pyqtSignal(list)
+    # a scan finished, carries the package directories to watch
+    scanned = pyqtSignal(list)
+
+    def __init__(self, directories=None, cachePath=None, maxWorkers=4, batchInterval=0.1, parent=None):
+        super(PlasmoidScanner, self).__init__(parent)
+        self.directories = directories if directories is not None else plasmoidDirs()
+        self.cachePath = cachePath or os.path.join(cacheDir(), 'plasmoids.json')
+        self.batchInterval = batchInterval
+        self.executor = ThreadPoolExecutor(max_workers=maxWorkers, thread_name_prefix='plasmoids')
+        # scans run one after another so the package table is only touched by one of them
+        self.coordinator = ThreadPoolExecutor(max_workers=1, thread_name_prefix='plasmoids-scan')
+        self.lock = threading.Lock()
+        # set by shutdown, the scanner's owner may be deleted after that and nothing is emitted to it
+        self.closed = False
+        # metadata path -> [mtime_ns, size, entry fields], a package is only parsed again when its file changed
+        self.cache = self.loadCache()
+        # package directory -> entry id of every package found so far
+        self.packages = {}
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.changed)
+        self.watcher.fileChanged.connect(lambda path: self.changed(os.path.dirname(path)))
+        self.scanned.connect(self.watch)
+        # changes arrive in bursts while a package is installed, they are rescanned together
+        self.changes = set()
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(200)
+        self.timer.timeout.connect(self.rescanChanged)
+
+    def loadCache(self):
+        try:
+            with open(self.cachePath) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def saveCache(self):
+        with self.lock:
+            data = json.dumps(self.cache).encode('utf-8')
+        writeAtomic(self.cachePath, data)
+
+    def scan(self):
+        # full scan on a worker thread, results arrive through the found and removed signals
+        self.coordinator.submit(self.scanPackages, None)
+
+    def scanPackages(self, packages=None):
+        # parse packages (every package when None) in parallel and emit them in batches
+        if packages is None:
+            packages = []
+            for directory in self.directories:
+                try:
+                    packages.extend(entry.path for entry in os.scandir(directory) if entry.is_dir())
+                except OSError:
+                    pass
+            gone = set(self.packages) - set(packages)
+        else:
+            gone = set(package for package in packages if not os.path.isdir(package))
+            packages = [package for package in packages if package not in gone]
+        jobs = [self.executor.submit(self.readPackage, package) for package in packages]
+        batch = []
+        sent = time.monotonic()
+        for job in as_completed(jobs):
+            package, fields = job.result()
+            if fields is None:
+                gone.add(package)
+                continue
+            self.packages[package] = fields['id']
+            batch.append(CatalogEntry(**fields))
+            # one signal per interval keeps the model from being updated once per package
+            if time.monotonic() - sent > self.batchInterval:
+                self.send(self.found, batch)
+                batch = []
+                sent = time.monotonic()
+        if batch:
+            self.send(self.found, batch)
+        removed = [self.packages.pop(package) for package in gone if package in self.packages]
+        # an id still provided by another package, say a user copy of a system one, stays installed
+        removed = [id for id in removed if id not in self.packages.values()]
+        if removed:
+            self.send(self.removed, removed)
+        with self.lock:
+            # forget parsed metadata of packages that are gone
+            self.cache = dict((path, value) for path, value in self.cache.items() if os.path.dirname(path) in self.packages)
+        self.saveCache()
+        self.send(self.scanned, sorted(self.packages))
+
+    def send(self, signal, value):
+        # emits from a worker thread, or not at all once the scanner shut down
+        with self.lock:
+            if not self.closed:
+                signal.emit(value)
+
+    def readPackage(self, package):
+        # (package, entry fields) with fields None when the package has no readable metadata
+        path = metadataPath(package)
+        if path is None:
+            return package, None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return package, None
+        with self.lock:
+            cached = self.cache.get(path)
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return package, cached[2]
+        try:
+            fields = parseMetadata(path)
+        except (OSError, ValueError, configparser.Error):
+            return package, None
+        with self.lock:
+            self.cache[path] = [stat.st_mtime_ns, stat.st_size, fields]
+        return package, fields
+
+    def watch(self, packages):
+        # watch the roots for added and removed packages and every package for changed metadata
+        paths = []
+        for directory in self.directories:
+            # a root that does not exist yet, as on a new profile, is waited for on its nearest existing parent
+            while not os.path.isdir(directory) and os.path.dirname(directory) != directory:
+                directory = os.path.dirname(directory)
+            paths.append(directory)
+        for package in packages:
+            paths.append(package)
+            path = metadataPath(package)
+            if path is not None:
+                paths.append(path)
+        watched = set(self.watcher.directories() + self.watcher.files())
+        paths = [path for path in paths if path not in watched]
+        if paths:
+            self.watcher.addPaths(paths)
+
+    def changed(self, path):
+        self.changes.add(path)
+        self.timer.start()
+
+    def rescanChanged(self):
+        # a changed root lists its packages again, a changed package is only read again itself
+        changes, self.changes = self.changes, set()
+        # a root that appeared is listed as a whole, a parent that only leads to it is not scanned
+        watched = set(self.watcher.directories())
+        missing = [directory for directory in self.directories if directory not in watched]
+        changes.update(directory for directory in missing if os.path.isdir(directory))
+        packages = set()
+        for path in changes:
+            if path in self.directories:
+                try:
+                    found = set(entry.path for entry in os.scandir(path) if entry.is_dir())
+                except OSError:
+                    found = set()
+                known = set(package for package in self.packages if os.path.dirname(package) == path)
+                packages |= (found - known) | (known - found)
+            elif os.path.dirname(path) in self.directories:
+                packages.add(path)
+        if missing:
+            # watch whatever part of a missing root exists by now
+            self.watch(sorted(self.packages))
+        if packages:
+            self.rescan(sorted(packages))
+
+    def rescan(self, packages):
+        # read the given package directories again on a worker thread, say after an install
+        with self.lock:
+            if self.closed:
+                return
+        self.coordinator.submit(self.scanPackages, packages)
+
+    def shutdown(self):
+        with self.lock:
+            self.closed = True
+        self.coordinator.shutdown(wait=False)
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,99 @@
+# command line entry point that never imports Qt, for cron jobs and login scripts
+import json
+import sys
+
+from updates import UpdateChecker, loadSources
+
+# exit codes of check, as dnf check-update uses them: nothing to do, something failed, updates waiting
+EXIT_CURRENT = 0
+EXIT_ERROR = 1
+EXIT_USAGE = 2
+EXIT_UPDATES = 100
+# feeds fetched less than this many seconds ago are answered from the cache the GUI shares
+MAX_AGE = 3600
+
+USAGE = """usage: python -m quaternion check [--json] [--max-age=seconds] [--refresh] [--sources=path]
+
+check     check every update source, exit %d when updates are available, %d when one failed
+  --json              print the results as JSON
+  --max-age=seconds   use cached feeds younger than this (default %d)
+  --refresh           ask every server again, same as --max-age=0
+  --sources=path      sources.json to read instead of the one in the config directory
+""" % (EXIT_UPDATES, EXIT_ERROR, MAX_AGE)
+
+
+class Options(object):
+    """Parsed arguments of check."""
+    def __init__(self):
+        self.json = False
+        self.maxAge = MAX_AGE
+        self.sources = None
+
+
+def parseArguments(argv):
+    # (command, Options), argparse alone would take longer to import than a check from a fresh cache
+    if not argv or argv[0] in ('-h', '--help', 'help'):
+        return None, None
+    command, options = argv[0], Options()
+    for arg in argv[1:]:
+        name, value = arg.split('=', 1) if '=' in arg else (arg, None)
+        if name == '--json' and value is None:
+            options.json = True
+        elif name == '--refresh' and value is None:
+            options.maxAge = 0
+        elif name == '--max-age' and value is not None and value.isdigit():
+            options.maxAge = int(value)
+        elif name == '--sources' and value:
+            options.sources = value
+        else:
+            raise ValueError('Unknown argument: %s' % arg)
+    return command, options
+
+
+def check(options, output=sys.stdout):
+    sources = loadSources(options.sources)
+    checker = UpdateChecker(sources, maxAge=options.maxAge, minInterval=0)
+    try:
+        results = checker.check()
+    finally:
+        checker.shutdown()
+    available = [result for result in results if result.available]
+    failed = [result for result in results if result.error is not None]
+    if options.json:
+        json.dump({'available': len(available), 'failed': len(failed), 'results': [result.toDict() for result in results]}, output, indent=2)
+        output.write('\n')
+    else:
+        if not sources:
+            output.write('No update sources configured\n')
+        for result in results:
+            if result.error is not None:
+                sys.stderr.write('%s: %s\n' % (result.name, result.error))
+            elif result.available:
+                output.write('%s %s -> %s\n' % (result.name, result.installed, result.latest))
+            else:
+                output.write('%s %s is up to date\n' % (result.name, result.installed))
+    # available updates win over failed sources, a script can act on what it knows
+    if available:
+        return EXIT_UPDATES
+    if failed:
+        return EXIT_ERROR
+    return EXIT_CURRENT
+
+
+def main(argv=None):
+    try:
+        command, options = parseArguments(sys.argv[1:] if argv is None else argv)
+    except ValueError as e:
+        sys.stderr.write('%s\n\n%s' % (e, USAGE))
+        return EXIT_USAGE
+    if command == 'check':
+        return check(options)
+    if command is None:
+        sys.stdout.write(USAGE)
+        return EXIT_CURRENT
+    sys.stderr.write('Unknown command: %s\n\n%s' % (command, USAGE))
+    return EXIT_USAGE
+
+
+if __name__ == '__main__':
+    sys.exit(main())
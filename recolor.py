@@ -0,0 +1,129 @@
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+# colors the qt_material source icons are drawn with
+PRIMARY = '#0000ff'
+SECONDARY = '#ff0000'
+BLACK = '#000000'
+TRANSPARENT = '#ffffff00'
+HEX_COLOR = re.compile(r'#[0-9a-fA-F]*\Z')
+# below this many files the process pool costs more than it saves
+POOL_THRESHOLD = 256
+
+
+def variants(color):
+    # color and the six spellings of it with a backslash line continuation after one of its characters
+    return [color] + [color[:i] + '\\\n' + color[i:] for i in range(1, 7)]
+
+
+def iconSteps(color, secondary):
+    # the replacements ResourseGenerator.generate makes for one output color, in order
+    return [(PRIMARY, color), (BLACK, TRANSPARENT), (SECONDARY, secondary), (BLACK, TRANSPARENT)]
+
+
+def replaceSequential(content, steps):
+    # the qt_material algorithm, one str.replace over the whole text per spelling and step
+    for color, replace in steps:
+        for variant in variants(color):
+            content = content.replace(variant, replace)
+    return content
+
+
+class Recolorer(object):
+    """Applies a list of (color, replacement) steps to a text in a single regex pass."""
+    def __init__(self, steps):
+        self.steps = list(steps)
+        patterns = sorted(set(variant for color, replace in self.steps for variant in variants(color)), key=len, reverse=True)
+        self.regex = re.compile('|'.join(re.escape(pattern) for pattern in patterns))
+        # match -> result of every step applied to the match alone
+        self.results = dict((pattern, replaceSequential(pattern, self.steps)) for pattern in patterns)
+        self.singlePass = self.equivalent(patterns)
+
+    def equivalent(self, patterns):
+        # one pass gives the sequential result when matches can not overlap and no replacement can become
+        # the start of a later match together with the text that follows it
+        for pattern in patterns:
+            if '#' in pattern[1:]:
+                return False
+            if any(other != pattern and other.startswith(pattern) for other in patterns):
+                return False
+        for color, replace in self.steps:
+            if not HEX_COLOR.match(replace):
+                return False
+            if any(len(replace) < len(pattern) and pattern.startswith(replace) for pattern in patterns):
+                return False
+        return True
+
+    def apply(self, content):
+        if not self.singlePass:
+            return replaceSequential(content, self.steps)
+        if '#' not in content:
+            return content
+        return self.regex.sub(lambda match: self.results[match.group()], content)
+
+
+_recolorers = None
+
+
+def _start(targets, secondary):
+    # compile the regexes once per worker process
+    global _recolorers
+    _recolorers = [(folder, Recolorer(iconSteps(color, secondary))) for folder, color in targets]
+
+
+def _recolor(source, names):
+    # recolor names below source into every target, returns (written, unchanged)
+    written = unchanged = 0
+    directories = set()
+    for name in names:
+        # text mode like qt_material, so line endings come out the same
+        with open(os.path.join(source, name), 'r') as file:
+            content = file.read()
+        for folder, recolorer in _recolorers:
+            result = recolorer.apply(content)
+            path = os.path.join(folder, name)
+            try:
+                with open(path, 'r') as file:
+                    if file.read() == result:
+                        unchanged += 1
+                        continue
+            except (OSError, UnicodeDecodeError):
+                pass
+            directory = os.path.dirname(path)
+            if directory not in directories:
+                os.makedirs(directory, exist_ok=True)
+                directories.add(directory)
+            # a partly written file differs from its result and is written again by the next run
+            with open(path, 'w') as file:
+                file.write(result)
+            written += 1
+    return written, unchanged
+
+
+def iconNames(source, recursive=False):
+    # svg paths relative to source, the top level only like qt_material unless recursive
+    if not recursive:
+        return sorted(name for name in os.listdir(source) if name.endswith('.svg'))
+    names = []
+    for base, directories, files in os.walk(source):
+        directories.sort()
+        names.extend(os.path.relpath(os.path.join(base, name), source) for name in sorted(files) if name.endswith('.svg'))
+    return names
+
+
+def recolorTree(source, targets, secondary, recursive=False, processes=None, chunk=64):
+    # write every icon of source once per (folder, color) target, files whose content would not change are left alone
+    # returns (written, unchanged)
+    names = iconNames(source, recursive)
+    targets = [(folder, color) for folder, color in targets]
+    if processes == 1 or len(names) < POOL_THRESHOLD:
+        _start(targets, secondary)
+        return _recolor(source, names)
+    chunks = [names[i:i + chunk] for i in range(0, len(names), chunk)]
+    written = unchanged = 0
+    with ProcessPoolExecutor(max_workers=processes, initializer=_start, initargs=(targets, secondary)) as pool:
+        for done in pool.map(_recolor, [source] * len(chunks), chunks):
+            written += done[0]
+            unchanged += done[1]
+    return written, unchanged
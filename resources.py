@@ -2,217 +2,122 @@
 
 # Resource object code
 #
-# Created by: The Resource Compiler for PyQt5 (Qt v5.15.2)
+# Created by: The Resource Compiler for PyQt5 (Qt v5.15.14)
 #
 # WARNING! All changes made in this file will be lost!
 
 from PyQt5 import QtCore
 
 qt_resource_data = b"\
-\x00\x00\x02\x42\
-\x3c\
-\x73\x76\x67\x20\x78\x6d\x6c\x6e\x73\x3d\x22\x68\x74\x74\x70\x3a\
-\x2f\x2f\x77\x77\x77\x2e\x77\x33\x2e\x6f\x72\x67\x2f\x32\x30\x30\
-\x30\x2f\x73\x76\x67\x22\x20\x76\x69\x65\x77\x42\x6f\x78\x3d\x22\
-\x30\x20\x30\x20\x32\x32\x20\x32\x32\x22\x3e\x0a\x20\x20\x3c\x64\
-\x65\x66\x73\x20\x69\x64\x3d\x22\x64\x65\x66\x73\x33\x30\x35\x31\
-\x22\x3e\x0a\x20\x20\x20\x20\x3c\x73\x74\x79\x6c\x65\x20\x74\x79\
-\x70\x65\x3d\x22\x74\x65\x78\x74\x2f\x63\x73\x73\x22\x20\x69\x64\
-\x3d\x22\x63\x75\x72\x72\x65\x6e\x74\x2d\x63\x6f\x6c\x6f\x72\x2d\
-\x73\x63\x68\x65\x6d\x65\x22\x3e\x0a\x20\x20\x20\x20\x20\x20\x2e\
-\x43\x6f\x6c\x6f\x72\x53\x63\x68\x65\x6d\x65\x2d\x54\x65\x78\x74\
-\x20\x7b\x0a\x20\x20\x20\x20\x20\x20\x20\x20\x63\x6f\x6c\x6f\x72\
-\x3a\x23\x65\x66\x66\x30\x66\x31\x3b\x0a\x20\x20\x20\x20\x20\x20\
-\x7d\x0a\x20\x20\x20\x20\x20\x20\x3c\x2f\x73\x74\x79\x6c\x65\x3e\
-\x0a\x20\x20\x3c\x2f\x64\x65\x66\x73\x3e\x0a\x20\x20\x20\x20\x3c\
-\x70\x61\x74\x68\x0a\x20\x20\x20\x20\x20\x20\x20\x73\x74\x79\x6c\
-\x65\x3d\x22\x66\x69\x6c\x6c\x3a\x63\x75\x72\x72\x65\x6e\x74\x43\
-\x6f\x6c\x6f\x72\x22\x0a\x20\x20\x20\x20\x20\x20\x20\x64\x3d\x22\
-\x4d\x20\x33\x20\x33\x20\x4c\x20\x33\x20\x34\x20\x4c\x20\x33\x20\
-\x31\x39\x20\x4c\x20\x34\x20\x31\x39\x20\x4c\x20\x31\x34\x20\x31\
-\x39\x20\x4c\x20\x31\x34\x20\x31\x38\x20\x4c\x20\x34\x20\x31\x38\
-\x20\x4c\x20\x34\x20\x31\x30\x20\x4c\x20\x37\x20\x31\x30\x20\x4c\
-\x20\x37\x20\x31\x30\x20\x4c\x20\x37\x20\x31\x30\x20\x4c\x20\x39\
-\x20\x38\x20\x4c\x20\x31\x38\x20\x38\x20\x4c\x20\x31\x38\x20\x31\
-\x34\x20\x4c\x20\x31\x39\x20\x31\x34\x20\x4c\x20\x31\x39\x20\x35\
-\x20\x4c\x20\x31\x32\x20\x35\x20\x4c\x20\x31\x30\x20\x33\x20\x4c\
-\x20\x31\x30\x20\x33\x20\x4c\x20\x31\x30\x20\x33\x20\x4c\x20\x34\
-\x20\x33\x20\x4c\x20\x33\x20\x33\x20\x7a\x20\x4d\x20\x31\x36\x20\
-\x31\x34\x20\x4c\x20\x31\x36\x20\x31\x36\x20\x4c\x20\x31\x34\x20\
-\x31\x36\x20\x4c\x20\x31\x34\x20\x31\x37\x20\x4c\x20\x31\x36\x20\
-\x31\x37\x20\x4c\x20\x31\x36\x20\x31\x39\x20\x4c\x20\x31\x37\x20\
-\x31\x39\x20\x4c\x20\x31\x37\x20\x31\x37\x20\x4c\x20\x31\x39\x20\
-\x31\x37\x20\x4c\x20\x31\x39\x20\x31\x36\x20\x4c\x20\x31\x37\x20\
-\x31\x36\x20\x4c\x20\x31\x37\x20\x31\x34\x20\x4c\x20\x31\x36\x20\
-\x31\x34\x20\x7a\x20\x22\x0a\x20\x20\x20\x20\x20\x20\x20\x63\x6c\
-\x61\x73\x73\x3d\x22\x43\x6f\x6c\x6f\x72\x53\x63\x68\x65\x6d\x65\
-\x2d\x54\x65\x78\x74\x22\x20\x2f\x3e\x0a\x3c\x2f\x73\x76\x67\x3e\
-\x0a\
-\x00\x00\x03\xcd\
-\x3c\
-\x73\x76\x67\x20\x76\x65\x72\x73\x69\x6f\x6e\x3d\x22\x31\x2e\x31\
-\x22\x20\x76\x69\x65\x77\x42\x6f\x78\x3d\x22\x30\x20\x30\x20\x32\
-\x32\x20\x32\x32\x22\x20\x78\x6d\x6c\x6e\x73\x3d\x22\x68\x74\x74\
-\x70\x3a\x2f\x2f\x77\x77\x77\x2e\x77\x33\x2e\x6f\x72\x67\x2f\x32\
-\x30\x30\x30\x2f\x73\x76\x67\x22\x3e\x0a\x20\x20\x20\x20\x3c\x64\
-\x65\x66\x73\x3e\x0a\x20\x20\x20\x20\x20\x20\x20\x20\x3c\x73\x74\
-\x79\x6c\x65\x20\x74\x79\x70\x65\x3d\x22\x74\x65\x78\x74\x2f\x63\
-\x73\x73\x22\x20\x69\x64\x3d\x22\x63\x75\x72\x72\x65\x6e\x74\x2d\
-\x63\x6f\x6c\x6f\x72\x2d\x73\x63\x68\x65\x6d\x65\x22\x3e\x2e\x43\
-\x6f\x6c\x6f\x72\x53\x63\x68\x65\x6d\x65\x2d\x54\x65\x78\x74\x20\
-\x7b\x0a\x20\x20\x20\x20\x20\x20\x20\x20\x63\x6f\x6c\x6f\x72\x3a\
-\x23\x32\x33\x32\x36\x32\x39\x3b\x0a\x20\x20\x20\x20\x20\x20\x7d\
-\x3c\x2f\x73\x74\x79\x6c\x65\x3e\x0a\x20\x20\x20\x20\x3c\x2f\x64\
-\x65\x66\x73\x3e\x0a\x20\x20\x20\x20\x3c\x70\x61\x74\x68\x20\x63\
-\x6c\x61\x73\x73\x3d\x22\x43\x6f\x6c\x6f\x72\x53\x63\x68\x65\x6d\
-\x65\x2d\x54\x65\x78\x74\x22\x20\x66\x69\x6c\x6c\x3d\x22\x63\x75\
-\x72\x72\x65\x6e\x74\x43\x6f\x6c\x6f\x72\x22\x20\x64\x3d\x22\x6d\
-\x31\x30\x2e\x39\x39\x38\x30\x34\x37\x20\x36\x20\x34\x20\x34\x68\
-\x2d\x32\x76\x35\x68\x2d\x34\x2e\x30\x30\x30\x30\x30\x30\x31\x76\
-\x2d\x35\x68\x2d\x32\x7a\x6d\x35\x2e\x34\x38\x31\x39\x37\x31\x2d\
-\x30\x2e\x34\x39\x34\x35\x39\x31\x33\x2d\x32\x2e\x34\x38\x30\x34\
-\x36\x39\x20\x30\x2e\x32\x39\x38\x38\x32\x39\x20\x30\x2e\x35\x2d\
-\x30\x2e\x38\x36\x37\x31\x38\x38\x63\x2d\x32\x2e\x39\x36\x39\x36\
-\x2d\x31\x2e\x37\x31\x34\x35\x2d\x36\x2e\x37\x33\x36\x34\x30\x39\
-\x35\x2d\x31\x2e\x30\x32\x37\x33\x34\x37\x2d\x38\x2e\x39\x31\x32\
-\x31\x30\x38\x35\x20\x31\x2e\x36\x32\x33\x30\x34\x37\x2d\x32\x2e\
-\x31\x37\x35\x37\x20\x32\x2e\x36\x35\x30\x33\x39\x34\x2d\x32\x2e\
-\x31\x31\x33\x37\x31\x36\x20\x36\x2e\x34\x37\x36\x30\x37\x30\x33\
-\x20\x30\x2e\x31\x34\x36\x34\x38\x34\x20\x39\x2e\x30\x35\x34\x36\
-\x38\x37\x33\x6c\x2d\x30\x2e\x37\x35\x31\x39\x35\x33\x20\x30\x2e\
-\x36\x35\x38\x32\x30\x33\x63\x2d\x32\x2e\x35\x37\x38\x33\x2d\x32\
-\x2e\x39\x34\x31\x34\x37\x35\x2d\x32\x2e\x36\x34\x39\x37\x36\x39\
-\x2d\x37\x2e\x33\x32\x36\x32\x37\x32\x33\x2d\x30\x2e\x31\x36\x37\
-\x39\x36\x39\x2d\x31\x30\x2e\x33\x34\x39\x36\x30\x39\x20\x32\x2e\
-\x34\x38\x31\x38\x2d\x33\x2e\x30\x32\x33\x32\x38\x35\x20\x36\x2e\
-\x37\x39\x38\x30\x34\x36\x35\x2d\x33\x2e\x38\x30\x37\x33\x31\x32\
-\x20\x31\x30\x2e\x31\x38\x35\x35\x34\x36\x2d\x31\x2e\x38\x35\x31\
-\x35\x36\x32\x6c\x30\x2e\x35\x2d\x30\x2e\x38\x36\x35\x32\x33\x35\
-\x7a\x6d\x32\x2e\x35\x31\x37\x35\x37\x38\x20\x35\x2e\x33\x36\x37\
-\x31\x38\x38\x33\x63\x30\x2e\x30\x32\x39\x39\x36\x20\x31\x2e\x38\
-\x34\x31\x37\x37\x35\x2d\x30\x2e\x35\x37\x33\x35\x35\x33\x20\x33\
-\x2e\x36\x39\x33\x34\x31\x2d\x31\x2e\x38\x31\x34\x34\x35\x33\x20\
-\x35\x2e\x32\x30\x35\x30\x37\x38\x2d\x32\x2e\x34\x38\x31\x39\x20\
-\x33\x2e\x30\x32\x33\x32\x38\x34\x2d\x36\x2e\x37\x39\x36\x30\x39\
-\x34\x20\x33\x2e\x38\x30\x37\x33\x31\x32\x2d\x31\x30\x2e\x31\x38\
-\x33\x35\x39\x34\x20\x31\x2e\x38\x35\x31\x35\x36\x32\x6c\x2d\x30\
-\x2e\x35\x20\x30\x2e\x38\x36\x35\x32\x33\x35\x2d\x30\x2e\x39\x38\
-\x32\x34\x32\x32\x2d\x32\x2e\x32\x39\x38\x38\x32\x38\x20\x32\x2e\
-\x34\x38\x32\x34\x32\x32\x2d\x30\x2e\x32\x39\x38\x38\x32\x39\x2d\
-\x30\x2e\x35\x20\x30\x2e\x38\x36\x35\x32\x33\x35\x63\x32\x2e\x39\
-\x36\x39\x35\x39\x39\x35\x20\x31\x2e\x37\x31\x34\x35\x20\x36\x2e\
-\x37\x33\x34\x34\x35\x36\x35\x20\x31\x2e\x30\x32\x39\x32\x39\x39\
-\x20\x38\x2e\x39\x31\x30\x31\x35\x36\x35\x2d\x31\x2e\x36\x32\x31\
-\x30\x39\x34\x73\x32\x2e\x31\x31\x33\x37\x31\x35\x2d\x36\x2e\x34\
-\x37\x36\x30\x37\x30\x33\x2d\x30\x2e\x31\x34\x36\x34\x38\x35\x2d\
-\x39\x2e\x30\x35\x34\x36\x38\x37\x33\x6c\x30\x2e\x37\x35\x31\x39\
-\x35\x33\x2d\x30\x2e\x36\x35\x38\x32\x30\x33\x63\x31\x2e\x32\x38\
-\x39\x31\x35\x20\x31\x2e\x34\x37\x30\x37\x33\x38\x20\x31\x2e\x39\
-\x35\x32\x34\x36\x20\x33\x2e\x33\x30\x32\x37\x35\x35\x20\x31\x2e\
-\x39\x38\x32\x34\x32\x32\x20\x35\x2e\x31\x34\x34\x35\x33\x31\x33\
-\x7a\x22\x2f\x3e\x0a\x3c\x2f\x73\x76\x67\x3e\x0a\
-\x00\x00\x03\xcd\
-\x3c\
-\x73\x76\x67\x20\x76\x65\x72\x73\x69\x6f\x6e\x3d\x22\x31\x2e\x31\
-\x22\x20\x76\x69\x65\x77\x42\x6f\x78\x3d\x22\x30\x20\x30\x20\x32\
-\x32\x20\x32\x32\x22\x20\x78\x6d\x6c\x6e\x73\x3d\x22\x68\x74\x74\
-\x70\x3a\x2f\x2f\x77\x77\x77\x2e\x77\x33\x2e\x6f\x72\x67\x2f\x32\
-\x30\x30\x30\x2f\x73\x76\x67\x22\x3e\x0a\x20\x20\x20\x20\x3c\x64\
-\x65\x66\x73\x3e\x0a\x20\x20\x20\x20\x20\x20\x20\x20\x3c\x73\x74\
-\x79\x6c\x65\x20\x74\x79\x70\x65\x3d\x22\x74\x65\x78\x74\x2f\x63\
-\x73\x73\x22\x20\x69\x64\x3d\x22\x63\x75\x72\x72\x65\x6e\x74\x2d\
-\x63\x6f\x6c\x6f\x72\x2d\x73\x63\x68\x65\x6d\x65\x22\x3e\x2e\x43\
-\x6f\x6c\x6f\x72\x53\x63\x68\x65\x6d\x65\x2d\x54\x65\x78\x74\x20\
-\x7b\x0a\x20\x20\x20\x20\x20\x20\x20\x20\x63\x6f\x6c\x6f\x72\x3a\
-\x23\x65\x66\x66\x30\x66\x31\x3b\x0a\x20\x20\x20\x20\x20\x20\x7d\
-\x3c\x2f\x73\x74\x79\x6c\x65\x3e\x0a\x20\x20\x20\x20\x3c\x2f\x64\
-\x65\x66\x73\x3e\x0a\x20\x20\x20\x20\x3c\x70\x61\x74\x68\x20\x63\
-\x6c\x61\x73\x73\x3d\x22\x43\x6f\x6c\x6f\x72\x53\x63\x68\x65\x6d\
-\x65\x2d\x54\x65\x78\x74\x22\x20\x66\x69\x6c\x6c\x3d\x22\x63\x75\
-\x72\x72\x65\x6e\x74\x43\x6f\x6c\x6f\x72\x22\x20\x64\x3d\x22\x6d\
-\x31\x30\x2e\x39\x39\x38\x30\x34\x37\x20\x36\x20\x34\x20\x34\x68\
-\x2d\x32\x76\x35\x68\x2d\x34\x2e\x30\x30\x30\x30\x30\x30\x31\x76\
-\x2d\x35\x68\x2d\x32\x7a\x6d\x35\x2e\x34\x38\x31\x39\x37\x31\x2d\
-\x30\x2e\x34\x39\x34\x35\x39\x31\x33\x2d\x32\x2e\x34\x38\x30\x34\
-\x36\x39\x20\x30\x2e\x32\x39\x38\x38\x32\x39\x20\x30\x2e\x35\x2d\
-\x30\x2e\x38\x36\x37\x31\x38\x38\x63\x2d\x32\x2e\x39\x36\x39\x36\
-\x2d\x31\x2e\x37\x31\x34\x35\x2d\x36\x2e\x37\x33\x36\x34\x30\x39\
-\x35\x2d\x31\x2e\x30\x32\x37\x33\x34\x37\x2d\x38\x2e\x39\x31\x32\
-\x31\x30\x38\x35\x20\x31\x2e\x36\x32\x33\x30\x34\x37\x2d\x32\x2e\
-\x31\x37\x35\x37\x20\x32\x2e\x36\x35\x30\x33\x39\x34\x2d\x32\x2e\
-\x31\x31\x33\x37\x31\x36\x20\x36\x2e\x34\x37\x36\x30\x37\x30\x33\
-\x20\x30\x2e\x31\x34\x36\x34\x38\x34\x20\x39\x2e\x30\x35\x34\x36\
-\x38\x37\x33\x6c\x2d\x30\x2e\x37\x35\x31\x39\x35\x33\x20\x30\x2e\
-\x36\x35\x38\x32\x30\x33\x63\x2d\x32\x2e\x35\x37\x38\x33\x2d\x32\
-\x2e\x39\x34\x31\x34\x37\x35\x2d\x32\x2e\x36\x34\x39\x37\x36\x39\
-\x2d\x37\x2e\x33\x32\x36\x32\x37\x32\x33\x2d\x30\x2e\x31\x36\x37\
-\x39\x36\x39\x2d\x31\x30\x2e\x33\x34\x39\x36\x30\x39\x20\x32\x2e\
-\x34\x38\x31\x38\x2d\x33\x2e\x30\x32\x33\x32\x38\x35\x20\x36\x2e\
-\x37\x39\x38\x30\x34\x36\x35\x2d\x33\x2e\x38\x30\x37\x33\x31\x32\
-\x20\x31\x30\x2e\x31\x38\x35\x35\x34\x36\x2d\x31\x2e\x38\x35\x31\
-\x35\x36\x32\x6c\x30\x2e\x35\x2d\x30\x2e\x38\x36\x35\x32\x33\x35\
-\x7a\x6d\x32\x2e\x35\x31\x37\x35\x37\x38\x20\x35\x2e\x33\x36\x37\
-\x31\x38\x38\x33\x63\x30\x2e\x30\x32\x39\x39\x36\x20\x31\x2e\x38\
-\x34\x31\x37\x37\x35\x2d\x30\x2e\x35\x37\x33\x35\x35\x33\x20\x33\
-\x2e\x36\x39\x33\x34\x31\x2d\x31\x2e\x38\x31\x34\x34\x35\x33\x20\
-\x35\x2e\x32\x30\x35\x30\x37\x38\x2d\x32\x2e\x34\x38\x31\x39\x20\
-\x33\x2e\x30\x32\x33\x32\x38\x34\x2d\x36\x2e\x37\x39\x36\x30\x39\
-\x34\x20\x33\x2e\x38\x30\x37\x33\x31\x32\x2d\x31\x30\x2e\x31\x38\
-\x33\x35\x39\x34\x20\x31\x2e\x38\x35\x31\x35\x36\x32\x6c\x2d\x30\
-\x2e\x35\x20\x30\x2e\x38\x36\x35\x32\x33\x35\x2d\x30\x2e\x39\x38\
-\x32\x34\x32\x32\x2d\x32\x2e\x32\x39\x38\x38\x32\x38\x20\x32\x2e\
-\x34\x38\x32\x34\x32\x32\x2d\x30\x2e\x32\x39\x38\x38\x32\x39\x2d\
-\x30\x2e\x35\x20\x30\x2e\x38\x36\x35\x32\x33\x35\x63\x32\x2e\x39\
-\x36\x39\x35\x39\x39\x35\x20\x31\x2e\x37\x31\x34\x35\x20\x36\x2e\
-\x37\x33\x34\x34\x35\x36\x35\x20\x31\x2e\x30\x32\x39\x32\x39\x39\
-\x20\x38\x2e\x39\x31\x30\x31\x35\x36\x35\x2d\x31\x2e\x36\x32\x31\
-\x30\x39\x34\x73\x32\x2e\x31\x31\x33\x37\x31\x35\x2d\x36\x2e\x34\
-\x37\x36\x30\x37\x30\x33\x2d\x30\x2e\x31\x34\x36\x34\x38\x35\x2d\
-\x39\x2e\x30\x35\x34\x36\x38\x37\x33\x6c\x30\x2e\x37\x35\x31\x39\
-\x35\x33\x2d\x30\x2e\x36\x35\x38\x32\x30\x33\x63\x31\x2e\x32\x38\
-\x39\x31\x35\x20\x31\x2e\x34\x37\x30\x37\x33\x38\x20\x31\x2e\x39\
-\x35\x32\x34\x36\x20\x33\x2e\x33\x30\x32\x37\x35\x35\x20\x31\x2e\
-\x39\x38\x32\x34\x32\x32\x20\x35\x2e\x31\x34\x34\x35\x33\x31\x33\
-\x7a\x22\x2f\x3e\x0a\x3c\x2f\x73\x76\x67\x3e\x0a\
-\x00\x00\x02\x42\
-\x3c\
-\x73\x76\x67\x20\x78\x6d\x6c\x6e\x73\x3d\x22\x68\x74\x74\x70\x3a\
-\x2f\x2f\x77\x77\x77\x2e\x77\x33\x2e\x6f\x72\x67\x2f\x32\x30\x30\
-\x30\x2f\x73\x76\x67\x22\x20\x76\x69\x65\x77\x42\x6f\x78\x3d\x22\
-\x30\x20\x30\x20\x32\x32\x20\x32\x32\x22\x3e\x0a\x20\x20\x3c\x64\
-\x65\x66\x73\x20\x69\x64\x3d\x22\x64\x65\x66\x73\x33\x30\x35\x31\
-\x22\x3e\x0a\x20\x20\x20\x20\x3c\x73\x74\x79\x6c\x65\x20\x74\x79\
-\x70\x65\x3d\x22\x74\x65\x78\x74\x2f\x63\x73\x73\x22\x20\x69\x64\
-\x3d\x22\x63\x75\x72\x72\x65\x6e\x74\x2d\x63\x6f\x6c\x6f\x72\x2d\
-\x73\x63\x68\x65\x6d\x65\x22\x3e\x0a\x20\x20\x20\x20\x20\x20\x2e\
-\x43\x6f\x6c\x6f\x72\x53\x63\x68\x65\x6d\x65\x2d\x54\x65\x78\x74\
-\x20\x7b\x0a\x20\x20\x20\x20\x20\x20\x20\x20\x63\x6f\x6c\x6f\x72\
-\x3a\x23\x32\x33\x32\x36\x32\x39\x3b\x0a\x20\x20\x20\x20\x20\x20\
-\x7d\x0a\x20\x20\x20\x20\x20\x20\x3c\x2f\x73\x74\x79\x6c\x65\x3e\
-\x0a\x20\x20\x3c\x2f\x64\x65\x66\x73\x3e\x0a\x20\x20\x20\x20\x3c\
-\x70\x61\x74\x68\x0a\x20\x20\x20\x20\x20\x20\x20\x73\x74\x79\x6c\
-\x65\x3d\x22\x66\x69\x6c\x6c\x3a\x63\x75\x72\x72\x65\x6e\x74\x43\
-\x6f\x6c\x6f\x72\x22\x0a\x20\x20\x20\x20\x20\x20\x20\x64\x3d\x22\
-\x4d\x20\x33\x20\x33\x20\x4c\x20\x33\x20\x34\x20\x4c\x20\x33\x20\
-\x31\x39\x20\x4c\x20\x34\x20\x31\x39\x20\x4c\x20\x31\x34\x20\x31\
-\x39\x20\x4c\x20\x31\x34\x20\x31\x38\x20\x4c\x20\x34\x20\x31\x38\
-\x20\x4c\x20\x34\x20\x31\x30\x20\x4c\x20\x37\x20\x31\x30\x20\x4c\
-\x20\x37\x20\x31\x30\x20\x4c\x20\x37\x20\x31\x30\x20\x4c\x20\x39\
-\x20\x38\x20\x4c\x20\x31\x38\x20\x38\x20\x4c\x20\x31\x38\x20\x31\
-\x34\x20\x4c\x20\x31\x39\x20\x31\x34\x20\x4c\x20\x31\x39\x20\x35\
-\x20\x4c\x20\x31\x32\x20\x35\x20\x4c\x20\x31\x30\x20\x33\x20\x4c\
-\x20\x31\x30\x20\x33\x20\x4c\x20\x31\x30\x20\x33\x20\x4c\x20\x34\
-\x20\x33\x20\x4c\x20\x33\x20\x33\x20\x7a\x20\x4d\x20\x31\x36\x20\
-\x31\x34\x20\x4c\x20\x31\x36\x20\x31\x36\x20\x4c\x20\x31\x34\x20\
-\x31\x36\x20\x4c\x20\x31\x34\x20\x31\x37\x20\x4c\x20\x31\x36\x20\
-\x31\x37\x20\x4c\x20\x31\x36\x20\x31\x39\x20\x4c\x20\x31\x37\x20\
-\x31\x39\x20\x4c\x20\x31\x37\x20\x31\x37\x20\x4c\x20\x31\x39\x20\
-\x31\x37\x20\x4c\x20\x31\x39\x20\x31\x36\x20\x4c\x20\x31\x37\x20\
-\x31\x36\x20\x4c\x20\x31\x37\x20\x31\x34\x20\x4c\x20\x31\x36\x20\
-\x31\x34\x20\x7a\x20\x22\x0a\x20\x20\x20\x20\x20\x20\x20\x63\x6c\
-\x61\x73\x73\x3d\x22\x43\x6f\x6c\x6f\x72\x53\x63\x68\x65\x6d\x65\
-\x2d\x54\x65\x78\x74\x22\x20\x2f\x3e\x0a\x3c\x2f\x73\x76\x67\x3e\
-\x0a\
+\x00\x00\x02\x31\
+\x00\
+\x00\x03\xcd\x78\xda\x5d\x53\x41\x72\xdb\x30\x0c\xbc\xe7\x15\x1c\
+\xf5\x4c\x8a\x00\x01\x90\x48\x6d\x1f\xda\x27\xb4\x1f\xc8\x28\x4a\
+\xec\x19\x39\xce\x58\xaa\x9d\xa4\xd3\xbf\x17\x64\xec\x64\x5a\x8d\
+\x0e\x04\x40\x60\x77\xb1\xd2\x6a\x3e\x3d\xba\xd3\x78\x9c\x77\x87\
+\xa7\x75\x07\x01\x3a\x77\xda\x8d\xe7\x6f\x87\x97\x75\x17\x5d\x74\
+\x88\xf6\x76\xee\x65\x3f\x3d\xcd\xeb\x6e\xbb\x2c\xcf\xb7\x7d\x7f\
+\x3e\x9f\xc3\x39\x85\xc3\xf1\xb1\xc7\x18\x63\x6f\x33\xba\xcd\x8d\
+\xb3\x67\x75\x3f\x3e\xcc\xef\xc7\x16\xce\xcb\xeb\x34\xba\xe5\xf5\
+\x79\x5c\x77\xcb\xf8\xb2\xf4\xc3\x3c\x77\x6e\x77\xbf\xee\x86\x5f\
+\xc7\xe3\xf8\xb4\xf8\xe1\x30\x1d\x8e\x7e\x1e\xb6\xe3\x7e\xec\x36\
+\xe1\x7b\x0d\x7f\xb4\xc8\xff\xb4\x06\xf7\xfb\x63\x58\xbb\x79\xfb\
+\x05\x13\x0a\xea\xd7\x4b\xfa\xcf\xaa\x6f\x18\x17\xf8\xfe\x13\x7f\
+\xf5\x7c\xb7\x6c\xdd\x30\xdd\xcd\x46\xfc\xff\xb1\x9d\x7b\xd8\x4d\
+\xd3\x07\x8b\x56\xee\x9c\xd1\xda\x43\x0c\xaa\x25\x52\x76\xe2\xc8\
+\xd1\xd6\xe3\x89\xb7\x9e\x42\x6c\x0f\x9c\xbc\x45\xf8\xb6\xe7\x40\
+\x05\x34\x83\x8f\x81\x94\x58\x21\x79\xb4\x54\x24\x51\x17\x03\x6a\
+\x29\x58\x0f\x6c\xf5\x22\x19\x4a\x19\xac\xae\xa2\xe2\x21\x64\x20\
+\xf6\x12\x72\x12\x8a\xca\x96\x88\x98\x13\x65\x5f\x82\x02\x42\x2c\
+\xec\x20\x08\x26\xe3\x60\x3d\x90\x39\x3b\x0c\xc2\x31\x29\xd5\x18\
+\x52\x06\x71\x12\x28\x4b\xcc\x31\x19\x08\x90\x50\x21\xa7\x21\x32\
+\x49\xc9\x69\x32\xd0\xcc\xa0\x5c\x8b\xc2\x05\x63\xaa\xe8\x9c\x4b\
+\x25\xa9\x04\x94\xd9\x0e\x42\x9a\x45\x7d\x0e\x75\xa1\x19\x93\x75\
+\x81\x64\xe3\xe8\x6d\x07\x89\x54\xa2\xba\xaa\x09\x8a\x4f\x46\x31\
+\xa1\x11\x33\xd6\x75\x39\xc2\x96\x2a\x31\x27\x40\x67\x97\xa1\xb0\
+\x21\x9b\x90\xc2\xc0\x82\xd3\x55\x37\x63\xe2\xb7\xbd\x21\x57\x11\
+\xc5\x71\x48\x6d\x15\x69\x88\x36\x4f\x55\x4c\x67\x21\xc8\xb9\xde\
+\xe6\x9c\xd8\x08\xa7\x20\x9a\x08\xea\x2c\x20\xb2\x04\x07\x8c\x1c\
+\x73\x69\xeb\x05\x75\x17\x2a\x54\x17\x58\x29\x92\xbb\x32\xf1\x8d\
+\x49\x62\x4b\x7d\x30\xa9\x83\xdd\x95\x8a\x05\x5a\x90\x10\x6d\x56\
+\x73\xa8\x34\x7d\x2d\x73\xf5\xec\x9f\x86\xa1\x59\xc6\xaa\xd5\x91\
+\xea\x5a\xd5\x9f\x8c\x96\xd4\x84\x49\x30\x11\xae\xba\x16\x0d\xac\
+\x1a\x29\x66\x9f\xd2\x7c\x71\xa9\x9a\x7c\x71\xc9\x5f\x5c\x62\xff\
+\xe9\xd2\xd5\x24\xff\x61\x12\x04\x2c\x0a\x75\x36\x65\x93\x54\xec\
+\xa0\x8c\x24\x26\x31\xd9\x37\xc2\xb5\xf2\xae\xc0\xd6\xd2\xd6\x03\
+\xe9\xad\xeb\x37\x37\xab\xfa\x0b\x6e\x6e\xfe\x02\x61\xf3\xe0\x8d\
+\
+\x00\x00\x03\x00\
+\x00\
+\x00\x05\xfd\x78\xda\x85\x54\xcd\x72\xdb\x46\x0c\xbe\xe7\x29\x76\
+\xd8\x33\x57\x58\x60\x17\x58\xa4\xb2\x0f\xcd\xbd\x97\xf6\x05\x3c\
+\x0a\x1d\x79\x86\xb2\x3c\x92\x62\x3b\xce\xf4\xdd\xfb\x81\x52\x9d\
+\xb4\xd3\x38\x94\x66\x48\x62\x17\xc0\xf7\x03\xee\xfa\xf8\xf8\x29\
+\x3d\x4e\x87\xe3\xdd\xfe\xfe\x6a\x28\xb9\x0c\xe9\xf1\x6e\x7a\xfa\
+\x6d\xff\x7c\x35\x50\xa2\xc4\x8c\xff\x90\x9e\x77\xf3\xfd\xf1\x6a\
+\xd8\x9e\x4e\x0f\xef\x57\xab\xa7\xa7\xa7\xfc\x24\x79\x7f\xf8\xb4\
+\x62\x22\x5a\xa1\xc6\x70\xfd\x2e\xe1\x5a\x7f\x9c\x6e\x8f\xe7\xc7\
+\xe5\xf5\x78\xfa\x32\x4f\xe9\xf4\xe5\x61\xba\x1a\x4e\xd3\xf3\x69\
+\xb5\x39\x1e\x87\x74\xf7\xf1\x6a\xd8\x7c\x3e\x1c\xa6\xfb\xd3\xb8\
+\xd9\xcf\xfb\xc3\x78\xdc\x6c\xa7\xdd\x34\x5c\xe7\x0f\xf1\xfa\xc7\
+\xf2\x36\xfe\x89\x84\xf4\xf5\xb5\xd8\xb2\xf3\xfd\x2f\x2c\xac\xec\
+\xbf\x5e\xc2\x7f\x5d\xee\xff\x4a\xfc\x7d\xfa\x7c\x3a\xdc\xcc\xff\
+\x9f\x7f\xab\x56\x89\x5e\xf3\xd7\xab\x05\xe3\x05\xfe\xea\x1b\xfe\
+\xf5\xc3\xcd\x69\x9b\x36\xf3\xcd\x11\xc4\xff\x0b\x6b\x48\xb7\x77\
+\xf3\xfc\xca\x62\x59\x1e\x12\x68\xed\x0a\x65\xaf\x22\xcd\x93\x64\
+\xa2\xe2\x4d\xca\x66\xe4\x2c\xe4\x6a\x5d\x12\x65\x2a\xe6\xd2\xfa\
+\x58\x73\x33\xb3\x4e\x9e\x4a\x26\x01\xab\xe2\xa3\xe6\xc2\xdd\x09\
+\xc9\x9c\x9d\x4b\xb7\x86\xd4\xda\x4b\x8f\x62\x2c\x22\x16\xef\x85\
+\x44\x0a\x27\xcb\x95\x7a\x11\x71\x14\x2d\x6a\xae\xbd\x27\x74\x97\
+\xea\x5a\x66\xca\xd6\x96\xe6\x23\x65\x6d\x9d\xa9\x06\x0a\x56\x62\
+\xdc\x9a\x75\x2d\x51\x4a\x18\x4d\x6a\x45\xdf\x4a\x95\x7d\xd9\x5d\
+\xaa\xd6\x88\x79\xa6\x56\xb5\x5b\x01\x96\x62\x4d\xdd\x91\xa0\x8d\
+\xc4\x6b\x6a\xe0\xc8\x8d\xbc\x8e\x92\x01\x0a\xfb\x3c\xf5\xec\x85\
+\x4b\xc4\x4a\x56\x16\x42\x6c\x46\xb9\x06\x74\x5d\x2d\xb8\xa4\xe0\
+\x12\x71\x84\xd9\x7b\xe7\x1e\xfd\xfc\x1c\xe2\x4b\x88\x5f\x73\x1a\
+\x4b\x05\xea\x92\xd9\x08\x7c\x11\x37\x91\x4a\x1a\x0c\xd4\xa8\x8b\
+\x60\x0d\x0a\x90\x89\x43\x4d\x6a\xaa\xb5\x44\x68\xd9\xde\x5e\x76\
+\x8a\x47\x66\x55\xf4\x35\xd6\xa6\xdc\xc6\x7f\x64\x49\x17\x55\x84\
+\x37\x25\x57\x87\x1c\x0d\x36\x18\x39\x66\x23\x08\x43\xec\x5e\x2a\
+\x54\x77\x55\x36\x63\x2c\x42\x34\x54\x4d\x28\x8a\x3e\x40\x71\x83\
+\x45\xa7\xda\xa4\x26\x34\x27\x50\x57\x94\xc5\xaf\x04\x7a\x83\x8d\
+\x1a\x5d\xb8\x6d\xa0\xa9\x8b\x52\x8f\xee\x70\x59\x0d\x71\xd8\x0c\
+\xf7\x80\xb6\xaa\xd4\x25\x60\x06\xba\x21\x03\x35\xb2\xd8\x4b\xec\
+\x0e\xb2\x25\xf7\x5a\xcc\xb4\x86\x93\x2e\x6c\x0c\xd1\xd5\x04\x53\
+\x14\x52\x7b\xe7\xca\x3c\x36\xf8\x06\x2c\xa5\xbe\xec\xe0\x26\x66\
+\x0c\x70\x97\xaa\x65\x31\x33\x10\xc6\x55\x52\xdd\xf2\x63\xdb\x0a\
+\xb6\x83\x43\x2b\x6f\xb3\x68\x0e\x73\x17\x3f\x15\xa2\x3d\x86\xdb\
+\x06\x67\x6d\xcb\xf3\x88\xa2\xe8\x85\x39\x0d\x03\x2d\x26\xaf\x38\
+\x64\xd6\x65\x62\x81\xa9\xc4\x5c\x9e\x3d\x4d\x74\x86\x59\x62\xae\
+\x5f\x43\xe1\xc6\xd9\x65\x78\xd0\x51\x45\x35\x4c\x20\x6f\x5d\x5a\
+\xa0\xe9\x86\x99\x44\x04\xd3\x1e\xdf\x13\x68\x85\x63\x01\xcc\xbc\
+\xe2\xf3\xf8\x31\xf6\x90\x2a\x46\xd0\xa2\x45\xcc\x19\xc7\x1c\x69\
+\x85\x90\x15\xe9\x02\x85\x2d\x66\xb7\x12\x5c\xf2\xa8\x58\x4a\x6b\
+\xd8\x5e\x33\xba\x7b\x0f\xad\xcd\x9c\xdd\xe6\xef\x71\xbe\x0c\xab\
+\x9f\x9c\x0d\xdf\x9d\x3c\x6f\x1c\x11\x9a\x8a\xdc\x84\x72\xb8\xc8\
+\xd2\xb7\xa7\x00\x4f\xa3\x24\x49\x3f\x5c\x4d\x3f\x59\x1d\xdf\x58\
+\x1d\xb1\xba\x70\x58\xc7\x91\x7d\xfd\xee\x6f\x40\xc0\x5c\x79\
+\x00\x00\x01\x24\
+\x00\
+\x00\x02\x42\x78\xda\x6d\x92\x4d\x6e\x83\x30\x10\x85\xf7\x39\xc5\
+\xc8\x5d\x13\x1b\x43\xa0\x50\x60\xd1\x6e\x9b\x55\x7b\x81\x88\x38\
+\x01\x89\x04\x84\xdd\x40\x5a\xf5\xee\x1d\x9b\x71\x7f\xa2\x0a\xc3\
+\x87\x9e\xdf\xcc\x3c\x81\x0b\x7d\x39\xc2\x7c\xea\xce\xba\x64\x8d\
+\x31\x43\xce\xf9\x34\x4d\xeb\x29\x5a\xf7\xe3\x91\x4b\x21\x04\x47\
+\x07\x83\x4b\xab\xa6\xc7\x7e\x2e\x99\x00\x01\x52\xe2\x62\xd5\x0a\
+\xa0\xd8\xab\x83\x86\x76\x5f\x32\xfb\x12\x89\x4d\xe8\x64\xdc\xd0\
+\xe6\xda\x29\x30\xd7\x41\x95\xcc\xa8\xd9\xf0\x5a\x6b\xe6\x9c\xf5\
+\xdb\x38\xaa\xb3\x09\xea\xbe\xeb\xc7\x40\xd7\x8d\x3a\x29\xaa\x02\
+\x58\x3f\x59\xf5\xc5\x89\xc1\x2b\xd6\xc1\x07\xed\x00\xb8\x82\xfc\
+\x4e\x46\x32\x91\xd9\x03\xc9\x9f\xc4\x82\xbb\x89\x2e\x14\xb7\x61\
+\x28\xc7\xb0\x33\x8d\xef\xe0\x1c\x25\x3b\xb4\x5d\x97\x53\x0a\x37\
+\x8e\x79\x03\xa6\xdb\x42\x84\xd7\x33\xde\xb1\x7b\x86\x19\x22\x5e\
+\x10\xfe\xe2\xfd\x22\x13\x04\x22\xfd\x0f\x19\x58\x07\xda\x08\xa1\
+\xed\x8a\x4d\x3c\x37\x16\x72\x81\x70\x83\xff\x22\xa6\x30\x11\xbc\
+\xc3\x16\xc2\x84\x0a\x13\xbb\x96\x20\x9e\x29\xe9\x9e\x2e\x68\xfa\
+\xc3\x94\x06\x7b\x26\xa4\x7b\xfa\xbe\x31\x4e\xfa\xfe\x20\x75\xb7\
+\xd3\x78\x32\x6e\x7f\x0a\x03\x5e\xad\x0a\x7b\x32\xaa\xd5\x17\x26\
+\xdb\x8a\x15\
 "
 
 qt_resource_name = b"\
@@ -220,20 +125,15 @@ qt_resource_name = b"\
 \x00\x6f\xa6\x53\
 \x00\x69\
 \x00\x63\x00\x6f\x00\x6e\x00\x73\
-\x00\x13\
-\x0b\xf4\x0f\xa7\
-\x00\x66\
-\x00\x6f\x00\x6c\x00\x64\x00\x65\x00\x72\x00\x2d\x00\x61\x00\x64\x00\x64\x00\x2d\x00\x64\x00\x61\x00\x72\x00\x6b\x00\x2e\x00\x73\
-\x00\x76\x00\x67\
 \x00\x0f\
 \x03\x55\x23\xc7\
 \x00\x75\
 \x00\x70\x00\x64\x00\x61\x00\x74\x00\x65\x00\x2d\x00\x6e\x00\x6f\x00\x6e\x00\x65\x00\x2e\x00\x73\x00\x76\x00\x67\
-\x00\x14\
-\x08\xe8\xf2\xa7\
+\x00\x11\
+\x05\xc9\x87\x87\
 \x00\x75\
-\x00\x70\x00\x64\x00\x61\x00\x74\x00\x65\x00\x2d\x00\x6e\x00\x6f\x00\x6e\x00\x65\x00\x2d\x00\x64\x00\x61\x00\x72\x00\x6b\x00\x2e\
-\x00\x73\x00\x76\x00\x67\
+\x00\x70\x00\x64\x00\x61\x00\x74\x00\x65\x00\x2d\x00\x6d\x00\x65\x00\x64\x00\x69\x00\x75\x00\x6d\x00\x2e\x00\x73\x00\x76\x00\x67\
+\
 \x00\x0e\
 \x0b\xf2\xcb\xe7\
 \x00\x66\
@@ -242,26 +142,23 @@ qt_resource_name = b"\
 
 qt_resource_struct_v1 = b"\
 \x00\x00\x00\x00\x00\x02\x00\x00\x00\x01\x00\x00\x00\x01\
-\x00\x00\x00\x00\x00\x02\x00\x00\x00\x04\x00\x00\x00\x02\
-\x00\x00\x00\x3c\x00\x00\x00\x00\x00\x01\x00\x00\x02\x46\
-\x00\x00\x00\x60\x00\x00\x00\x00\x00\x01\x00\x00\x06\x17\
-\x00\x00\x00\x8e\x00\x00\x00\x00\x00\x01\x00\x00\x09\xe8\
-\x00\x00\x00\x10\x00\x00\x00\x00\x00\x01\x00\x00\x00\x00\
+\x00\x00\x00\x00\x00\x02\x00\x00\x00\x03\x00\x00\x00\x02\
+\x00\x00\x00\x10\x00\x01\x00\x00\x00\x01\x00\x00\x00\x00\
+\x00\x00\x00\x34\x00\x01\x00\x00\x00\x01\x00\x00\x02\x35\
+\x00\x00\x00\x5c\x00\x01\x00\x00\x00\x01\x00\x00\x05\x39\
 "
 
 qt_resource_struct_v2 = b"\
 \x00\x00\x00\x00\x00\x02\x00\x00\x00\x01\x00\x00\x00\x01\
 \x00\x00\x00\x00\x00\x00\x00\x00\
-\x00\x00\x00\x00\x00\x02\x00\x00\x00\x04\x00\x00\x00\x02\
+\x00\x00\x00\x00\x00\x02\x00\x00\x00\x03\x00\x00\x00\x02\
 \x00\x00\x00\x00\x00\x00\x00\x00\
-\x00\x00\x00\x3c\x00\x00\x00\x00\x00\x01\x00\x00\x02\x46\
-\x00\x00\x01\x7f\xac\xca\x18\x40\
-\x00\x00\x00\x60\x00\x00\x00\x00\x00\x01\x00\x00\x06\x17\
-\x00\x00\x01\x7f\xac\xca\x18\x40\
-\x00\x00\x00\x8e\x00\x00\x00\x00\x00\x01\x00\x00\x09\xe8\
-\x00\x00\x01\x7f\xac\xca\x18\x40\
-\x00\x00\x00\x10\x00\x00\x00\x00\x00\x01\x00\x00\x00\x00\
-\x00\x00\x01\x7f\xac\xca\x18\x40\
+\x00\x00\x00\x10\x00\x01\x00\x00\x00\x01\x00\x00\x00\x00\
+\x00\x00\x01\x7f\xc6\xd5\x1a\x28\
+\x00\x00\x00\x34\x00\x01\x00\x00\x00\x01\x00\x00\x02\x35\
+\x00\x00\x01\x7f\xc6\xd5\x1a\x28\
+\x00\x00\x00\x5c\x00\x01\x00\x00\x00\x01\x00\x00\x05\x39\
+\x00\x00\x01\x7f\xc6\xd5\x1a\x28\
 "
 
 qt_version = [int(v) for v in QtCore.qVersion().split('.')]
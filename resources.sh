@@ -1 +1 @@
-pyrcc5 resources.qrc -o resources.py
\ No newline at end of file
+python build_resources.py "$@"
\ No newline at end of file
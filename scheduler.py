@@ -0,0 +1,237 @@
+import itertools
+import json
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from paths import cacheDir, writeAtomic
+
+# priority classes, lower ones start first
+PRIORITIES = {'user': 0, 'normal': 1, 'background': 2}
+# jobs that may use each resource at once
+LIMITS = {'network': 4, 'disk': 2, 'cpu': max(1, (os.cpu_count() or 2) - 1)}
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+FINISHED = (DONE, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class Job(object):
+    """One unit of work: a registered kind with JSON arguments, its priority class, resource and the jobs it waits for."""
+    def __init__(self, kind, args, priority='normal', resource='cpu', after=(), id=None, sequence=0):
+        self.id = id or uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.args = args
+        self.priority = priority
+        self.resource = resource
+        self.after = list(after)
+        self.sequence = sequence
+        self.state = PENDING
+        self.progress = 0.0
+        self.error = None
+        self.result = None
+        self.cancelled = threading.Event()
+        self.scheduler = None
+
+    def report(self, progress):
+        # called by handlers with 0..1, raises JobCancelled once the job was cancelled so handlers stop there
+        self.progress = max(0.0, min(1.0, progress))
+        if self.scheduler is not None:
+            self.scheduler.changed(self)
+        if self.cancelled.is_set():
+            raise JobCancelled(self.id)
+
+    def toDict(self):
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'args': self.args,
+            'priority': self.priority,
+            'resource': self.resource,
+            'after': self.after,
+            'state': self.state,
+            'progress': self.progress,
+            'error': self.error,
+            'result': self.result,
+        }
+
+
+class JobScheduler(object):
+    """Runs jobs by priority class within per resource limits, after the jobs they depend on, and keeps the queue on disk."""
+    def __init__(self, limits=None, path=None):
+        self.limits = dict(LIMITS, **(limits or {}))
+        self.path = path if path is not None else os.path.join(cacheDir(), 'jobs.json')
+        self.executor = ThreadPoolExecutor(max_workers=sum(self.limits.values()), thread_name_prefix='jobs')
+        self.lock = threading.RLock()
+        # kind -> (handler, resource)
+        self.handlers = {}
+        self.jobs = OrderedDict()
+        self.running = dict((resource, 0) for resource in self.limits)
+        self.sequence = itertools.count()
+        # jobs changed since the last drain by id, the UI takes them in batches
+        self.changes = OrderedDict()
+        self.closed = False
+        self.restored = self.load()
+
+    def register(self, kind, handler, resource='cpu'):
+        # handler(job) runs on a worker and returns a JSON value, it should call job.report now and then
+        with self.lock:
+            self.handlers[kind] = (handler, resource)
+        self.schedule()
+
+    def submit(self, kind, args=None, priority='normal', after=(), resource=None, unique=False):
+        # with unique, an unfinished job of the same kind and arguments is returned instead of adding another
+        if priority not in PRIORITIES:
+            raise ValueError('Unknown priority: %s' % priority)
+        with self.lock:
+            if unique:
+                for job in self.jobs.values():
+                    if job.kind == kind and job.args == (args if args is not None else {}) and job.state not in FINISHED:
+                        return job
+            if resource is None:
+                resource = self.handlers[kind][1] if kind in self.handlers else 'cpu'
+            ids = [job.id if isinstance(job, Job) else job for job in after]
+            job = Job(kind, args if args is not None else {}, priority, resource, ids, sequence=next(self.sequence))
+            job.scheduler = self
+            self.jobs[job.id] = job
+            self.changed(job)
+            self.save()
+        self.schedule()
+        return job
+
+    def chain(self, steps, priority='normal'):
+        # [(kind, args), ...] where every step waits for the one before, returns the jobs
+        jobs = []
+        for kind, args in steps:
+            jobs.append(self.submit(kind, args, priority, after=jobs[-1:]))
+        return jobs
+
+    def cancel(self, id):
+        # a pending job is dropped with the jobs waiting for it, a running one stops at its next report
+        with self.lock:
+            job = self.jobs.get(id)
+            if job is None or job.state in FINISHED:
+                return False
+            job.cancelled.set()
+            if job.state == PENDING:
+                self.finish(job, CANCELLED, error='Cancelled')
+            self.save()
+        self.schedule()
+        return True
+
+    def finish(self, job, state, result=None, error=None):
+        # called with lock held, jobs depending on a job that did not succeed can never run
+        job.state = state
+        job.result = result
+        job.error = error
+        if state == DONE:
+            job.progress = 1.0
+        self.changed(job)
+        if state != DONE:
+            for other in self.jobs.values():
+                if other.state == PENDING and job.id in other.after:
+                    other.cancelled.set()
+                    self.finish(other, CANCELLED, error='%s %s' % (job.kind, state))
+
+    def runnable(self, job):
+        if job.state != PENDING or job.kind not in self.handlers:
+            return False
+        if self.running.get(job.resource, 0) >= self.limits.get(job.resource, 1):
+            return False
+        for id in job.after:
+            other = self.jobs.get(id)
+            if other is not None and other.state != DONE:
+                return False
+        return True
+
+    def schedule(self):
+        # start every job that can run, highest priority class first and in submission order within a class
+        with self.lock:
+            if self.closed:
+                return
+            for job in sorted(self.jobs.values(), key=lambda job: (PRIORITIES[job.priority], job.sequence)):
+                if self.runnable(job):
+                    job.state = RUNNING
+                    self.running[job.resource] = self.running.get(job.resource, 0) + 1
+                    self.changed(job)
+                    self.executor.submit(self.run, job)
+
+    def run(self, job):
+        handler = self.handlers[job.kind][0]
+        try:
+            result = handler(job)
+            state, error = (CANCELLED, 'Cancelled') if job.cancelled.is_set() else (DONE, None)
+        except JobCancelled:
+            result, state, error = None, CANCELLED, 'Cancelled'
+        except Exception as e:
+            result, state, error = None, FAILED, str(e)
+        with self.lock:
+            self.running[job.resource] -= 1
+            if self.closed and state != DONE:
+                # stopped or broken by shutdown, it stays queued for the next launch
+                return
+            self.finish(job, state, result, error)
+            self.save()
+        self.schedule()
+
+    def changed(self, job):
+        with self.lock:
+            self.changes[job.id] = job
+
+    def drainChanges(self):
+        # jobs changed since the last call as dicts, the UI applies them in one go
+        with self.lock:
+            jobs = list(self.changes.values())
+            self.changes.clear()
+            # finished jobs are forgotten once reported, a job waiting on a forgotten one no longer waits
+            for job in jobs:
+                if job.state in FINISHED:
+                    self.jobs.pop(job.id, None)
+            return [job.toDict() for job in jobs]
+
+    def busy(self):
+        with self.lock:
+            return bool(self.changes) or any(job.state in (PENDING, RUNNING) for job in self.jobs.values())
+
+    def save(self):
+        # unfinished jobs only, running ones start again after a restart
+        with self.lock:
+            queue = [dict(job.toDict(), state=PENDING, progress=0.0) for job in self.jobs.values() if job.state not in FINISHED]
+        try:
+            writeAtomic(self.path, json.dumps(queue).encode('utf-8'))
+        except OSError:
+            pass
+
+    def load(self):
+        try:
+            with open(self.path) as file:
+                queue = json.load(file)
+        except (OSError, ValueError):
+            return []
+        restored = []
+        for data in queue:
+            job = Job(data['kind'], data['args'], data['priority'], data['resource'], data['after'], data['id'], next(self.sequence))
+            job.scheduler = self
+            self.jobs[job.id] = job
+            self.changed(job)
+            restored.append(job)
+        return restored
+
+    def shutdown(self):
+        # running jobs are asked to stop and stay in the saved queue
+        with self.lock:
+            self.save()
+            self.closed = True
+            for job in self.jobs.values():
+                if job.state == RUNNING:
+                    job.cancelled.set()
+        self.executor.shutdown(wait=False)
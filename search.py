@@ -0,0 +1,416 @@
+import heapq
+import re
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+from collections import defaultdict
+from operator import itemgetter
+
+WORD = re.compile(r'\w+')
+
+EMPTY = frozenset()
+# prefixes up to this length get their own postings, they would otherwise union most of the vocabulary
+SHORT_PREFIX = 2
+# matches of the searches kept to be narrowed while the query is typed
+RECENT_SEARCHES = 8
+# previous matches checked one by one up to this many, the postings are faster past it
+NARROW_LIMIT = 4096
+
+
+def normalize(text):
+    # lower case words without accents separated by single spaces, so "Écran-Tool" matches "ecran tool"
+    text = text or ''
+    if not text.isascii():
+        text = ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+    return ' '.join(WORD.findall(text.casefold()))
+
+
+def trigrams(text):
+    text = ' %s ' % text
+    return set(text[i:i + 3] for i in range(len(text) - 2))
+
+
+def wordGrams(word):
+    # trigrams inside a query word, the padded ones would only match at word boundaries
+    return set(word[i:i + 3] for i in range(len(word) - 2))
+
+
+class _Field(object):
+    """Word and trigram postings of one text field of the entries."""
+    def __init__(self, grams=True):
+        self.words = {}
+        self.sortedWords = None
+        self.grams = defaultdict(set) if grams else None
+        # short prefix -> ids
+        self.starts = defaultdict(set)
+        # longer prefix -> ids, cleared whenever the field changes
+        self.prefixes = {}
+
+    def add(self, id, text):
+        for word in set(text.split()):
+            ids = self.words.get(word)
+            if ids is None:
+                self.words[word] = ids = set()
+                if self.sortedWords is not None:
+                    insort(self.sortedWords, word)
+            ids.add(id)
+        for prefix in self.shortPrefixes(text):
+            self.starts[prefix].add(id)
+        if self.grams is not None:
+            for gram in trigrams(text):
+                self.grams[gram].add(id)
+        self.prefixes.clear()
+
+    def remove(self, id, text):
+        for word in set(text.split()):
+            ids = self.words.get(word)
+            if ids is not None:
+                ids.discard(id)
+                if not ids:
+                    del self.words[word]
+                    if self.sortedWords is not None:
+                        self.sortedWords.pop(bisect_left(self.sortedWords, word))
+        for prefix in self.shortPrefixes(text):
+            ids = self.starts.get(prefix)
+            if ids is not None:
+                ids.discard(id)
+                if not ids:
+                    del self.starts[prefix]
+        if self.grams is not None:
+            for gram in trigrams(text):
+                ids = self.grams.get(gram)
+                if ids is not None:
+                    ids.discard(id)
+                    if not ids:
+                        del self.grams[gram]
+        self.prefixes.clear()
+
+    def shortPrefixes(self, text):
+        return set(word[:length] for word in text.split() for length in range(1, SHORT_PREFIX + 1))
+
+    def prepare(self):
+        if self.sortedWords is None:
+            self.sortedWords = sorted(self.words)
+
+    def prefixed(self, prefix):
+        # ids with a word starting with prefix
+        if len(prefix) <= SHORT_PREFIX:
+            return self.starts.get(prefix, EMPTY)
+        ids = self.prefixes.get(prefix)
+        if ids is not None:
+            return ids
+        self.prepare()
+        i = bisect_left(self.sortedWords, prefix)
+        j = bisect_left(self.sortedWords, prefix + '\U0010ffff', i)
+        ids = set().union(*[self.words[word] for word in self.sortedWords[i:j]])
+        if len(self.prefixes) > 256:
+            self.prefixes.clear()
+        self.prefixes[prefix] = ids
+        return ids
+
+    def containing(self, word):
+        # ids that may contain word, a superset that has to be checked against the text
+        if self.grams is None or len(word) < 3:
+            return self.prefixed(word)
+        postings = sorted((self.grams.get(gram, EMPTY) for gram in wordGrams(word)), key=len)
+        ids = set(postings[0])
+        for other in postings[1:]:
+            ids &= other
+            if not ids:
+                break
+        return ids
+
+
+class _Matches(object):
+    """Ids whose name, and whose fields together, may contain every word of a query."""
+    def __init__(self, words, names, exactNames=False):
+        self.words = words
+        self.names = names
+        # None until a search needs matches outside the names
+        self.candidates = None
+        # whether the sets were checked against the text, postings of words past a trigram are supersets
+        self.exactNames = exactNames
+        self.exactCandidates = False
+
+    def size(self):
+        return len(self.names) + len(self.candidates or EMPTY)
+
+
+class SearchIndex(object):
+    """Trigram and word prefix index over catalog names, summaries and keywords."""
+    def __init__(self, entries=()):
+        self.lock = threading.RLock()
+        # bumped by every rebuildAsync, only the latest rebuild is swapped in
+        self.generation = 0
+        self.clear()
+        with self.lock:
+            for entry in entries:
+                self.addLocked(entry)
+            self.prepare()
+
+    def clear(self):
+        # id -> (entry, name, keywords, summary) with the texts normalized
+        self.entries = {}
+        self.names = _Field()
+        self.keywords = _Field()
+        # summaries are long, they are only matched at the start of a word
+        self.summaries = _Field(grams=False)
+        # (name, id) in order for whole query name prefixes
+        self.sortedNames = None
+        # (name length, name, id) in result order, with the ids alone for scanning
+        self.ranked = None
+        self.rankedIds = None
+        # query word -> candidate sets of the previous search
+        self.last = {}
+        # _Matches of the latest searches, newest last
+        self.recent = []
+
+    def prepare(self):
+        # sorted lists are built once after a bulk load and kept in order by add and remove after that
+        for field in (self.names, self.keywords, self.summaries):
+            field.prepare()
+        if self.sortedNames is None:
+            self.sortedNames = sorted((item[1], id) for id, item in self.entries.items())
+        if self.ranked is None:
+            self.ranked = sorted((len(item[1]), item[1], id) for id, item in self.entries.items())
+            self.rankedIds = [id for length, name, id in self.ranked]
+
+    def add(self, entry):
+        with self.lock:
+            self.addLocked(entry)
+
+    def addLocked(self, entry):
+        if entry.id in self.entries:
+            self.removeLocked(entry.id)
+        name = normalize(entry.name)
+        keywords = normalize(entry.keywords)
+        summary = normalize(entry.summary)
+        self.entries[entry.id] = (entry, name, keywords, summary)
+        self.names.add(entry.id, name)
+        self.keywords.add(entry.id, keywords)
+        self.summaries.add(entry.id, summary)
+        if self.sortedNames is not None:
+            insort(self.sortedNames, (name, entry.id))
+        if self.ranked is not None:
+            i = bisect_left(self.ranked, (len(name), name, entry.id))
+            self.ranked.insert(i, (len(name), name, entry.id))
+            self.rankedIds.insert(i, entry.id)
+        self.last = {}
+        self.recent = []
+
+    def remove(self, id):
+        with self.lock:
+            self.removeLocked(id)
+
+    def removeLocked(self, id):
+        item = self.entries.pop(id, None)
+        if item is None:
+            return
+        entry, name, keywords, summary = item
+        self.names.remove(id, name)
+        self.keywords.remove(id, keywords)
+        self.summaries.remove(id, summary)
+        if self.sortedNames is not None:
+            self.sortedNames.pop(bisect_left(self.sortedNames, (name, id)))
+        if self.ranked is not None:
+            i = bisect_left(self.ranked, (len(name), name, id))
+            del self.ranked[i]
+            del self.rankedIds[i]
+        self.last = {}
+        self.recent = []
+
+    def update(self, entry):
+        self.add(entry)
+
+    def wordSets(self, word):
+        # [name, keywords, any field] candidates for one query word, kept while typing the words after it
+        sets = self.last.get(word)
+        if sets is None:
+            sets = [self.names.containing(word), self.keywords.containing(word), None]
+        return sets
+
+    def contains(self, text, word):
+        # words shorter than a trigram only match at the start of a word
+        if len(word) < 3:
+            return (' ' + word) in (' ' + text)
+        return word in text
+
+    def wordCheck(self, word):
+        # whether an id has word in its name, keywords or summary, the same match as the postings but exact
+        entries = self.entries
+        start = ' ' + word
+        if len(word) < 3:
+            return lambda id: start in ' ' + entries[id][1] or start in ' ' + entries[id][2] or start in ' ' + entries[id][3]
+        return lambda id: word in entries[id][1] or word in entries[id][2] or start in ' ' + entries[id][3]
+
+    def matching(self, ids, words):
+        # ids with every word in one of their fields, one pass per word keeps the checks in C
+        for word in words:
+            ids = set(filter(self.wordCheck(word), ids))
+        return ids
+
+    def namePrefixed(self, query):
+        i = bisect_left(self.sortedNames, (query,))
+        j = bisect_left(self.sortedNames, (query + '\U0010ffff',), i)
+        return set(map(itemgetter(1), self.sortedNames[i:j]))
+
+    def extends(self, words, previous):
+        # every entry matching words matched previous, each previous word was only typed further
+        # words shorter than a trigram match at the start of a word, so they stop narrowing at the third letter
+        if len(words) < len(previous):
+            return False
+        return all(word.startswith(old) and (len(old) >= 3 or len(word) < 3) for word, old in zip(words, previous))
+
+    def narrowed(self, words):
+        # matches of the smallest recent search words extend, checked against the text of each entry
+        # searches that built their candidates are preferred, building them is the slow part
+        extended = [matches for matches in self.recent if self.extends(words, matches.words)]
+        previous = min(extended, key=lambda matches: (matches.candidates is None, matches.size()), default=None)
+        if previous is None or previous.size() > NARROW_LIMIT:
+            return None
+        # exact sets only need the words that were typed further or added since
+        changed = tuple(word for i, word in enumerate(words) if i >= len(previous.words) or word != previous.words[i])
+        names = previous.names
+        for word in (changed if previous.exactNames else words):
+            names = set(filter(self.nameCheck(word), names))
+        matches = _Matches(words, names, exactNames=True)
+        if previous.candidates is not None:
+            matches.candidates = self.matching(previous.candidates, changed if previous.exactCandidates else words)
+            matches.exactCandidates = True
+        return matches
+
+    def nameCheck(self, word):
+        entries = self.entries
+        if len(word) < 3:
+            start = ' ' + word
+            return lambda id: start in ' ' + entries[id][1]
+        return lambda id: word in entries[id][1]
+
+    def matchesOf(self, words):
+        # _Matches of words, narrowed from a recent search when the query was only typed further
+        matches = self.narrowed(words)
+        if matches is None:
+            sets = [self.wordSets(word) for word in words]
+            self.last = dict(zip(words, sets))
+            names = set(sets[0][0]).intersection(*[names for names, keywords, either in sets[1:]])
+            matches = _Matches(words, names, exactNames=all(len(word) <= 3 for word in words))
+        self.recent = [previous for previous in self.recent if previous.words != words][-(RECENT_SEARCHES - 1):]
+        self.recent.append(matches)
+        return matches
+
+    def candidates(self, matches):
+        # ids with every word in one of their fields, only built when the names did not fill the results
+        if matches.candidates is None:
+            words = matches.words
+            sets = [self.wordSets(word) for word in words]
+            # the word with the fewest name and keyword matches usually has the fewest matches overall
+            first = min(range(len(words)), key=lambda i: len(sets[i][0]) + len(sets[i][1]))
+            candidates = self.either(words[first], sets[first])
+            if len(candidates) <= NARROW_LIMIT:
+                # the other words leave fewer ids to check the first one against, up to a trigram its postings are exact
+                others = words[:first] + words[first + 1:]
+                candidates = self.matching(candidates, others + ((words[first],) if len(words[first]) > 3 else ()))
+                matches.exactCandidates = True
+            else:
+                if len(words) > 1:
+                    candidates = candidates.intersection(*[self.either(word, item) for word, item in zip(words, sets)])
+                matches.exactCandidates = all(len(word) <= 3 for word in words)
+            matches.candidates = candidates
+        return matches.candidates
+
+    def either(self, word, item):
+        if item[2] is None:
+            item[2] = item[0] | item[1] | self.summaries.prefixed(word)
+        return item[2]
+
+    def tiers(self, query, words, matches):
+        # (ids, check) per kind of match from best to worst, check makes the supersets from the postings exact
+        # later tiers are only built when the earlier ones did not fill the results
+        entries = self.entries
+        yield self.namePrefixed(query), None
+        yield matches.names, lambda id: (' ' + query) in (' ' + entries[id][1])
+        yield matches.names, None if matches.exactNames else lambda id: all(self.contains(entries[id][1], word) for word in words)
+        candidates = self.candidates(matches)
+        if matches.exactCandidates:
+            yield candidates, lambda id: any(self.contains(entries[id][2], word) for word in words)
+            yield candidates, None
+        else:
+            checks = [self.wordCheck(word) for word in words]
+            yield candidates, lambda id: all(check(id) for check in checks) and any(self.contains(entries[id][2], word) for word in words)
+            yield candidates, lambda id: all(check(id) for check in checks)
+
+    def ordered(self, ids):
+        # ids with the shortest names first, lazily for large sets
+        if len(ids) * 64 > len(self.rankedIds):
+            # scanning the ranking runs in C and stops as soon as enough results were found
+            return filter(ids.__contains__, self.rankedIds)
+        entries = self.entries
+        return sorted(ids, key=lambda id: (len(entries[id][1]), entries[id][1], id))
+
+    def fuzzy(self, query, exclude, limit):
+        # ids sharing most trigrams with query, for typos and transpositions
+        grams = wordGrams(query.replace(' ', ''))
+        if not grams:
+            return []
+        counts = {}
+        common = len(self.entries) // 4
+        for field in (self.names, self.keywords):
+            for gram in grams:
+                ids = field.grams.get(gram, EMPTY)
+                # very common trigrams say little about a typo and cost the most to count
+                if len(ids) > common:
+                    continue
+                for id in ids:
+                    counts[id] = counts.get(id, 0) + 1
+        needed = max(1, int(len(grams) * 0.6))
+        best = heapq.nlargest(limit, ((count, id) for id, count in counts.items() if count >= needed and id not in exclude))
+        return [id for count, id in best]
+
+    def search(self, query, limit=200, fuzzy=True):
+        # ranked entries for query, best first
+        query = normalize(query)
+        if not query:
+            return []
+        words = query.split()
+        with self.lock:
+            self.prepare()
+            matches = self.matchesOf(tuple(words))
+            results = []
+            seen = set()
+            for ids, check in self.tiers(query, words, matches):
+                for id in self.ordered(ids):
+                    if id not in seen and (check is None or check(id)):
+                        results.append(id)
+                        seen.add(id)
+                        if len(results) == limit:
+                            return [self.entries[id][0] for id in results]
+            if fuzzy and len(query) >= 3:
+                results.extend(self.fuzzy(query, seen, limit - len(results)))
+            return [self.entries[id][0] for id in results]
+
+    def rebuildAsync(self, entries, callback=None):
+        # build a fresh index on a worker thread and swap it in when done, searches keep using the old one meanwhile
+        # callback gets the index and the generation of the rebuild, a rebuild overtaken by a later one is dropped
+        with self.lock:
+            self.generation += 1
+            generation = self.generation
+
+        def build():
+            index = SearchIndex(entries)
+            with self.lock:
+                if generation != self.generation:
+                    return
+                self.entries = index.entries
+                self.names = index.names
+                self.keywords = index.keywords
+                self.summaries = index.summaries
+                self.sortedNames = index.sortedNames
+                self.ranked = index.ranked
+                self.rankedIds = index.rankedIds
+                self.last = {}
+                self.recent = []
+            if callback is not None:
+                callback(self, generation)
+        thread = threading.Thread(target=build, name='search-index', daemon=True)
+        thread.start()
+        return thread
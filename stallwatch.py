@@ -0,0 +1,146 @@
+import logging
+import logging.handlers
+import os
+import sys
+import threading
+import time
+import traceback
+
+from PyQt5.QtCore import *
+
+from paths import cacheDir
+
+# a heartbeat later than this counts as a stall
+THRESHOLD = 0.25
+# how often the event loop beats, the monitor thread looks twice per beat
+INTERVAL = 0.05
+# innermost frames that make up the signature stalls are grouped by
+SIGNATURE_DEPTH = 8
+LOG_SIZE = 1024 * 1024
+LOG_BACKUPS = 3
+
+
+def stackSignature(frames):
+    # files and functions only, a busy loop is at a different line on every sample
+    return tuple((frame.filename, frame.name) for frame in frames[-SIGNATURE_DEPTH:])
+
+
+class Stall(object):
+    """How often the GUI thread stalled at one signature, for how long, and the last stack seen there."""
+    def __init__(self, frames):
+        self.frames = frames
+        self.count = 0
+        self.total = 0.0
+        self.longest = 0.0
+
+    def add(self, frames, duration):
+        self.frames = frames
+        self.count += 1
+        self.total += duration
+        self.longest = max(self.longest, duration)
+
+
+class Watchdog(QObject):
+    """Heartbeat on the Qt event loop watched from a background thread, records the stack of every stall."""
+    def __init__(self, threshold=THRESHOLD, interval=INTERVAL, path=None, parent=None):
+        super(Watchdog, self).__init__(parent)
+        self.threshold = threshold
+        self.interval = interval
+        # created on the GUI thread, that is the thread being watched
+        self.thread = threading.get_ident()
+        self.beat = time.monotonic()
+        self.stalls = {}
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.monitor = None
+        self.timer = QTimer(self)
+        self.timer.setInterval(max(1, int(interval * 1000)))
+        self.timer.timeout.connect(self.heartbeat)
+        self.path = path or os.path.join(cacheDir('logs'), 'watchdog.log')
+        self.logger = logging.getLogger('quaternion.watchdog')
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+        self.handler = logging.handlers.RotatingFileHandler(self.path, maxBytes=LOG_SIZE, backupCount=LOG_BACKUPS, delay=True)
+        self.handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+        self.logger.addHandler(self.handler)
+
+    def start(self):
+        self.beat = time.monotonic()
+        self.timer.start()
+        self.stopped.clear()
+        self.monitor = threading.Thread(target=self.watch, name='stallwatch', daemon=True)
+        self.monitor.start()
+
+    def stop(self):
+        self.timer.stop()
+        self.stopped.set()
+        if self.monitor is not None:
+            self.monitor.join()
+            self.monitor = None
+        self.logger.removeHandler(self.handler)
+        self.handler.close()
+
+    def heartbeat(self):
+        self.beat = time.monotonic()
+
+    def sample(self):
+        # the GUI thread's stack as it is right now
+        frame = sys._current_frames().get(self.thread)
+        return traceback.extract_stack(frame) if frame is not None else []
+
+    def watch(self):
+        # runs on the monitor thread: [beat the stall started after, stack when it was noticed] while stalled
+        stalled = None
+        last = time.monotonic()
+        cpu = time.process_time()
+        while not self.stopped.wait(self.interval / 2):
+            now = time.monotonic()
+            beat = self.beat
+            clock = time.process_time()
+            used, cpu = clock - cpu, clock
+            if now - last > self.threshold and used < (now - last) / 2:
+                # the monitor did not run and neither did anything else, the process was suspended or stopped in a debugger
+                # a GUI thread holding the GIL in a long C call keeps the monitor out too, but it uses the CPU meanwhile
+                self.logger.info('Watchdog did not run for %d ms, process suspended', (now - last) * 1000)
+                last = now
+                stalled = None
+                continue
+            last = now
+            if stalled is None:
+                if now - beat - self.interval > self.threshold:
+                    stalled = [beat, self.sample()]
+                    self.logger.warning('GUI thread stalled for more than %d ms at\n%s', self.threshold * 1000, ''.join(traceback.format_list(stalled[1])))
+            elif beat != stalled[0]:
+                # the event loop ran again
+                self.record(stalled[1], beat - stalled[0] - self.interval)
+                stalled = None
+
+    def record(self, frames, duration):
+        signature = stackSignature(frames)
+        with self.lock:
+            stall = self.stalls.get(signature)
+            if stall is None:
+                stall = self.stalls[signature] = Stall(frames)
+            stall.add(frames, duration)
+        self.logger.warning('GUI thread stalled for %d ms (%d times, %d ms in total at this stack)', duration * 1000, stall.count, stall.total * 1000)
+
+    def summary(self, limit=5):
+        # the signatures that stalled the longest in total, for the crash dialog and issue reports
+        with self.lock:
+            stalls = sorted(self.stalls.values(), key=lambda stall: stall.total, reverse=True)
+        if not stalls:
+            return 'No GUI stalls recorded.'
+        lines = ['GUI stalls, %d signatures, log at %s' % (len(stalls), self.path)]
+        for stall in stalls[:limit]:
+            lines.append('')
+            lines.append('%d stalls, %d ms in total, %d ms at most, last at:' % (stall.count, stall.total * 1000, stall.longest * 1000))
+            lines.append(''.join(traceback.format_list(stall.frames[-SIGNATURE_DEPTH:])).rstrip())
+        return '\n'.join(lines)
+
+
+def parseThreshold(value):
+    # threshold in seconds from a number of milliseconds, the default when empty or not a number
+    try:
+        return float(value) / 1000 if value else THRESHOLD
+    except ValueError:
+        return THRESHOLD
@@ -0,0 +1,108 @@
+import builtins
+import json
+import sys
+import threading
+import time
+
+
+class StartupProfiler(object):
+    """Times module imports and startup phases up to the first paint of the main window."""
+    def __init__(self, output='startup-profile.json'):
+        self.output = output
+        self.started = time.perf_counter()
+        # module name -> [inclusive seconds, self seconds]
+        self.imports = {}
+        self.phases = {}
+        self.marks = {}
+        self.stack = []
+        self.thread = threading.get_ident()
+        self._import = builtins.__import__
+        builtins.__import__ = self.timedImport
+
+    def timedImport(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # only first imports on the main thread are timed, everything else is passed straight through
+        if level or name in sys.modules or threading.get_ident() != self.thread:
+            return self._import(name, globals, locals, fromlist, level)
+        self.stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self._import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = self.stack.pop()
+            if self.stack:
+                self.stack[-1] += elapsed
+            entry = self.imports.setdefault(name, [0.0, 0.0])
+            entry[0] += elapsed
+            entry[1] += elapsed - nested
+
+    def stopImports(self):
+        if builtins.__import__ == self.timedImport:
+            builtins.__import__ = self._import
+
+    def mark(self, name):
+        # time since the profiler was created
+        self.marks[name] = time.perf_counter() - self.started
+
+    def phase(self, name):
+        return _Phase(self, name)
+
+    def watch(self, window, finished=None):
+        # record the first paint of window and the first expose of its native window
+        from PyQt5.QtCore import QObject, QEvent
+
+        profiler = self
+
+        class FirstPaint(QObject):
+            def eventFilter(self, obj, event):
+                if event.type() == QEvent.Expose and 'first expose' not in profiler.marks:
+                    profiler.mark('first expose')
+                if event.type() == QEvent.Paint and obj is window and 'first paint' not in profiler.marks:
+                    profiler.mark('first paint')
+                    window.removeEventFilter(self)
+                    if finished is not None:
+                        finished()
+                return False
+
+        self.filter = FirstPaint(window)
+        window.installEventFilter(self.filter)
+        if window.windowHandle() is not None:
+            window.windowHandle().installEventFilter(self.filter)
+
+    def results(self):
+        imports = sorted(self.imports.items(), key=lambda item: item[1][1], reverse=True)
+        return {
+            'timestamp': time.time(),
+            'python': sys.version.split()[0],
+            'phases_ms': dict((name, elapsed * 1000) for name, elapsed in self.phases.items()),
+            'marks_ms': dict((name, elapsed * 1000) for name, elapsed in self.marks.items()),
+            'imports_ms': [{'module': name, 'inclusive': inclusive * 1000, 'self': own * 1000} for name, (inclusive, own) in imports],
+        }
+
+    def report(self, limit=15):
+        results = self.results()
+        with open(self.output, 'w') as file:
+            json.dump(results, file, indent=2)
+        print('startup profile written to %s' % self.output)
+        for name, elapsed in results['phases_ms'].items():
+            print('  %-24s %9.2f ms' % (name, elapsed))
+        for name, elapsed in results['marks_ms'].items():
+            print('  %-24s %9.2f ms since start' % (name, elapsed))
+        print('  slowest imports (self time):')
+        for entry in results['imports_ms'][:limit]:
+            print('    %-22s %9.2f ms  (%.2f ms inclusive)' % (entry['module'], entry['self'], entry['inclusive']))
+        return results
+
+
+class _Phase(object):
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.phases[self.name] = time.perf_counter() - self.start
+        return False
@@ -0,0 +1,79 @@
+from PyQt5.QtCore import *
+from PyQt5.QtWidgets import *
+from PyQt5.QtGui import *
+
+TEMPLATE = '''
+QSplitter#splitter::handle { background-color: %(window)s; }
+QPushButton#expand_button { margin: 0px; border: none; background-color: %(window)s; color: %(text)s; }
+QPushButton#expand_button:checked { background-color: %(highlight)s; }
+QPushButton#expand_button[darkText="true"] { color: #000000; }
+QPushButton#expand_button[darkText="false"] { color: #ffffff; }
+QProgressBar#progress { background-color: %(highlight)s; }
+'''
+
+ACCENT_TEMPLATE = '''
+QPushButton#expand_button[nav="accent"][accent="%(accent)s"] { background-color: %(accent)s; }
+QPushButton#expand_button[nav="accent"][accent="%(accent)s"]:checked { background-color: %(accent)s; }
+'''
+
+
+class StyleSheet(object):
+    """One palette-derived application stylesheet, variants are picked with dynamic properties."""
+    def __init__(self):
+        self.accents = []
+        self.key = None
+        # a stylesheet someone else set on the application first, such as a qt_material theme, the rules here go after it
+        self.base = ''
+        # what apply last set, anything else found on the application is a new base
+        self.applied = None
+
+    def build(self, palette):
+        colours = {
+            'window': palette.color(QPalette.Window).name(),
+            'text': palette.color(QPalette.WindowText).name(),
+            'highlight': palette.color(QPalette.Highlight).name(),
+        }
+        return TEMPLATE % colours + ''.join(ACCENT_TEMPLATE % {'accent': accent} for accent in self.accents)
+
+    def apply(self, force=False):
+        # only regenerate the stylesheet when the theme or the set of accents changed
+        app = QApplication.instance()
+        current = app.styleSheet()
+        if current != self.applied:
+            self.base = current
+        palette = app.palette()
+        key = (palette.cacheKey(), tuple(self.accents), self.base)
+        if key == self.key and not force:
+            return
+        self.key = key
+        self.applied = self.base + self.build(palette)
+        app.setStyleSheet(self.applied)
+
+    def addAccent(self, colour):
+        # accent colours get their own rules, so a new one needs the stylesheet rebuilt
+        colour = QColor(colour).name()
+        if colour not in self.accents:
+            self.accents.append(colour)
+            if self.key is not None:
+                self.apply(force=True)
+        return colour
+
+
+def setStyleProperty(widget, name, value):
+    # change a dynamic property and re-polish only that widget
+    if widget.property(name) == value:
+        return
+    widget.setProperty(name, value)
+    widget.style().unpolish(widget)
+    widget.style().polish(widget)
+
+
+_styleSheet = None
+
+
+def styleSheet():
+    # one stylesheet shared by the whole application
+    global _styleSheet
+    if _styleSheet is None:
+        _styleSheet = StyleSheet()
+    return _styleSheet
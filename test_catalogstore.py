@@ -0,0 +1,40 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from catalogstore import CatalogClosed, CatalogStore
+
+
+class CatalogStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.store = CatalogStore(os.path.join(self.directory, 'catalog.sqlite'))
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def testApply(self):
+        self.store.apply('apps', {'revision': 1, 'full': True, 'entries': [{'id': 'clock', 'name': 'Clock', 'description': 'Shows the time'}, {'id': 'notes', 'name': 'Notes'}]})
+        self.store.apply('apps', {'revision': 2, 'entries': [{'id': 'clock', 'name': 'Analog Clock'}], 'removed': ['notes']})
+        self.assertEqual([(entry.id, entry.name) for entry in self.store.load('apps')], [('clock', 'Analog Clock')])
+        self.assertEqual(self.store.revision('apps'), 2)
+        self.assertIsNone(self.store.details('apps', 'notes'))
+
+    def testClosedStore(self):
+        # catalog threads still reading the store as the window closes get CatalogClosed, not a sqlite error
+        self.store.close()
+        self.store.close()
+        with self.assertRaises(CatalogClosed):
+            self.store.load('apps')
+        with self.assertRaises(CatalogClosed):
+            self.store.details('apps', 'clock')
+        with self.assertRaises(CatalogClosed):
+            self.store.revision('apps')
+        with self.assertRaises(CatalogClosed):
+            self.store.apply('apps', {'revision': 1, 'entries': []})
+
+
+if __name__ == '__main__':
+    unittest.main()
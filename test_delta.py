@@ -0,0 +1,124 @@
+import functools
+import hashlib
+import http.server
+import os
+import shutil
+import socketserver
+import tempfile
+import threading
+import unittest
+
+import requests
+
+from delta import DeltaError, applyDelta, makeDelta, updateFile
+from downloads import DownloadManager
+from scheduler import JobCancelled
+
+
+class Server(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+
+
+class Handler(http.server.SimpleHTTPRequestHandler):
+    """Serves a directory and counts the requests per path."""
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests.append(self.path)
+        super(Handler, self).do_GET()
+
+    def log_message(self, *args):
+        pass
+
+
+class DeltaTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.served = os.path.join(self.directory, 'served')
+        os.makedirs(self.served)
+        self.old = os.path.join(self.directory, 'old')
+        self.new = os.path.join(self.served, 'new')
+        data = os.urandom(512 * 1024)
+        with open(self.old, 'wb') as file:
+            file.write(data)
+        with open(self.new, 'wb') as file:
+            file.write(data[:1000] + b'inserted' * 50 + data[1000:300000] + os.urandom(4096) + data[300000:])
+        with open(self.new, 'rb') as file:
+            self.sha256 = hashlib.sha256(file.read()).hexdigest()
+        makeDelta(self.old, self.new, os.path.join(self.served, 'new.qdelta'))
+        self.server = Server(('127.0.0.1', 0), functools.partial(Handler, directory=self.served))
+        self.server.lock = threading.Lock()
+        self.server.requests = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        base = 'http://127.0.0.1:%d/' % self.server.server_address[1]
+        self.package = {'url': base + 'new', 'sha256': self.sha256, 'deltas': {'1': {'url': base + 'new.qdelta'}}}
+        self.manager = DownloadManager(requests.Session())
+        self.output = os.path.join(self.directory, 'output')
+
+    def tearDown(self):
+        self.manager.shutdown()
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def hash(self, path):
+        with open(path, 'rb') as file:
+            return hashlib.sha256(file.read()).hexdigest()
+
+    def testDeltaRebuildsTarget(self):
+        path, method, transferred = updateFile(self.manager, self.package, '1', self.old, self.output)
+        self.assertEqual(method, 'delta')
+        self.assertEqual(self.hash(path), self.sha256)
+        self.assertLess(transferred, 64 * 1024)
+
+    def testCorruptPatchIsNotApplied(self):
+        with open(os.path.join(self.served, 'new.qdelta'), 'rb') as file:
+            data = bytearray(file.read())
+        data[-20] ^= 0xff
+        with open(os.path.join(self.served, 'new.qdelta'), 'wb') as file:
+            file.write(data)
+        with open(os.path.join(self.served, 'new.qdelta'), 'rb') as stream:
+            with self.assertRaises(DeltaError):
+                applyDelta(self.old, stream, self.output)
+        self.assertFalse(os.path.exists(self.output))
+        self.assertFalse(os.path.exists(self.output + '.part'))
+        path, method, transferred = updateFile(self.manager, self.package, '1', self.old, self.output)
+        self.assertEqual(method, 'full')
+        self.assertEqual(self.hash(path), self.sha256)
+
+    def testOtherSourceOfTheSameSize(self):
+        with open(self.old, 'r+b') as file:
+            file.seek(4096)
+            data = file.read(1)
+            file.seek(4096)
+            file.write(bytes([data[0] ^ 0xff]))
+        with open(os.path.join(self.served, 'new.qdelta'), 'rb') as stream:
+            with self.assertRaisesRegex(DeltaError, 'another version'):
+                applyDelta(self.old, stream, self.output)
+        self.assertFalse(os.path.exists(self.output + '.part'))
+        path, method, transferred = updateFile(self.manager, self.package, '1', self.old, self.output)
+        self.assertEqual(method, 'full')
+        self.assertEqual(self.hash(path), self.sha256)
+
+    def testCancelWhilePatching(self):
+        def cancel(progress):
+            raise JobCancelled('update')
+        with self.assertRaises(JobCancelled):
+            updateFile(self.manager, self.package, '1', self.old, self.output, cancel)
+        # no full download was started in its place
+        self.assertNotIn('/new', self.server.requests)
+        self.assertFalse(os.path.exists(self.output))
+
+    def testCancelDuringFullDownload(self):
+        reports = []
+
+        def cancel(progress):
+            reports.append(progress)
+            raise JobCancelled('update')
+        with self.assertRaises(JobCancelled):
+            updateFile(self.manager, self.package, '0', self.old, self.output, cancel)
+        self.assertEqual(len(reports), 1)
+        self.assertFalse(os.path.exists(self.output))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,184 @@
+import hashlib
+import http.server
+import os
+import shutil
+import socketserver
+import tempfile
+import threading
+import time
+import unittest
+
+import requests
+
+import downloads
+from downloads import DownloadError, DownloadManager
+
+
+class Server(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    """Serves server.files with Range support unless server.ranges is off, paths in server.failing answer ranges from 0 with 500."""
+    def do_HEAD(self):
+        self.respond(False)
+
+    def do_GET(self):
+        self.respond(True)
+
+    def respond(self, body):
+        server = self.server
+        data = server.files.get(self.path)
+        if data is None:
+            self.send_error(404)
+            return
+        start, end = 0, len(data)
+        header = self.headers.get('Range')
+        if body and header and server.ranges:
+            first, last = header.split('=', 1)[1].split('-')
+            start, end = int(first), int(last) + 1
+            if start == 0 and self.path in server.failing:
+                self.send_error(500)
+                return
+        self.send_response(206 if start or end < len(data) else 200)
+        self.send_header('Content-Length', str(end - start))
+        self.send_header('ETag', '"%s"' % hashlib.md5(data).hexdigest())
+        if server.ranges:
+            self.send_header('Accept-Ranges', 'bytes')
+        if start or end < len(data):
+            self.send_header('Content-Range', 'bytes %d-%d/%d' % (start, end - 1, len(data)))
+        self.end_headers()
+        if not body:
+            return
+        try:
+            for position in range(start, end, 16 * 1024):
+                piece = data[position:min(position + 16 * 1024, end)]
+                self.wfile.write(piece)
+                with server.lock:
+                    server.sent += len(piece)
+                time.sleep(server.delay)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+class DownloadManagerTest(unittest.TestCase):
+    def setUp(self):
+        self.minChunk = downloads.MIN_CHUNK
+        downloads.MIN_CHUNK = 128 * 1024
+        self.data = os.urandom(1024 * 1024)
+        self.server = Server(('127.0.0.1', 0), Handler)
+        self.server.files = {'/file': self.data, '/fail': self.data}
+        self.server.failing = set(['/fail'])
+        self.server.ranges = True
+        self.server.delay = 0
+        self.server.sent = 0
+        self.server.lock = threading.Lock()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = 'http://127.0.0.1:%d' % self.server.server_address[1]
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'file')
+        self.manager = DownloadManager(requests.Session(), saveInterval=0)
+
+    def tearDown(self):
+        self.manager.shutdown()
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+        downloads.MIN_CHUNK = self.minChunk
+
+    def read(self, path):
+        with open(path, 'rb') as file:
+            return file.read()
+
+    def waitFor(self, condition, timeout=10):
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def testFullDownload(self):
+        future = self.manager.download(self.base + '/file', self.path, hashlib.sha256(self.data).hexdigest())
+        self.assertEqual(future.result(10), self.path)
+        self.assertEqual(self.read(self.path), self.data)
+        self.assertEqual(len(future.download.chunks), 4)
+        self.assertFalse(os.path.exists(self.path + '.part'))
+        self.assertFalse(os.path.exists(self.path + '.part.json'))
+        downloaded, total, rate, eta = self.manager.progress()
+        self.assertEqual((downloaded, total), (len(self.data), len(self.data)))
+
+    def testCancelAndResume(self):
+        self.server.delay = 0.02
+        future = self.manager.download(self.base + '/file', self.path)
+        self.waitFor(lambda: future.download.downloaded > 256 * 1024)
+        future.download.cancel()
+        with self.assertRaises(DownloadError):
+            future.result(10)
+        self.assertTrue(os.path.exists(self.path + '.part.json'))
+        first = self.server.sent
+        self.server.delay = 0
+        future = self.manager.download(self.base + '/file', self.path)
+        future.result(10)
+        self.assertEqual(self.read(self.path), self.data)
+        # only what was missing is fetched again
+        self.assertLess(self.server.sent - first, len(self.data))
+
+    def testHashMismatch(self):
+        future = self.manager.download(self.base + '/file', self.path, '0' * 64)
+        with self.assertRaises(DownloadError):
+            future.result(10)
+        self.assertFalse(os.path.exists(self.path))
+        self.assertFalse(os.path.exists(self.path + '.part'))
+        self.assertFalse(os.path.exists(self.path + '.part.json'))
+
+    def testServerWithoutRanges(self):
+        # a partial download from a range capable mirror, then the server stops accepting ranges
+        self.server.delay = 0.02
+        future = self.manager.download(self.base + '/file', self.path)
+        self.waitFor(lambda: future.download.downloaded > 256 * 1024)
+        future.download.cancel()
+        with self.assertRaises(DownloadError):
+            future.result(10)
+        self.server.ranges = False
+        self.server.delay = 0
+        for attempt in range(2):
+            future = self.manager.download(self.base + '/file', self.path)
+            self.assertEqual(future.result(10), self.path)
+            self.assertEqual(len(future.download.chunks), 1)
+            self.assertEqual(self.read(self.path), self.data)
+
+    def testFailingChunk(self):
+        self.server.delay = 0.01
+        future = self.manager.download(self.base + '/fail', self.path)
+        with self.assertRaises(requests.HTTPError):
+            future.result(10)
+        # the other connections stopped before the file was closed, a file opened now gets none of their data
+        other = os.path.join(self.directory, 'other')
+        with open(other, 'wb') as file:
+            file.write(b'unrelated')
+            time.sleep(0.3)
+        self.assertEqual(self.read(other), b'unrelated')
+        self.assertTrue(os.path.exists(self.path + '.part.json'))
+
+    def testProgressAfterFailure(self):
+        future = self.manager.download(self.base + '/file', self.path, '0' * 64)
+        with self.assertRaises(DownloadError):
+            future.result(10)
+        future = self.manager.download(self.base + '/file', self.path)
+        future.result(10)
+        downloaded, total, rate, eta = self.manager.progress()
+        self.assertEqual(downloaded, total)
+        self.assertEqual(total, len(self.data))
+
+    def testConcurrentStateSaves(self):
+        paths = [os.path.join(self.directory, 'file%d' % i) for i in range(5)]
+        futures = [self.manager.download(self.base + '/file', path) for path in paths]
+        for path, future in zip(paths, futures):
+            self.assertEqual(future.result(10), path)
+            self.assertEqual(self.read(path), self.data)
+        self.assertEqual([name for name in os.listdir(self.directory) if name.endswith('.tmp')], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+import email.utils
+import hashlib
+import http.server
+import os
+import shutil
+import socketserver
+import tempfile
+import threading
+import time
+import unittest
+
+import requests
+
+from mediacache import MediaCache, freshFor
+
+
+class Server(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    """Serves server.files with an ETag and server.control as Cache-Control, answers a matching If-None-Match with 304."""
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, self.headers.get('If-None-Match')))
+        time.sleep(server.delay)
+        data = server.files.get(self.path)
+        if data is None:
+            self.send_error(404)
+            return
+        etag = '"%s"' % hashlib.md5(data).hexdigest()
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', server.control)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', server.control)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class FreshForTest(unittest.TestCase):
+    def testHeaders(self):
+        now = time.time()
+        self.assertEqual(freshFor({'Cache-Control': 'public, max-age=300'}, now), 300)
+        self.assertEqual(freshFor({'Cache-Control': 'max-age=300, must-revalidate'}, now), 0)
+        self.assertEqual(freshFor({'Cache-Control': 'no-cache'}, now), 0)
+        date = email.utils.formatdate(now, usegmt=True)
+        expires = email.utils.formatdate(now + 120, usegmt=True)
+        self.assertAlmostEqual(freshFor({'Date': date, 'Expires': expires}, now), 120, delta=1)
+        self.assertEqual(freshFor({'Date': date, 'Expires': 'never'}, now), 0)
+        # a tenth of the time since the last change, at most a day
+        modified = email.utils.formatdate(now - 1000, usegmt=True)
+        self.assertAlmostEqual(freshFor({'Date': date, 'Last-Modified': modified}, now), 100, delta=1)
+        modified = email.utils.formatdate(now - 365 * 24 * 3600, usegmt=True)
+        self.assertEqual(freshFor({'Date': date, 'Last-Modified': modified}, now), 24 * 3600)
+        self.assertEqual(freshFor({}, now), 0)
+
+
+class MediaCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.server = Server(('127.0.0.1', 0), Handler)
+        self.server.files = dict(('/%d.png' % i, os.urandom(10 * 1024)) for i in range(4))
+        self.server.control = 'max-age=60'
+        self.server.delay = 0
+        self.server.lock = threading.Lock()
+        self.server.requests = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = 'http://127.0.0.1:%d' % self.server.server_address[1]
+        self.directory = tempfile.mkdtemp()
+        self.caches = []
+
+    def tearDown(self):
+        for cache in self.caches:
+            cache.shutdown()
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def cache(self, **options):
+        cache = MediaCache(self.directory, session=requests.Session(), **options)
+        self.caches.append(cache)
+        return cache
+
+    def read(self, path):
+        with open(path, 'rb') as file:
+            return file.read()
+
+    def testConcurrentRequestsShareOneDownload(self):
+        self.server.delay = 0.2
+        cache = self.cache()
+        url = self.base + '/0.png'
+        requested = [cache.get(url) for i in range(5)]
+        self.assertEqual(len(set(requested)), 1)
+        self.assertEqual(self.read(requested[0].result(10)), self.server.files['/0.png'])
+        self.assertEqual(len(self.server.requests), 1)
+
+    def testFreshEntriesAreHits(self):
+        cache = self.cache()
+        url = self.base + '/0.png'
+        path = cache.get(url).result(10)
+        self.assertEqual(cache.get(url).result(10), path)
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(cache.stats()['hits'], 1)
+
+    def testStaleEntriesAreRevalidated(self):
+        self.server.control = 'no-cache'
+        cache = self.cache()
+        url = self.base + '/0.png'
+        path = cache.get(url).result(10)
+        self.assertEqual(cache.get(url).result(10), path)
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertIsNotNone(self.server.requests[1][1])
+        stats = cache.stats()
+        self.assertEqual((stats['revalidated'], stats['downloaded']), (1, 1))
+
+    def testLeastRecentlyUsedAreEvicted(self):
+        cache = self.cache(limit=25 * 1024)
+        urls = [self.base + '/%d.png' % i for i in range(3)]
+        paths = [cache.get(url).result(10) for url in urls[:2]]
+        # a hit makes the first image the most recently used
+        time.sleep(0.01)
+        cache.get(urls[0]).result(10)
+        cache.get(urls[2]).result(10)
+        self.assertEqual(sorted(cache.entries), sorted([urls[0], urls[2]]))
+        self.assertTrue(os.path.exists(paths[0]))
+        self.assertFalse(os.path.exists(paths[1]))
+        self.assertLessEqual(cache.stats()['size'], 25 * 1024)
+
+    def testHitsAreSavedAtShutdown(self):
+        cache = self.cache()
+        url = self.base + '/0.png'
+        cache.get(url).result(10)
+        time.sleep(0.01)
+        cache.get(url).result(10)
+        used = cache.entries[url]['used']
+        cache.shutdown()
+        self.assertEqual(self.cache().entries[url]['used'], used)
+
+    def testFailedDownload(self):
+        cache = self.cache()
+        url = self.base + '/missing.png'
+        with self.assertRaises(requests.HTTPError):
+            cache.get(url).result(10)
+        self.assertNotIn(url, cache.entries)
+        self.assertEqual(cache.pending, {})
+        # a failure is not remembered, the next request asks again
+        with self.assertRaises(requests.HTTPError):
+            cache.get(url).result(10)
+        self.assertEqual(len(self.server.requests), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,200 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+import zipfile
+
+from PyQt5.QtCore import QCoreApplication
+
+import plasmoids
+from plasmoids import PlasmoidScanner, installPackage
+
+application = None
+
+
+def setUpModule():
+    # the scanner's file system watcher needs an application object
+    global application
+    application = QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
+
+
+def writePackage(directory, id, name, desktop=False):
+    package = os.path.join(directory, id)
+    os.makedirs(package, exist_ok=True)
+    if desktop:
+        with open(os.path.join(package, 'metadata.desktop'), 'w') as file:
+            file.write('[Desktop Entry]\nName=%s\nX-KDE-PluginInfo-Name=%s\n' % (name, id))
+    else:
+        with open(os.path.join(package, 'metadata.json'), 'w') as file:
+            json.dump({'KPlugin': {'Id': id, 'Name': name, 'Version': '1.0'}}, file)
+    return package
+
+
+class PlasmoidScannerTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.root = os.path.join(self.directory, 'plasmoids')
+        self.cachePath = os.path.join(self.directory, 'plasmoids.json')
+        os.makedirs(self.root)
+        writePackage(self.root, 'org.test.clock', 'Clock')
+        writePackage(self.root, 'org.test.notes', 'Notes', desktop=True)
+        self.parsed = []
+        self.parseMetadata = plasmoids.parseMetadata
+
+        def counting(path):
+            self.parsed.append(os.path.basename(os.path.dirname(path)))
+            return self.parseMetadata(path)
+        plasmoids.parseMetadata = counting
+        self.scanners = []
+
+    def tearDown(self):
+        plasmoids.parseMetadata = self.parseMetadata
+        for scanner in self.scanners:
+            scanner.shutdown()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def scanner(self):
+        scanner = PlasmoidScanner([self.root], self.cachePath, batchInterval=0)
+        scanner.results = {'found': [], 'removed': []}
+        scanner.found.connect(lambda entries: scanner.results['found'].extend(entries))
+        scanner.removed.connect(lambda ids: scanner.results['removed'].extend(ids))
+        self.scanners.append(scanner)
+        return scanner
+
+    def scan(self, scanner, packages=None):
+        scanner.results = {'found': [], 'removed': []}
+        self.parsed = []
+        scanner.scanPackages(packages)
+        return scanner.results
+
+    def testAddedPackages(self):
+        results = self.scan(self.scanner())
+        self.assertEqual(sorted((entry.id, entry.name) for entry in results['found']), [('org.test.clock', 'Clock'), ('org.test.notes', 'Notes')])
+        self.assertEqual(results['removed'], [])
+        writePackage(self.root, 'org.test.weather', 'Weather')
+        scanner = self.scanners[0]
+        results = self.scan(scanner)
+        self.assertIn('org.test.weather', [entry.id for entry in results['found']])
+        self.assertEqual(self.parsed, ['org.test.weather'])
+
+    def testChangedPackage(self):
+        scanner = self.scanner()
+        self.scan(scanner)
+        # a different size is enough even when the mtime resolution hides the change
+        writePackage(self.root, 'org.test.clock', 'Analog Clock')
+        results = self.scan(scanner)
+        self.assertEqual(self.parsed, ['org.test.clock'])
+        self.assertIn(('org.test.clock', 'Analog Clock'), [(entry.id, entry.name) for entry in results['found']])
+
+    def testRemovedPackage(self):
+        scanner = self.scanner()
+        self.scan(scanner)
+        shutil.rmtree(os.path.join(self.root, 'org.test.notes'))
+        results = self.scan(scanner)
+        self.assertEqual(results['removed'], ['org.test.notes'])
+        with open(self.cachePath) as file:
+            cached = json.load(file)
+        self.assertEqual([os.path.basename(os.path.dirname(path)) for path in cached], ['org.test.clock'])
+
+    def testRescanOfOnePackage(self):
+        scanner = self.scanner()
+        self.scan(scanner)
+        package = writePackage(self.root, 'org.test.notes', 'Sticky Notes', desktop=True)
+        results = self.scan(scanner, [package])
+        self.assertEqual(self.parsed, ['org.test.notes'])
+        self.assertEqual([(entry.id, entry.name) for entry in results['found']], [('org.test.notes', 'Sticky Notes')])
+
+    def testCacheSkipsUnchangedPackages(self):
+        self.scan(self.scanner())
+        self.assertEqual(sorted(self.parsed), ['org.test.clock', 'org.test.notes'])
+        # a new scanner, as after a restart, reads the mtime and size cache from disk
+        scanner = self.scanner()
+        results = self.scan(scanner)
+        self.assertEqual(self.parsed, [])
+        self.assertEqual(len(results['found']), 2)
+        # same size, newer mtime
+        path = os.path.join(self.root, 'org.test.clock', 'metadata.json')
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.scan(scanner)
+        self.assertEqual(self.parsed, ['org.test.clock'])
+
+    def testInstallIntoMissingRoot(self):
+        # a new profile has no user plasmoid directory until the first install creates it
+        root = os.path.join(self.directory, 'profile', 'share', 'plasma', 'plasmoids')
+        scanner = PlasmoidScanner([root], self.cachePath, batchInterval=0)
+        found = []
+        scanner.found.connect(lambda entries: found.extend(entry.id for entry in entries))
+        self.scanners.append(scanner)
+        scanner.scanPackages()
+        self.assertEqual(found, [])
+        archive = os.path.join(self.directory, 'test.plasmoid')
+        with zipfile.ZipFile(archive, 'w') as package:
+            package.writestr('metadata.json', json.dumps({'KPlugin': {'Id': 'org.test.weather', 'Name': 'Weather'}}))
+        installPackage(archive, root)
+        deadline = time.monotonic() + 10
+        while not found and time.monotonic() < deadline:
+            application.processEvents()
+            time.sleep(0.01)
+        self.assertEqual(found, ['org.test.weather'])
+        self.assertIn(root, scanner.watcher.directories())
+
+
+class InstallPackageTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.target = os.path.join(self.directory, 'plasmoids')
+        # a directory next to the install root that a package must never touch
+        self.victim = os.path.join(self.directory, 'victim')
+        os.makedirs(self.victim)
+        with open(os.path.join(self.victim, 'important'), 'w') as file:
+            file.write('keep')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def assertVictimKept(self):
+        with open(os.path.join(self.victim, 'important')) as file:
+            self.assertEqual(file.read(), 'keep')
+
+    def archive(self, id, folder='package'):
+        path = os.path.join(self.directory, 'test.plasmoid')
+        with zipfile.ZipFile(path, 'w') as package:
+            package.writestr(folder + '/metadata.json', json.dumps({'KPlugin': {'Id': id, 'Name': 'Test'}}))
+            package.writestr(folder + '/contents/ui/main.qml', 'Item {}')
+        return path
+
+    def testInstallAndReplace(self):
+        path = installPackage(self.archive('org.test.clock'), self.target)
+        self.assertEqual(path, os.path.join(self.target, 'org.test.clock'))
+        self.assertTrue(os.path.isfile(os.path.join(path, 'contents', 'ui', 'main.qml')))
+        self.assertEqual(installPackage(self.archive('org.test.clock'), self.target), path)
+        self.assertEqual(os.listdir(self.target), ['org.test.clock'])
+
+    def testIdsOutsideTheDirectoryAreRejected(self):
+        for id in ('../victim', os.path.join('..', '..', 'victim'), self.victim, 'nested/id', '..', '.'):
+            with self.assertRaises(ValueError, msg=id):
+                installPackage(self.archive(id), self.target)
+        self.assertVictimKept()
+
+    def testSymlinkedIdIsRejected(self):
+        os.makedirs(self.target)
+        os.symlink(self.victim, os.path.join(self.target, 'org.test.link'))
+        with self.assertRaises(ValueError):
+            installPackage(self.archive('org.test.link'), self.target)
+        self.assertVictimKept()
+
+    def testMembersOutsideThePackageAreRejected(self):
+        path = os.path.join(self.directory, 'evil.plasmoid')
+        with zipfile.ZipFile(path, 'w') as package:
+            package.writestr('../victim/important', 'gone')
+        with self.assertRaises(ValueError):
+            installPackage(path, self.target)
+        self.assertVictimKept()
+
+
+if __name__ == '__main__':
+    unittest.main()
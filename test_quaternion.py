@@ -0,0 +1,109 @@
+import http.server
+import json
+import os
+import shutil
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+# runs the command and reports its exit code and the top level packages it loaded on stderr
+PROBE = '''
+import json, sys
+import quaternion
+code = quaternion.main(sys.argv[1:])
+sys.stderr.write(json.dumps({'code': code, 'loaded': sorted(set(name.split('.')[0] for name in sys.modules))}) + '\\n')
+'''
+
+
+class Server(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    """Serves /<name>.json update feeds with the versions in server.versions."""
+    def do_GET(self):
+        name = self.path.strip('/').split('.')[0]
+        if name not in self.server.versions:
+            self.send_error(404)
+            return
+        body = json.dumps({'version': self.server.versions[name]}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class CheckCommandTest(unittest.TestCase):
+    def setUp(self):
+        self.server = Server(('127.0.0.1', 0), Handler)
+        self.server.versions = {'quaternion': '1.0', 'plasmoids': '2.1'}
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = 'http://127.0.0.1:%d/' % self.server.server_address[1]
+        self.directory = tempfile.mkdtemp()
+        self.env = dict(os.environ, XDG_CACHE_HOME=os.path.join(self.directory, 'cache'), XDG_CONFIG_HOME=os.path.join(self.directory, 'config'))
+        self.sources = os.path.join(self.directory, 'sources.json')
+        self.writeSources([('quaternion', 'quaternion', '1.0'), ('plasmoids', 'plasmoids', '2.0')])
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def writeSources(self, sources):
+        with open(self.sources, 'w') as file:
+            json.dump([{'name': name, 'url': self.base + feed + '.json', 'version': version} for name, feed, version in sources], file)
+
+    def command(self, *arguments):
+        # (exit code, stdout, stderr) of python -m quaternion
+        process = subprocess.run([sys.executable, '-m', 'quaternion'] + list(arguments), cwd=ROOT, env=self.env, capture_output=True, text=True)
+        return process.returncode, process.stdout, process.stderr
+
+    def testNoQtIsImported(self):
+        process = subprocess.run([sys.executable, '-c', PROBE, 'check', '--refresh', '--sources=' + self.sources], cwd=ROOT, env=self.env, capture_output=True, text=True)
+        report = json.loads(process.stderr.strip().splitlines()[-1])
+        self.assertEqual(report['code'], 100)
+        for name in ('PyQt5', 'sip', 'qt_material', 'resources', 'app', 'icons', 'styles'):
+            self.assertNotIn(name, report['loaded'])
+
+    def testUpdatesAvailable(self):
+        code, out, err = self.command('check', '--refresh', '--sources=' + self.sources)
+        self.assertEqual(code, 100)
+        self.assertIn('plasmoids 2.0 -> 2.1', out)
+        self.assertIn('quaternion 1.0 is up to date', out)
+
+    def testJsonOutput(self):
+        code, out, err = self.command('check', '--json', '--refresh', '--sources=' + self.sources)
+        self.assertEqual(code, 100)
+        data = json.loads(out)
+        self.assertEqual((data['available'], data['failed']), (1, 0))
+        self.assertEqual([(result['name'], result['latest'], result['available']) for result in data['results']], [('quaternion', '1.0', False), ('plasmoids', '2.1', True)])
+
+    def testNothingToUpdate(self):
+        self.server.versions['plasmoids'] = '2.0'
+        code, out, err = self.command('check', '--refresh', '--sources=' + self.sources)
+        self.assertEqual(code, 0)
+
+    def testUnreachableSource(self):
+        self.writeSources([('quaternion', 'quaternion', '1.0'), ('gone', 'gone', '1.0')])
+        code, out, err = self.command('check', '--refresh', '--sources=' + self.sources)
+        self.assertEqual(code, 1)
+        self.assertTrue(err.startswith('gone:'))
+
+    def testUsageErrors(self):
+        self.assertEqual(self.command('check', '--bogus')[0], 2)
+        self.assertEqual(self.command('frobnicate')[0], 2)
+        code, out, err = self.command('--help')
+        self.assertEqual(code, 0)
+        self.assertIn('usage:', out)
+
+
+if __name__ == '__main__':
+    unittest.main()
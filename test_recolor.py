@@ -0,0 +1,72 @@
+import filecmp
+import os
+import shutil
+import tempfile
+import unittest
+
+import recolor
+
+try:
+    # qt_material wants a Qt binding imported first
+    import PyQt5.QtCore
+    import qt_material
+    from qt_material.resources.generate import ResourseGenerator
+except ImportError:
+    qt_material = None
+
+# (primary, disabled, secondary), the later ones make replacements that later steps match again
+COLORS = [
+    ('#448aff', '#4f5b62', '#ffffff'),
+    ('#000000', '#ff0000', '#0000ff'),
+    ('#ff0000', '#000000', '#000000'),
+    ('#0000', '#00', '#ff00'),
+]
+# the source colors in every spelling qt_material replaces, next to each other and to other colors
+TRICKY = '<svg fill="#0000ff" stroke="#000000"><path style="fill:#ff0000;stroke:#00\\\n00ff"/><g color="#0\\\n00000#ff00\\\n00#0000ff#000000ff"/></svg>\n'
+# the color qt_material gives its active icons
+ACTIVE = '#707070'
+
+
+@unittest.skipIf(qt_material is None, 'qt_material is not installed')
+class RecolorTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        # the icons qt_material ships and one written to trip up a single pass
+        self.source = os.path.join(self.directory, 'source')
+        shutil.copytree(os.path.join(os.path.dirname(qt_material.__file__), 'resources', 'source'), self.source)
+        with open(os.path.join(self.source, 'tricky.svg'), 'w') as file:
+            file.write(TRICKY)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def testSameTextAsQtMaterial(self):
+        generator = ResourseGenerator('#448aff', '#ffffff', '#4f5b62', self.source, parent=os.path.join(self.directory, 'unused'))
+        fallback = 0
+        for primary, disabled, secondary in COLORS:
+            for color in (primary, disabled):
+                recolorer = recolor.Recolorer(recolor.iconSteps(color, secondary))
+                fallback += not recolorer.singlePass
+                expected = generator.replace_color(generator.replace_color(TRICKY, color), secondary, '#ff0000')
+                self.assertEqual(recolorer.apply(TRICKY), expected, (color, secondary))
+        # the sets that make a single pass unsafe go through the sequential replacements
+        self.assertGreater(fallback, 0)
+
+    def testSameFilesAsQtMaterial(self):
+        for primary, disabled, secondary in COLORS:
+            expected = os.path.join(self.directory, 'expected')
+            actual = os.path.join(self.directory, 'actual')
+            ResourseGenerator(primary, secondary, disabled, self.source, parent=expected).generate()
+            targets = [(os.path.join(actual, folder), color) for folder, color in (('disabled', disabled), ('primary', primary), ('active', ACTIVE))]
+            recolor.recolorTree(self.source, targets, secondary, processes=1)
+            for folder in ('disabled', 'primary', 'active'):
+                names = sorted(os.listdir(os.path.join(expected, folder)))
+                self.assertEqual(sorted(os.listdir(os.path.join(actual, folder))), names)
+                match, mismatch, errors = filecmp.cmpfiles(os.path.join(expected, folder), os.path.join(actual, folder), names, shallow=False)
+                self.assertEqual(mismatch + errors, [], (primary, disabled, secondary, folder))
+            shutil.rmtree(expected)
+            shutil.rmtree(actual)
+
+
+if __name__ == '__main__':
+    unittest.main()
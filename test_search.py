@@ -0,0 +1,51 @@
+import threading
+import unittest
+
+from catalog import CatalogEntry
+from search import SearchIndex
+
+NAMES = ['Analog Clock', 'Clockwork Notes', 'Digital Clock', 'Sticky Notes', 'Notes Widget', 'Weather Widget', 'Dock Clock']
+
+
+def entries(prefix=''):
+    return [CatalogEntry('%s%d' % (prefix, i), name, 'a plasma widget for the %s panel' % name.split()[0].lower(), keywords='desktop %s' % name.split()[-1].lower()) for i, name in enumerate(NAMES)]
+
+
+class SearchIndexTest(unittest.TestCase):
+    def ids(self, results):
+        return [entry.id for entry in results]
+
+    def testTypedQueryMatchesFreshIndex(self):
+        # each keystroke narrows the previous matches, the results have to be those of a fresh index
+        index = SearchIndex(entries())
+        for query in ('notes widget', 'clock', 'cl no', 'dock clo', 'plasma pan', 'desk notes'):
+            for i in range(1, len(query) + 1):
+                self.assertEqual(self.ids(index.search(query[:i])), self.ids(SearchIndex(entries()).search(query[:i])), query[:i])
+
+    def testNarrowingFollowsChanges(self):
+        index = SearchIndex(entries())
+        index.search('clo')
+        index.add(CatalogEntry('new', 'Clock Face'))
+        self.assertIn('new', self.ids(index.search('cloc')))
+        index.remove('new')
+        self.assertNotIn('new', self.ids(index.search('clock')))
+
+    def testStaleRebuildIsDropped(self):
+        index = SearchIndex(entries())
+        release = threading.Event()
+        done = []
+
+        def slow():
+            # the first rebuild only gets its entries after the second one finished
+            release.wait()
+            yield from entries('old')
+        first = index.rebuildAsync(slow(), lambda index, generation: done.append(generation))
+        index.rebuildAsync(entries('new'), lambda index, generation: done.append(generation)).join(10)
+        release.set()
+        first.join(10)
+        self.assertEqual(done, [index.generation])
+        self.assertEqual(self.ids(index.search('sticky')), ['new3'])
+
+
+if __name__ == '__main__':
+    unittest.main()
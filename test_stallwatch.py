@@ -0,0 +1,78 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+from PyQt5.QtCore import QCoreApplication, QTimer
+
+from stallwatch import Watchdog
+
+application = None
+
+
+def setUpModule():
+    # the heartbeat is a timer on the event loop
+    global application
+    application = QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
+
+
+def sleepingSlot():
+    # blocked on io, the monitor thread keeps running
+    time.sleep(0.4)
+
+
+def holdingSlot(rounds):
+    # one long call into C that never lets go of the GIL, the monitor thread can not run until it returns
+    sum(range(rounds))
+
+
+class WatchdogTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'watchdog.log')
+        self.watchdog = Watchdog(threshold=0.15, interval=0.02, path=self.path)
+
+    def tearDown(self):
+        self.watchdog.stop()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def runLoop(self, slot, seconds=1.0):
+        self.watchdog.start()
+        QTimer.singleShot(100, slot)
+        QTimer.singleShot(int(seconds * 1000), application.quit)
+        application.exec_()
+
+    def assertStalledIn(self, name):
+        stalls = list(self.watchdog.stalls.values())
+        self.assertEqual(len(stalls), 1)
+        self.assertEqual(stalls[0].count, 1)
+        self.assertIn(name, [frame.name for frame in stalls[0].frames])
+        summary = self.watchdog.summary()
+        self.assertIn('1 stalls', summary)
+        self.assertIn(name, summary)
+        self.watchdog.handler.flush()
+        with open(self.path) as file:
+            self.assertIn(name, file.read())
+
+    def testBlockingSlot(self):
+        self.runLoop(sleepingSlot)
+        self.assertStalledIn('sleepingSlot')
+        self.assertGreater(list(self.watchdog.stalls.values())[0].longest, 0.3)
+
+    def testSlotHoldingTheGil(self):
+        start = time.perf_counter()
+        sum(range(10 ** 6))
+        rounds = int(10 ** 6 * 0.5 / (time.perf_counter() - start))
+        self.runLoop(lambda: holdingSlot(rounds), 1.5)
+        self.assertStalledIn('holdingSlot')
+
+    def testShortSlotsAreNoStalls(self):
+        self.runLoop(lambda: time.sleep(0.02), 0.5)
+        self.assertEqual(self.watchdog.stalls, {})
+        self.assertEqual(self.watchdog.summary(), 'No GUI stalls recorded.')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+import hashlib
+import http.server
+import json
+import os
+import shutil
+import socketserver
+import tempfile
+import threading
+import time
+import unittest
+
+import requests
+
+from updates import ResponseCache, UpdateChecker, UpdateSource, fetch, loadSources, saveVersion
+
+
+class Server(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    """Serves server.feeds as JSON with an ETag, answers a matching If-None-Match with 304."""
+    def do_GET(self):
+        server = self.server
+        feed = server.feeds.get(self.path)
+        if feed is None:
+            self.send_error(404)
+            return
+        body = json.dumps(feed).encode('utf-8')
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        time.sleep(server.delay)
+        with server.lock:
+            server.requests.append((self.path, self.headers.get('If-None-Match')))
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class UpdatesTest(unittest.TestCase):
+    def setUp(self):
+        self.server = Server(('127.0.0.1', 0), Handler)
+        self.server.feeds = {'/app.json': {'version': '1.1'}, '/theme.json': {'version': '2.0'}}
+        self.server.lock = threading.Lock()
+        self.server.requests = []
+        self.server.delay = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = 'http://127.0.0.1:%d' % self.server.server_address[1]
+        self.directory = tempfile.mkdtemp()
+        self.cache = ResponseCache(self.directory)
+        self.session = requests.Session()
+        self.checkers = []
+
+    def tearDown(self):
+        for checker in self.checkers:
+            checker.shutdown()
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def checker(self, **options):
+        sources = [UpdateSource('app', self.base + '/app.json', '1.0'), UpdateSource('theme', self.base + '/theme.json', '2.0')]
+        checker = UpdateChecker(sources, self.cache, self.session, **options)
+        self.checkers.append(checker)
+        return checker
+
+    def testNotModified(self):
+        url = self.base + '/app.json'
+        entry, status = fetch(url, self.cache, self.session)
+        self.assertEqual(status, 'modified')
+        entry, status = fetch(url, self.cache, self.session)
+        self.assertEqual(status, 'not-modified')
+        self.assertEqual(json.loads(entry['body']), {'version': '1.1'})
+        # the second request sent the validator of the first response
+        self.assertEqual(self.server.requests[1], ('/app.json', entry['etag']))
+        self.server.feeds['/app.json'] = {'version': '1.2'}
+        entry, status = fetch(url, self.cache, self.session)
+        self.assertEqual(status, 'modified')
+        self.assertEqual(json.loads(entry['body']), {'version': '1.2'})
+
+    def testFreshEntriesSkipTheServer(self):
+        url = self.base + '/app.json'
+        fetch(url, self.cache, self.session)
+        entry, status = fetch(url, self.cache, self.session, maxAge=3600)
+        self.assertEqual(status, 'fresh')
+        self.assertEqual(len(self.server.requests), 1)
+
+    def testCheckResults(self):
+        results = dict((result.name, result) for result in self.checker().check())
+        self.assertTrue(results['app'].available)
+        self.assertEqual(results['app'].latest, '1.1')
+        self.assertFalse(results['theme'].available)
+        results = dict((result.name, result) for result in self.checker().check())
+        self.assertEqual(results['app'].status, 'not-modified')
+
+    def testInstalledVersionIsRecorded(self):
+        path = os.path.join(self.directory, 'sources.json')
+        with open(path, 'w') as file:
+            json.dump([{'name': 'app', 'url': self.base + '/app.json', 'version': '1.0', 'path': '/opt/app'}, {'name': 'theme', 'url': self.base + '/theme.json', 'version': '2.0'}], file)
+        self.assertTrue(saveVersion('app', '1.1', path))
+        self.assertFalse(saveVersion('missing', '1.0', path))
+        sources = loadSources(path)
+        self.assertEqual([(source.name, source.version, source.path) for source in sources], [('app', '1.1', '/opt/app'), ('theme', '2.0', None)])
+        checker = self.checker()
+        self.assertTrue(checker.check()[0].available)
+        checker.setVersion('app', '1.1')
+        result = checker.checkAsync().result(10)[0]
+        self.assertEqual((result.installed, result.available), ('1.1', False))
+
+    def testCheckAsyncIsDebounced(self):
+        self.server.delay = 0.2
+        checker = self.checker(minInterval=60)
+        # calls while a check runs share it
+        first = checker.checkAsync()
+        self.assertIs(checker.checkAsync(), first)
+        results = first.result(10)
+        self.assertEqual(len(self.server.requests), 2)
+        # calls shortly after it get its results without asking the servers again
+        self.assertEqual(checker.checkAsync().result(10), results)
+        self.assertEqual(len(self.server.requests), 2)
+        checker.checkAsync(force=True).result(10)
+        self.assertEqual(len(self.server.requests), 4)
+
+    def testCheckAfterShutdown(self):
+        # a check scheduled before the window closed runs after the checker was shut down
+        checker = self.checker()
+        checker.shutdown()
+        results = []
+        with self.assertNoLogs('concurrent.futures'):
+            future = checker.checkAsync(results.append)
+        self.assertTrue(future.cancelled())
+        self.assertEqual(results, [])
+        self.assertEqual(self.server.requests, [])
+
+    def testShutdownDuringCheck(self):
+        # the results of a check still running when the window closed are not handed over
+        self.server.delay = 0.2
+        checker = self.checker()
+        results = []
+        future = checker.checkAsync(results.append)
+        checker.shutdown()
+        with self.assertNoLogs('concurrent.futures'):
+            future.result(10)
+        self.assertEqual(results, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+from paths import cacheDir, writeAtomic
+from recolor import recolorTree
+
+# generated icon sets kept per parent, older ones are removed when a new one is generated
+KEEP = 4
+# written last into a generated directory, a directory without it is incomplete
+MARKER = '.complete'
+
+
+def libraryVersion():
+    try:
+        from importlib.metadata import version
+        return version('qt-material')
+    except Exception:
+        return ''
+
+
+def sourceListing(source):
+    # name, size and mtime of every source icon, changes whenever the icon set does
+    listing = []
+    for entry in sorted(os.scandir(source), key=lambda entry: entry.name):
+        if entry.name.endswith('.svg'):
+            stat = entry.stat()
+            listing.append((entry.name, stat.st_size, stat.st_mtime_ns))
+    return listing
+
+
+def themeKey(theme, source, version=None):
+    # hash of the theme colors, the source icon set and the qt_material version
+    data = json.dumps([sorted(theme.items()), sourceListing(source), libraryVersion() if version is None else version])
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()[:24]
+
+
+def generate(theme, source, directory):
+    # generate the qt_material icons into a temporary directory and rename it into place
+    from qt_material.resources import ResourseGenerator
+    base = os.path.dirname(directory)
+    os.makedirs(base, exist_ok=True)
+    temp = tempfile.mkdtemp(prefix='.generating-', dir=base)
+    try:
+        # an absolute parent is used as the output directory as is
+        resources = ResourseGenerator(primary=theme['primaryColor'], secondary=theme['secondaryColor'], disabled=theme['secondaryLightColor'], source=source, parent=temp)
+        # its folders and colors differ between qt_material versions, the recoloring is done in one pass per icon
+        recolorTree(source, resources.contex, resources.secondary)
+        open(os.path.join(temp, MARKER), 'w').close()
+        os.rename(temp, directory)
+    except OSError:
+        # another launch finished the same key first, its copy is identical
+        shutil.rmtree(temp, ignore_errors=True)
+        if not os.path.exists(os.path.join(directory, MARKER)):
+            raise
+    except Exception:
+        shutil.rmtree(temp, ignore_errors=True)
+        raise
+
+
+def prune(base, prefix, keep=KEEP):
+    # drop the least recently generated icon sets of a parent
+    try:
+        entries = [entry for entry in os.scandir(base) if entry.is_dir() and entry.name.startswith(prefix + '-')]
+    except OSError:
+        return
+    entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in entries[keep:]:
+        shutil.rmtree(entry.path, ignore_errors=True)
+
+
+def iconsDirectory(theme, parent='theme'):
+    # directory with the icons of theme, generated only when no earlier launch made the same one
+    import qt_material
+    from qt_material.resources import RESOURCES_PATH
+    source = os.path.join(os.path.dirname(qt_material.__file__), 'resources', 'source')
+    name = os.path.basename(parent.rstrip('/')) or 'theme'
+    base = os.path.dirname(parent) if os.path.isabs(parent) else RESOURCES_PATH
+    directory = os.path.join(base, '%s-%s' % (name, themeKey(theme, source)))
+    if not os.path.exists(os.path.join(directory, MARKER)):
+        shutil.rmtree(directory, ignore_errors=True)
+        generate(theme, source, directory)
+        prune(base, name)
+    return directory
+
+
+def setIconsTheme(theme, parent='theme'):
+    # drop in replacement for qt_material.set_icons_theme that reuses generated icons
+    import qt_material
+    from PyQt5.QtCore import QDir
+    QDir.addSearchPath('icon', iconsDirectory(theme, parent))
+    QDir.addSearchPath('qt_material', os.path.join(os.path.dirname(qt_material.__file__), 'resources'))
+
+
+def install():
+    # make qt_material use the cache, build_stylesheet looks set_icons_theme up in its module
+    import qt_material
+    qt_material.set_icons_theme = setIconsTheme
+
+
+def packageDir():
+    # qt_material's directory, found without importing it and with it jinja2
+    from importlib.util import find_spec
+    spec = find_spec('qt_material')
+    return os.path.dirname(spec.origin) if spec is not None and spec.origin else None
+
+
+def themeFile(theme, package):
+    # the theme XML qt_material.get_theme would read
+    if theme in ('default_dark.xml', 'default_dark'):
+        return os.path.join(package, 'themes', 'dark_teal.xml')
+    if theme in ('default_light.xml', 'default_light', 'default.xml', 'default'):
+        return os.path.join(package, 'themes', 'light_cyan_500.xml')
+    if not os.path.exists(theme):
+        return os.path.join(package, 'themes', theme)
+    return theme
+
+
+def launchKey(theme, package, options):
+    # hash of everything the stylesheet and icons are made from, checked on every launch without importing qt_material
+    with open(themeFile(theme, package), 'rb') as file:
+        xml = file.read()
+    # the template is material.css.template or material.qss.template depending on the qt_material version
+    templates = [(name, os.stat(os.path.join(package, name)).st_mtime_ns) for name in sorted(os.listdir(package)) if name.endswith('.template')]
+    data = json.dumps([theme, hashlib.sha256(xml).hexdigest(), options, templates, sourceListing(os.path.join(package, 'resources', 'source')), libraryVersion(), sys.platform, 'PyQt5'], sort_keys=True, default=str)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()[:24]
+
+
+def applyStylesheet(app, theme, style='Fusion', invert_secondary=False, extra={}, parent='theme'):
+    # qt_material.apply_stylesheet with cached icons and stylesheet, qt_material is only imported when the key changed
+    # returns False when nothing was applied, qt_material is missing as in the lean bundle or does not know the theme
+    package = packageDir()
+    if package is None:
+        return False
+    options = [style, invert_secondary, extra, parent]
+    path = os.path.join(cacheDir('themes'), launchKey(theme, package, options) + '.json')
+    try:
+        with open(path) as file:
+            cached = json.load(file)
+        if not os.path.exists(os.path.join(cached['icons'], MARKER)):
+            raise ValueError('generated icons are gone')
+    except (OSError, ValueError, KeyError):
+        cached = None
+    if cached is None:
+        install()
+        import qt_material
+        qt_material.apply_stylesheet(app, theme=theme, style=style, invert_secondary=invert_secondary, extra=dict(extra), parent=parent)
+        colors = qt_material.get_theme(theme, invert_secondary)
+        if colors is None:
+            return False
+        # get_theme exports the colors to the environment, the template and user code may read them
+        environ = dict((name, value) for name, value in os.environ.items() if name in colors or name.startswith('QTMATERIAL_'))
+        cached = {'icons': iconsDirectory(colors, parent), 'primary': colors['primaryColor'], 'environ': environ, 'stylesheet': app.styleSheet()}
+        writeAtomic(path, json.dumps(cached).encode('utf-8'))
+        return True
+    # the side effects of apply_stylesheet without rendering the template
+    from PyQt5.QtCore import QDir
+    from PyQt5.QtGui import QColor, QFontDatabase, QGuiApplication, QPalette
+    os.environ.update(cached['environ'])
+    if style:
+        app.setStyle(style)
+    fonts = os.path.join(package, 'fonts', 'roboto')
+    for name in sorted(os.listdir(fonts)) if os.path.isdir(fonts) else []:
+        if name.endswith('.ttf'):
+            QFontDatabase.addApplicationFont(os.path.join(fonts, name))
+    QDir.addSearchPath('icon', cached['icons'])
+    QDir.addSearchPath('qt_material', os.path.join(package, 'resources'))
+    palette = QGuiApplication.palette()
+    primary = cached['primary']
+    palette.setColor(QPalette.Text, QColor(*[int(primary[i:i + 2], 16) for i in range(1, 6, 2)] + [92]))
+    QGuiApplication.setPalette(palette)
+    app.setStyleSheet(cached['stylesheet'])
+    return True
@@ -0,0 +1,216 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import network
+from paths import cacheDir, configDir, writeAtomic
+
+
+class ResponseCache(object):
+    """On-disk cache of HTTP responses and their ETag/Last-Modified validators."""
+    def __init__(self, directory=None):
+        self.directory = directory or cacheDir('http')
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path(self, url):
+        return os.path.join(self.directory, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.json')
+
+    def get(self, url):
+        try:
+            with open(self.path(url)) as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if entry.get('url') != url:
+            return None
+        return entry
+
+    def put(self, url, entry):
+        entry['url'] = url
+        writeAtomic(self.path(url), json.dumps(entry).encode('utf-8'))
+
+
+def fetch(url, cache, session=None, maxAge=0, timeout=10):
+    # returns (cache entry, status) where status is fresh, not-modified or modified
+    entry = cache.get(url)
+    if entry is not None and maxAge and time.time() - entry['fetched'] < maxAge:
+        return entry, 'fresh'
+    headers = {}
+    if entry is not None:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+    response = (session or network.session()).get(url, headers=headers, timeout=timeout)
+    if response.status_code == 304 and entry is not None:
+        entry['fetched'] = time.time()
+        cache.put(url, entry)
+        return entry, 'not-modified'
+    response.raise_for_status()
+    entry = {
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'fetched': time.time(),
+        'body': response.text,
+    }
+    cache.put(url, entry)
+    return entry, 'modified'
+
+
+def parseVersion(version):
+    # 1.10.0-2 -> (1, 10, 0, 2), non numeric parts compare as strings after numbers
+    return tuple((0, int(part), '') if part.isdigit() else (1, 0, part) for part in re.split(r'[.\-+_~]', str(version)) if part)
+
+
+class UpdateSource(object):
+    """A feed describing the latest version of something that is installed."""
+    def __init__(self, name, url, version, path=None):
+        self.name = name
+        self.url = url
+        self.version = version
+        # the installed file an update replaces, None when it is only reported
+        self.path = path
+
+
+class UpdateResult(object):
+    def __init__(self, source, latest=None, status=None, error=None, package=None):
+        self.name = source.name
+        self.url = source.url
+        self.installed = source.version
+        self.path = source.path
+        # {"url", "sha256", "size", "deltas": {installed version: {"url", "size"}}} when the feed offers a download
+        self.package = package
+        self.latest = latest
+        self.status = status
+        self.error = error
+        self.available = latest is not None and parseVersion(latest) > parseVersion(source.version)
+
+    def toDict(self):
+        return {
+            'name': self.name,
+            'url': self.url,
+            'installed': self.installed,
+            'latest': self.latest,
+            'available': self.available,
+            'status': self.status,
+            'error': self.error,
+            'path': self.path,
+            'package': self.package,
+        }
+
+
+# sources.json is read and rewritten by update jobs on worker threads
+_sourcesLock = threading.Lock()
+
+
+def sourcesPath(path=None):
+    return path or os.path.join(configDir(), 'sources.json')
+
+
+def loadSources(path=None):
+    # sources.json holds a list of {"name": ..., "url": ..., "version": ..., "path": ...}
+    path = sourcesPath(path)
+    try:
+        with open(path) as file:
+            entries = json.load(file)
+    except (OSError, ValueError):
+        return []
+    return [UpdateSource(entry['name'], entry['url'], entry.get('version', '0'), entry.get('path')) for entry in entries]
+
+
+def saveVersion(name, version, path=None):
+    # records the version an update installed, the next check and the next delta start from it
+    path = sourcesPath(path)
+    with _sourcesLock:
+        try:
+            with open(path) as file:
+                entries = json.load(file)
+        except (OSError, ValueError):
+            return False
+        changed = False
+        for entry in entries:
+            if entry.get('name') == name:
+                entry['version'] = version
+                changed = True
+        if changed:
+            writeAtomic(path, json.dumps(entries, indent=2).encode('utf-8'))
+        return changed
+
+
+class UpdateChecker(object):
+    """Checks every source concurrently over the shared session, off the GUI thread."""
+    def __init__(self, sources=None, cache=None, session=None, maxWorkers=8, minInterval=60, maxAge=0, timeout=10):
+        self.sources = sources if sources is not None else loadSources()
+        self.cache = cache or ResponseCache()
+        self.session = session
+        # a check finished less than minInterval seconds ago is reused instead of starting another
+        self.minInterval = minInterval
+        # cache entries younger than maxAge seconds are used without asking the server
+        self.maxAge = maxAge
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=maxWorkers, thread_name_prefix='updates')
+        self.coordinator = ThreadPoolExecutor(max_workers=1, thread_name_prefix='updates-check')
+        self.lock = threading.Lock()
+        self.pending = None
+        self.results = None
+        self.checked = 0
+        self.closed = False
+
+    def setVersion(self, name, version):
+        # an update was installed, results of the last check are stale
+        with self.lock:
+            for source in self.sources:
+                if source.name == name:
+                    source.version = version
+            self.results = None
+
+    def checkSource(self, source):
+        try:
+            entry, status = fetch(source.url, self.cache, self.session, self.maxAge, self.timeout)
+            feed = json.loads(entry['body'])
+            return UpdateResult(source, feed.get('version'), status, package=feed.get('package'))
+        except Exception as e:
+            return UpdateResult(source, status='error', error=str(e))
+
+    def check(self):
+        # blocking, sources are fetched concurrently
+        results = list(self.executor.map(self.checkSource, self.sources))
+        with self.lock:
+            self.results = results
+            self.checked = time.monotonic()
+        return results
+
+    def checkAsync(self, callback=None, force=False):
+        # returns a Future with the results, repeated calls while a check runs or shortly after share its results
+        with self.lock:
+            if self.closed:
+                # a check scheduled before the window closed, nothing is left to receive it
+                future = Future()
+                future.cancel()
+                return future
+            future = self.pending
+            if future is None or future.done():
+                if not force and self.results is not None and time.monotonic() - self.checked < self.minInterval:
+                    future = Future()
+                    future.set_result(self.results)
+                else:
+                    future = self.pending = self.coordinator.submit(self.check)
+        if callback is not None:
+            def done(future):
+                # nothing is left to receive a check that finished after shutdown, was cancelled or failed
+                # shutdown waits for a callback that already started, its receiver may be deleted right after
+                with self.lock:
+                    if not self.closed and not future.cancelled() and future.exception() is None:
+                        callback(future.result())
+            future.add_done_callback(done)
+        return future
+
+    def shutdown(self):
+        with self.lock:
+            self.closed = True
+        self.coordinator.shutdown(wait=False)
+        self.executor.shutdown(wait=False)